@@ -0,0 +1,61 @@
+"""
+Import-time benchmark for the NITRO client transports
+
+Starts a fresh interpreter for every sample (like Nagios does for every
+check), imports the client and creates it with the selected transport, and
+reports wall time and peak RSS per transport.
+
+Usage:
+    python benchmarks/import_time.py [--runs 20]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+from check_netscaler.cli import create_parser
+from check_netscaler.client import NITROClient
+NITROClient("192.168.1.1", "nsroot", "nsroot", transport=sys.argv[1])
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "elapsed_ms": elapsed * 1000,
+    "maxrss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "modules": len(sys.modules),
+}))
+"""
+
+TRANSPORTS = ["requests", "stdlib"]
+
+
+def sample(transport: str) -> dict:
+    """Run one child interpreter and return its measurements"""
+    output = subprocess.check_output(
+        [sys.executable, "-c", CHILD, transport],
+        cwd=Path(__file__).resolve().parent.parent,
+        text=True,
+    )
+    return json.loads(output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20, help="Samples per transport")
+    args = parser.parse_args()
+
+    print(f"{'transport':<10} {'import+init (ms)':>18} {'max RSS (KiB)':>14} {'modules':>8}")
+    for transport in TRANSPORTS:
+        samples = [sample(transport) for _ in range(args.runs)]
+        elapsed = statistics.median(s["elapsed_ms"] for s in samples)
+        rss = statistics.median(s["maxrss_kb"] for s in samples)
+        modules = samples[0]["modules"]
+        print(f"{transport:<10} {elapsed:>18.1f} {rss:>14.0f} {modules:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+JSON decode benchmark for NITRO responses
+
+Decodes the mock server fixtures with every available backend: the standard
+library json module, orjson (if installed) and the incremental decoder used
+by --stream. Fixture collections can be scaled up to mimic appliances with
+thousands of objects.
+
+Usage:
+    python benchmarks/json_decode.py [--scale 1000] [--runs 20]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from check_netscaler.client.jsonstream import iter_array_items  # noqa: E402
+
+FIXTURES = ROOT / "tests" / "mocks" / "fixtures"
+
+CHUNK_SIZE = 16384
+
+
+def load_fixtures(scale: int) -> List[Tuple[str, str, bytes]]:
+    """Return (name, resource type, encoded body) for every fixture"""
+    bodies = []
+    for path in sorted(FIXTURES.glob("*/*.json")):
+        data = json.loads(path.read_text())
+        resource_type = path.stem
+        objects = data.get(resource_type)
+        if isinstance(objects, list) and objects:
+            data[resource_type] = [
+                dict(obj, name=f"{obj.get('name', resource_type)}_{i}")
+                for i in range(scale)
+                for obj in objects
+            ]
+        name = f"{path.parent.name}/{resource_type}"
+        bodies.append((name, resource_type, json.dumps(data).encode("utf-8")))
+    return bodies
+
+
+def decoders() -> Dict[str, Callable[[bytes, str], object]]:
+    """Return the available decoders by name"""
+    available: Dict[str, Callable[[bytes, str], object]] = {
+        "json": lambda body, key: json.loads(body),
+    }
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        available["orjson"] = lambda body, key: orjson.loads(body)
+
+    def stream(body: bytes, key: str) -> object:
+        chunks = (body[i : i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE))
+        for _ in iter_array_items(chunks, key):
+            pass
+        return None
+
+    available["stream"] = stream
+    return available
+
+
+def measure(decode: Callable[[bytes, str], object], body: bytes, key: str, runs: int) -> float:
+    """Return the median decode time in milliseconds"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        decode(body, key)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=int, default=1, help="Repeat collection objects N times")
+    parser.add_argument("--runs", type=int, default=20, help="Samples per fixture and backend")
+    args = parser.parse_args()
+
+    bodies = load_fixtures(args.scale)
+    available = decoders()
+    names = list(available)
+
+    print(f"{'fixture':<30} {'KiB':>8} " + " ".join(f"{n + ' (ms)':>12}" for n in names))
+    totals = dict.fromkeys(names, 0.0)
+    for name, key, body in bodies:
+        timings = {n: measure(available[n], body, key, args.runs) for n in names}
+        for n in names:
+            totals[n] += timings[n]
+        print(
+            f"{name:<30} {len(body) / 1024:>8.1f} "
+            + " ".join(f"{timings[n]:>12.3f}" for n in names)
+        )
+
+    size = sum(len(body) for _, _, body in bodies) / 1024
+    print(f"{'total':<30} {size:>8.1f} " + " ".join(f"{totals[n]:>12.3f}" for n in names))
+
+
+if __name__ == "__main__":
+    main()
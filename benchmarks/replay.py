@@ -0,0 +1,72 @@
+"""
+Offline benchmark of check commands against a recorded cassette
+
+Record the traffic of a check once against a real appliance:
+
+    check_netscaler -H ns.example.com --record lb.cassette.gz -C state -o lbvserver
+
+and then run the same check repeatedly from the cassette, without network
+access, to measure (or profile) the plugin itself with production-sized data.
+Each run goes through the complete CLI, including decoding and evaluation.
+
+Usage:
+    python benchmarks/replay.py --cassette lb.cassette.gz [--runs 20] [--profile] \\
+        -- -C state -o lbvserver
+"""
+
+import argparse
+import contextlib
+import cProfile
+import io
+import pstats
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from check_netscaler.cli import main as check_main  # noqa: E402
+
+
+def run(cassette: str, check: list) -> float:
+    """Run the check once from the cassette and return its wall time in ms"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        check_main(["--replay", cassette] + check)
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cassette", required=True, help="Cassette recorded with --record")
+    parser.add_argument("--runs", type=int, default=20, help="Samples")
+    parser.add_argument("--profile", action="store_true", help="Print a cProfile report")
+    parser.add_argument("check", nargs=argparse.REMAINDER, help="check_netscaler arguments")
+    args = parser.parse_args()
+    check = args.check[1:] if args.check[:1] == ["--"] else args.check
+
+    # Warm up imports and caches once
+    run(args.cassette, check)
+
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        samples = [run(args.cassette, check) for _ in range(args.runs)]
+        profiler.disable()
+    else:
+        samples = [run(args.cassette, check) for _ in range(args.runs)]
+
+    print(f"check: {' '.join(check)}")
+    print(
+        f"runs: {len(samples)}  median: {statistics.median(samples):.1f} ms  "
+        f"min: {min(samples):.1f} ms  max: {max(samples):.1f} ms"
+    )
+
+    if args.profile:
+        pstats.Stats(profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(25)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,11 @@ Command-line interface for check_netscaler
 import argparse
 import os
 import sys
-from typing import List, Optional
+import time
+from typing import Dict, List, Optional, Tuple
 
 from check_netscaler import __version__
+from check_netscaler.client.exceptions import NITRODeadlineError
 from check_netscaler.constants import (
     DEFAULT_API_VERSION,
     DEFAULT_PASSWORD,
@@ -85,6 +87,197 @@ def create_parser() -> argparse.ArgumentParser:
         help=f"Connection timeout in seconds (default: {DEFAULT_TIMEOUT})",
     )
 
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=os.getenv("NETSCALER_DEADLINE", "0"),
+        metavar="SECONDS",
+        help="Overall time budget for all NITRO requests of the check; each request gets "
+        "at most the time left (env: NETSCALER_DEADLINE, default: 0 = disabled)",
+    )
+
+    parser.add_argument(
+        "--adaptive-timeout",
+        type=float,
+        default=os.getenv("NETSCALER_ADAPTIVE_TIMEOUT", "0"),
+        metavar="FACTOR",
+        help="Derive each request's timeout from the p99 latency of earlier checks times "
+        "FACTOR, between --min-timeout and --timeout "
+        "(env: NETSCALER_ADAPTIVE_TIMEOUT, default: 0 = disabled)",
+    )
+
+    parser.add_argument(
+        "--min-timeout",
+        type=float,
+        default=os.getenv("NETSCALER_MIN_TIMEOUT", "2"),
+        metavar="SECONDS",
+        help="Lower bound of adaptive timeouts (env: NETSCALER_MIN_TIMEOUT, default: 2)",
+    )
+
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=os.getenv("NETSCALER_RETRIES", "0"),
+        metavar="N",
+        help="Retry GETs up to N times on HTTP 502/503/504 and connection errors, with "
+        "jittered exponential backoff within --deadline (env: NETSCALER_RETRIES, default: 0)",
+    )
+
+    parser.add_argument(
+        "--hedge-host",
+        action="append",
+        default=[],
+        metavar="HOST",
+        help="Further host serving the same data, e.g. the other node of an HA pair; "
+        "a request is repeated there if -H has not answered after --hedge-delay "
+        "(can be repeated)",
+    )
+
+    parser.add_argument(
+        "--hedge-delay",
+        type=float,
+        default=os.getenv("NETSCALER_HEDGE_DELAY", "1"),
+        metavar="SECONDS",
+        help="Seconds to wait for a host before asking the next --hedge-host "
+        "(env: NETSCALER_HEDGE_DELAY, default: 1)",
+    )
+
+    parser.add_argument(
+        "--auth-mode",
+        choices=["session", "headers"],
+        default=os.getenv("NETSCALER_AUTH_MODE", "session"),
+        help="Authentication mode: 'session' logs in and out around the check, 'headers' "
+        "sends X-NITRO-USER/X-NITRO-PASS with every request "
+        "(env: NETSCALER_AUTH_MODE, default: session)",
+    )
+
+    # Performance options
+    parser.add_argument(
+        "--transport",
+        choices=["requests", "stdlib"],
+        default=os.getenv("NETSCALER_TRANSPORT", "requests"),
+        help="HTTP backend: 'requests' or 'stdlib' (http.client, faster startup) "
+        "(env: NETSCALER_TRANSPORT, default: requests)",
+    )
+
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument(
+        "--record",
+        metavar="FILE",
+        help="Record all NITRO requests and responses (secrets redacted) into a "
+        "compressed cassette file",
+    )
+    cassette.add_argument(
+        "--replay",
+        metavar="FILE",
+        help="Serve all NITRO requests from a cassette recorded with --record, without "
+        "network access (-H may be omitted)",
+    )
+
+    parser.add_argument(
+        "--pagesize",
+        type=int,
+        default=os.getenv("NETSCALER_PAGESIZE", "0"),
+        help="Fetch collections in pages of this many objects to keep memory use flat "
+        "(state, perfdata, matches; env: NETSCALER_PAGESIZE, default: 0 = disabled)",
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        default=False,
+        help="Decode collection responses incrementally instead of loading them at once "
+        "(state, perfdata, matches)",
+    )
+
+    parser.add_argument(
+        "--token-cache",
+        action="store_true",
+        default=False,
+        help="Reuse NITRO session tokens across invocations instead of logging in and out "
+        "for every check",
+    )
+
+    parser.add_argument(
+        "--response-cache",
+        action="store_true",
+        default=False,
+        help="Share GET responses with other checks of the same appliance for --cache-ttl "
+        "seconds instead of requesting them again",
+    )
+
+    parser.add_argument(
+        "--cache-ttl",
+        default=os.getenv("NETSCALER_CACHE_TTL", "stat=10,config=60"),
+        metavar="ENDPOINT=SECONDS,...",
+        help="Seconds cached responses stay fresh per endpoint, 0 disables caching "
+        "(env: NETSCALER_CACHE_TTL, default: stat=10,config=60)",
+    )
+
+    parser.add_argument(
+        "--stale-if-error",
+        type=int,
+        default=os.getenv("NETSCALER_STALE_IF_ERROR", "0"),
+        metavar="SECONDS",
+        help="If the appliance cannot be reached, evaluate the last cached responses up to "
+        "SECONDS old and report their age (env: NETSCALER_STALE_IF_ERROR, default: 0 = disabled)",
+    )
+
+    parser.add_argument(
+        "--config-cache",
+        type=int,
+        default=os.getenv("NETSCALER_CONFIG_CACHE", "0"),
+        metavar="SECONDS",
+        help="Serve config responses from the response cache until the appliance "
+        "configuration changes, checked with one small nsconfig request, for at most "
+        "SECONDS (env: NETSCALER_CONFIG_CACHE, default: 0 = disabled)",
+    )
+
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=os.getenv("NETSCALER_MAX_CONCURRENT", "0"),
+        metavar="N",
+        help="Allow at most N concurrent NITRO requests per appliance across all plugin "
+        "processes; others wait for a free slot within --deadline "
+        "(env: NETSCALER_MAX_CONCURRENT, default: 0 = unlimited)",
+    )
+
+    parser.add_argument(
+        "--circuit-breaker",
+        type=int,
+        default=os.getenv("NETSCALER_CIRCUIT_BREAKER", "0"),
+        metavar="N",
+        help="Fail fast after N consecutive timeouts or connection failures to the host, "
+        "shared across invocations (env: NETSCALER_CIRCUIT_BREAKER, default: 0 = disabled)",
+    )
+
+    parser.add_argument(
+        "--circuit-cooldown",
+        type=int,
+        default=os.getenv("NETSCALER_CIRCUIT_COOLDOWN", "60"),
+        metavar="SECONDS",
+        help="Seconds an open circuit fails fast before a probe request is let through "
+        "(env: NETSCALER_CIRCUIT_COOLDOWN, default: 60)",
+    )
+
+    parser.add_argument(
+        "--dns-cache",
+        type=int,
+        default=os.getenv("NETSCALER_DNS_CACHE", "0"),
+        metavar="SECONDS",
+        help="Pin the appliance hostname to its resolved address for SECONDS, shared "
+        "across invocations; an expired address is used while the resolver fails "
+        "(env: NETSCALER_DNS_CACHE, default: 0 = disabled)",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory for cached state such as session tokens "
+        "(env: NETSCALER_CACHE_DIR, default: ~/.cache/check_netscaler)",
+    )
+
     # Check command arguments
     parser.add_argument(
         "-C",
@@ -174,12 +367,28 @@ def create_parser() -> argparse.ArgumentParser:
         help="Check backup vServer status (only for lbvserver). Set severity when backup is active.",
     )
 
+    parser.add_argument(
+        "--count-only",
+        action="store_true",
+        default=False,
+        help="state: let the appliance count objects per state instead of downloading "
+        "every object; only unhealthy objects are fetched, if few",
+    )
+
     parser.add_argument(
         "-x",
         "--urlopts",
         help="Additional URL options for API requests",
     )
 
+    parser.add_argument(
+        "--self-metrics",
+        action="store_true",
+        default=False,
+        help="Append timings and transfer sizes of the NITRO requests to the performance data "
+        "(nitro_login_ms, nitro_get_ms, nitro_bytes, nitro_requests, parse_ms, total_ms, ...)",
+    )
+
     parser.add_argument(
         "-v",
         "--verbose",
@@ -191,21 +400,126 @@ def create_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def self_metrics_perfdata(metrics: Dict[str, float], total: float) -> Dict[str, Dict[str, str]]:
+    """
+    Build the --self-metrics performance data
+
+    Args:
+        metrics: Totals from TransferStats.metrics()
+        total: Seconds since the plugin started
+
+    Returns:
+        Perfdata entries; times in ms, sizes in bytes
+    """
+    perfdata = {}
+    for name, value in dict(metrics, total_ms=total * 1000).items():
+        entry = {"value": f"{value:.0f}", "min": "0"}
+        if name.endswith("_ms"):
+            entry.update(value=f"{value:.1f}", uom="ms")
+        elif name.endswith("_bytes"):
+            entry["uom"] = "B"
+        perfdata[name] = entry
+    return perfdata
+
+
 def main(args: Optional[List[str]] = None) -> int:
     """Main entry point for CLI"""
+    started = time.perf_counter()
     parser = create_parser()
     parsed_args = parser.parse_args(args)
 
     # Validate required arguments
     if not parsed_args.hostname:
-        parser.error("argument -H/--hostname is required (or set NETSCALER_HOST)")
+        if not parsed_args.replay:
+            parser.error("argument -H/--hostname is required (or set NETSCALER_HOST)")
+        # Replayed requests are matched without the host
+        parsed_args.hostname = "localhost"
+
+    if parsed_args.stale_if_error > 0:
+        # These fetch past the response cache, so there would be nothing to serve
+        for option, value in (
+            ("--pagesize", parsed_args.pagesize > 0),
+            ("--stream", parsed_args.stream),
+            ("--count-only", parsed_args.count_only),
+        ):
+            if value:
+                parser.error(f"argument --stale-if-error: not allowed with argument {option}")
 
     try:
         # Import here to avoid circular dependencies
-        from check_netscaler.client import NITROClient
+        from check_netscaler.client import (
+            CircuitBreaker,
+            ConcurrencyGovernor,
+            Deadline,
+            DNSCache,
+            LatencyTracker,
+            NITROClient,
+            RetryPolicy,
+            TokenCache,
+        )
+        from check_netscaler.client.statefile import default_cache_dir
         from check_netscaler.commands.state import StateCommand
         from check_netscaler.output.nagios import NagiosOutput
 
+        # Start the clock before anything else touches the network
+        deadline = Deadline(parsed_args.deadline) if parsed_args.deadline > 0 else None
+
+        cache_dir = parsed_args.cache_dir or default_cache_dir()
+        token_cache = TokenCache(cache_dir) if parsed_args.token_cache else None
+        circuit_breaker = None
+        if parsed_args.circuit_breaker > 0:
+            circuit_breaker = CircuitBreaker(
+                cache_dir, parsed_args.circuit_breaker, parsed_args.circuit_cooldown
+            )
+        governor = None
+        if parsed_args.max_concurrent > 0:
+            governor = ConcurrencyGovernor(cache_dir, parsed_args.max_concurrent)
+        latency_tracker = None
+        if parsed_args.adaptive_timeout > 0:
+            latency_tracker = LatencyTracker(
+                cache_dir, parsed_args.adaptive_timeout, parsed_args.min_timeout
+            )
+
+        dns_cache = None
+        if parsed_args.dns_cache > 0:
+            dns_cache = DNSCache(cache_dir, parsed_args.dns_cache)
+
+        ttls: Dict[str, float] = {}
+        if parsed_args.response_cache:
+            from check_netscaler.client.response_cache import parse_ttls
+
+            try:
+                ttls = parse_ttls(parsed_args.cache_ttl)
+            except ValueError as e:
+                parser.error(f"argument --cache-ttl: {e}")
+        versioned: Tuple[str, ...] = ()
+        if parsed_args.config_cache > 0:
+            # Config responses stay valid until the appliance configuration changes
+            ttls["config"] = parsed_args.config_cache
+            versioned = ("config",)
+        response_cache = None
+        if parsed_args.response_cache or versioned or parsed_args.stale_if_error > 0:
+            from check_netscaler.client import ResponseCache
+
+            response_cache = ResponseCache(
+                cache_dir,
+                ttls,
+                versioned=versioned,
+                stale_if_error=parsed_args.stale_if_error,
+            )
+
+        cassette = None
+        if parsed_args.record or parsed_args.replay:
+            from check_netscaler.client import Cassette
+
+            if parsed_args.record:
+                cassette = Cassette(parsed_args.record, record=True)
+            else:
+                try:
+                    cassette = Cassette(parsed_args.replay)
+                except ValueError as e:
+                    parser.error(f"argument --replay: {e}")
+
         # Create NITRO client
         client = NITROClient(
             hostname=parsed_args.hostname,
@@ -216,6 +530,19 @@ def main(args: Optional[List[str]] = None) -> int:
             timeout=parsed_args.timeout,
             verify_ssl=not parsed_args.ssl,  # TODO: Add --insecure flag
             api_version=parsed_args.api,
+            token_cache=token_cache,
+            auth_mode=parsed_args.auth_mode,
+            transport=parsed_args.transport,
+            circuit_breaker=circuit_breaker,
+            deadline=deadline,
+            retry_policy=RetryPolicy(parsed_args.retries) if parsed_args.retries > 0 else None,
+            latency_tracker=latency_tracker,
+            governor=governor,
+            hedge_hosts=parsed_args.hedge_host,
+            hedge_delay=parsed_args.hedge_delay,
+            response_cache=response_cache,
+            cassette=cassette,
+            dns_cache=dns_cache,
         )
 
         # Execute command
@@ -292,21 +619,59 @@ def main(args: Optional[List[str]] = None) -> int:
                 print(f"UNKNOWN - Command '{parsed_args.command}' not yet implemented")
                 return STATE_UNKNOWN
 
+        # Name the host(s) that answered when hedging across several
+        message = result.message
+        if client.hedging and client.answered_by:
+            message = f"{message} (via {', '.join(client.answered_by)})"
+
+        # Time spent queueing for a request slot
+        perfdata = result.perfdata
+        if governor is not None:
+            perfdata = dict(perfdata)
+            perfdata["nitro_slot_wait"] = {
+                "value": f"{governor.wait_time:.3f}",
+                "uom": "s",
+                "min": "0",
+            }
+
+        # Age of cached responses served while the appliance was unreachable
+        if response_cache is not None and response_cache.stale_age is not None:
+            age = response_cache.stale_age
+            message = f"{message} (stale data, {age:.0f}s old: appliance unreachable)"
+            perfdata = dict(perfdata)
+            perfdata["nitro_data_age"] = {"value": f"{age:.0f}", "uom": "s", "min": "0"}
+
+        # Where the time of the check went
+        if parsed_args.self_metrics:
+            perfdata = dict(perfdata)
+            perfdata.update(
+                self_metrics_perfdata(
+                    client.transfer_stats.metrics(), time.perf_counter() - started
+                )
+            )
+
         # Format and print output
         output = NagiosOutput.format_output(
             status=result.status,
-            message=result.message,
-            perfdata=result.perfdata,
+            message=message,
+            perfdata=perfdata,
             long_output=result.long_output,
             separator=parsed_args.separator,
         )
         print(output)
 
+        if parsed_args.verbose > 0:
+            for line in client.transfer_stats.summary():
+                print(line, file=sys.stderr)
+
         return result.status
 
     except KeyboardInterrupt:
         print("UNKNOWN - Interrupted by user")
         return STATE_UNKNOWN
+    except NITRODeadlineError as e:
+        print(f"UNKNOWN - {e}")
+        return STATE_UNKNOWN
     except Exception as e:
         print(f"UNKNOWN - Unexpected error: {e}")
         if parsed_args.verbose > 0:
@@ -1,24 +1,67 @@
 """NITRO API client for NetScaler ADC"""
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from check_netscaler.client.circuit_breaker import CircuitBreaker
+from check_netscaler.client.deadline import Deadline
+from check_netscaler.client.dns_cache import DNSCache
 from check_netscaler.client.exceptions import (
     NITROAPIError,
     NITROAuthenticationError,
+    NITROCircuitOpenError,
     NITROConnectionError,
+    NITROConnectionRefusedError,
+    NITRODeadlineError,
     NITROException,
     NITROPermissionError,
     NITROResourceNotFoundError,
     NITROTimeoutError,
 )
+from check_netscaler.client.governor import ConcurrencyGovernor
+from check_netscaler.client.latency import LatencyTracker
 from check_netscaler.client.nitro import NITROClient
+from check_netscaler.client.retry import RetryPolicy
 from check_netscaler.client.session import NITROSession
+from check_netscaler.client.token_cache import TokenCache
+
+if TYPE_CHECKING:
+    from check_netscaler.client.cassette import Cassette
+    from check_netscaler.client.response_cache import ResponseCache
+
+# Only imported when used, so checks without --record/--replay or a response
+# cache do not load them
+_LAZY_IMPORTS = {
+    "Cassette": "check_netscaler.client.cassette",
+    "ResponseCache": "check_netscaler.client.response_cache",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        return getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "NITROClient",
     "NITROSession",
+    "TokenCache",
+    "Cassette",
+    "CircuitBreaker",
+    "ConcurrencyGovernor",
+    "Deadline",
+    "DNSCache",
+    "LatencyTracker",
+    "ResponseCache",
+    "RetryPolicy",
     "NITROException",
     "NITROAuthenticationError",
     "NITROConnectionError",
+    "NITROConnectionRefusedError",
+    "NITROCircuitOpenError",
     "NITROTimeoutError",
+    "NITRODeadlineError",
     "NITROAPIError",
     "NITROResourceNotFoundError",
     "NITROPermissionError",
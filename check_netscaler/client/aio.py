@@ -0,0 +1,91 @@
+"""
+asyncio interface for concurrent NITRO requests
+"""
+
+import asyncio
+from functools import partial
+from typing import Any, Dict, Optional, Sequence, Union
+
+from check_netscaler.client.nitro import BatchRequest, NITROClient
+
+
+class AsyncNITROClient:
+    """
+    Coroutine-based access to a logged-in NITROClient
+
+    A thin wrapper around NITROClient.get_many(): requests run on its bounded
+    thread pool and share the client's authentication state and HTTP
+    connection pool. Independent requests can be awaited together with
+    ``asyncio.gather`` or, to use a single pool, batched with get_many().
+    """
+
+    def __init__(self, client: NITROClient, max_workers: int = NITROClient.DEFAULT_MAX_WORKERS):
+        """
+        Initialize async client
+
+        Args:
+            client: Logged-in NITRO client to issue the requests with
+            max_workers: Maximum number of requests of a batch in flight at once
+        """
+        self.client = client
+        self.max_workers = max_workers
+
+    async def get_many(
+        self, requests: Sequence[BatchRequest]
+    ) -> Dict[BatchRequest, Union[Dict[str, Any], Exception]]:
+        """
+        Perform several GET requests concurrently, see NITROClient.get_many()
+
+        Args:
+            requests: (endpoint, resource_type, resource_name, url_options) tuples
+
+        Returns:
+            Dictionary mapping each request tuple to its response or exception
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, partial(self.client.get_many, requests, max_workers=self.max_workers)
+        )
+
+    async def get(
+        self,
+        resource_type: str,
+        resource_name: Optional[str] = None,
+        endpoint: str = "stat",
+        url_options: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Perform GET request to NITRO API
+
+        Args:
+            resource_type: Type of resource (e.g., 'lbvserver', 'service')
+            resource_name: Specific resource name (optional)
+            endpoint: API endpoint type ('stat' or 'config')
+            url_options: Additional URL options
+
+        Returns:
+            API response as dictionary
+        """
+        request = (endpoint, resource_type, resource_name, url_options)
+        result = (await self.get_many([request]))[request]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def get_stat(
+        self,
+        resource_type: str,
+        resource_name: Optional[str] = None,
+        url_options: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get statistics for a resource"""
+        return await self.get(resource_type, resource_name, "stat", url_options)
+
+    async def get_config(
+        self,
+        resource_type: str,
+        resource_name: Optional[str] = None,
+        url_options: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get configuration for a resource"""
+        return await self.get(resource_type, resource_name, "config", url_options)
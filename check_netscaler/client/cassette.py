@@ -0,0 +1,282 @@
+"""
+Recording and replay of NITRO traffic
+
+A cassette is a gzip-compressed JSON Lines file holding one request and its
+response (an interaction) per line. RecordingTransport wraps a real
+transport and adds every response to a cassette; ReplayTransport serves the
+responses of a cassette without any network access. Production-sized data
+can so be captured once and used to benchmark and profile the commands
+offline.
+
+Secrets are not recorded: request bodies (the login credentials) are
+dropped, cookie values and JSON members like ``sessionid`` or ``password``
+are replaced by ``REDACTED``, and URLs are stored without scheme and host.
+"""
+
+import gzip
+import http.client
+import json
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from check_netscaler.client import jsonbackend, statefile
+from check_netscaler.client.dns_cache import DNSCache
+from check_netscaler.client.exceptions import NITROConnectionError
+from check_netscaler.client.transport import Cookie, StdlibResponse, Transport
+
+FORMAT_VERSION = 1
+REDACTED = "REDACTED"
+
+# JSON members whose values are replaced in recorded bodies
+_SECRET_KEYS = re.compile(r"sessionid|password|passphrase|secret", re.IGNORECASE)
+
+
+def _redact(data: Any) -> Any:
+    """Return a copy of decoded JSON with secret members replaced"""
+    if isinstance(data, dict):
+        return {
+            key: REDACTED if _SECRET_KEYS.search(key) else _redact(value)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [_redact(item) for item in data]
+    return data
+
+
+class Cassette:
+    """
+    Interactions recorded from, or to be replayed instead of, an appliance
+
+    Requests are matched by method, path and query string. If a request was
+    recorded several times, the responses are replayed in recorded order and
+    the last one is repeated once they are used up.
+    """
+
+    def __init__(self, path: str, record: bool = False):
+        """
+        Initialize cassette
+
+        Args:
+            path: Cassette file (gzip-compressed JSON Lines)
+            record: Record a new cassette instead of loading an existing one
+
+        Raises:
+            ValueError: If the cassette to replay cannot be read
+        """
+        self.path = path
+        self.recording = record
+        self.interactions: List[Dict[str, Any]] = []
+        self._positions: Dict[Tuple[str, str], int] = {}
+        self._index: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        if not record:
+            self._load()
+
+    @staticmethod
+    def request_key(method: str, url: str) -> Tuple[str, str]:
+        """Return the (method, path?query) an interaction is matched by"""
+        parts = urlsplit(url)
+        return method.upper(), parts.path + (f"?{parts.query}" if parts.query else "")
+
+    def _load(self) -> None:
+        """Read the cassette file and index its interactions"""
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                header = json.loads(f.readline() or "{}")
+                if header.get("cassette") != FORMAT_VERSION:
+                    raise ValueError("not a check_netscaler cassette")
+                for line in f:
+                    if line.strip():
+                        self._index_interaction(json.loads(line))
+        except (OSError, EOFError, ValueError, AttributeError) as e:
+            raise ValueError(f"Cannot read cassette {self.path}: {e}") from e
+
+    def _index_interaction(self, entry: Dict[str, Any]) -> None:
+        """Add a loaded interaction to the replay index"""
+        # Encode once, so replaying large bodies repeatedly costs nothing
+        entry["content"] = entry.pop("body", "").encode("utf-8")
+        self.interactions.append(entry)
+        self._index.setdefault((entry["method"], entry["url"]), []).append(entry)
+
+    def add(
+        self,
+        method: str,
+        url: str,
+        status_code: int,
+        content_type: Optional[str],
+        cookies: List[str],
+        content: bytes,
+    ) -> None:
+        """
+        Add an interaction to a recording cassette
+
+        Args:
+            method: HTTP method
+            url: Request URL (scheme and host are dropped)
+            status_code: HTTP status code
+            content_type: Content-Type of the response
+            cookies: Names of the cookies the response set
+            content: Decompressed response body
+        """
+        body = content.decode("utf-8", errors="replace")
+        try:
+            body = json.dumps(_redact(jsonbackend.loads(content)))
+        except ValueError:
+            # Not JSON; recorded as is
+            pass
+
+        _, path = self.request_key(method, url)
+        entry = {
+            "method": method.upper(),
+            "url": path,
+            "status": status_code,
+            "content_type": content_type,
+            "cookies": cookies,
+            "body": body,
+        }
+        with self._lock:
+            self.interactions.append(entry)
+
+    def find(self, method: str, url: str) -> Optional[Dict[str, Any]]:
+        """Return the next recorded interaction for a request, or None"""
+        key = self.request_key(method, url)
+        with self._lock:
+            entries = self._index.get(key)
+            if not entries:
+                return None
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            return entries[min(position, len(entries) - 1)]
+
+    def save(self) -> None:
+        """Write a recording cassette atomically, readable only by the current user"""
+        with self._lock:
+            lines = [json.dumps({"cassette": FORMAT_VERSION})]
+            lines.extend(json.dumps(entry) for entry in self.interactions)
+        statefile.write_bytes(self.path, gzip.compress("\n".join(lines).encode("utf-8")))
+
+
+class RecordingTransport(Transport):
+    """Transport adding every response of a wrapped transport to a cassette"""
+
+    def __init__(self, inner: Transport, cassette: Cassette):
+        """
+        Initialize recording transport
+
+        Args:
+            inner: Transport performing the requests
+            cassette: Recording cassette
+        """
+        self.inner = inner
+        self.cassette = cassette
+        super().__init__(verify_ssl=inner.verify_ssl)
+        self.name = inner.name
+        self.stats = inner.stats
+
+    @property
+    def dns_cache(self) -> Optional[DNSCache]:
+        """DNS cache of the wrapped transport"""
+        return self.inner.dns_cache
+
+    @dns_cache.setter
+    def dns_cache(self, value: Optional[DNSCache]) -> None:
+        self.inner.dns_cache = value
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return self.inner.headers
+
+    def get_cookie(self, name: str) -> Optional[str]:
+        return self.inner.get_cookie(name)
+
+    def set_cookie(self, name: str, value: str) -> None:
+        self.inner.set_cookie(name, value)
+
+    def clear_cookies(self) -> None:
+        self.inner.clear_cookies()
+
+    def get(self, url: str, timeout: float, stream: bool = False) -> Any:
+        # The body is needed for the cassette, so it is always read at once
+        return self._record("GET", url, self.inner.get(url, timeout))
+
+    def post(self, url: str, json: Any, timeout: float) -> Any:
+        return self._record("POST", url, self.inner.post(url, json, timeout))
+
+    def close(self) -> None:
+        self.inner.close()
+
+    def _record(self, method: str, url: str, response: Any) -> Any:
+        """Add a response to the cassette and return it"""
+        self.cassette.add(
+            method,
+            url,
+            response.status_code,
+            response.headers.get("Content-Type"),
+            [cookie.name for cookie in response.cookies],
+            response.content,
+        )
+        return response
+
+
+class ReplayTransport(Transport):
+    """Transport serving the responses of a cassette instead of an appliance"""
+
+    name = "replay"
+
+    def __init__(self, cassette: Cassette, verify_ssl: bool = True):
+        """
+        Initialize replay transport
+
+        Args:
+            cassette: Cassette to replay
+            verify_ssl: Ignored; accepted for interface compatibility
+        """
+        super().__init__(verify_ssl=verify_ssl)
+        self.cassette = cassette
+        self._headers: Dict[str, str] = {}
+        self._cookies: Dict[str, str] = {}
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return self._headers
+
+    def get_cookie(self, name: str) -> Optional[str]:
+        return self._cookies.get(name)
+
+    def set_cookie(self, name: str, value: str) -> None:
+        self._cookies[name] = value
+
+    def clear_cookies(self) -> None:
+        self._cookies.clear()
+
+    def get(self, url: str, timeout: float, stream: bool = False) -> StdlibResponse:
+        return self._replay("GET", url)
+
+    def post(self, url: str, json: Any, timeout: float) -> StdlibResponse:
+        return self._replay("POST", url)
+
+    def _replay(self, method: str, url: str) -> StdlibResponse:
+        """Return the recorded response for a request"""
+        start = time.perf_counter()
+        entry = self.cassette.find(method, url)
+        if entry is None:
+            _, path = Cassette.request_key(method, url)
+            raise NITROConnectionError(f"No recorded response for {method} {path}")
+
+        headers = http.client.HTTPMessage()
+        if entry.get("content_type"):
+            headers["Content-Type"] = entry["content_type"]
+        cookies = []
+        for name in entry.get("cookies") or []:
+            headers["Set-Cookie"] = f"{name}={REDACTED}"
+            cookies.append(Cookie(name, REDACTED))
+            self._cookies[name] = REDACTED
+
+        content = entry["content"]
+        self.stats.record(
+            method, url, entry["status"], len(content), len(content), time.perf_counter() - start
+        )
+        return StdlibResponse(entry["status"], headers, content, cookies)
@@ -0,0 +1,118 @@
+"""
+Per-appliance circuit breaker shared across plugin invocations
+"""
+
+import time
+from typing import Dict
+
+from check_netscaler.client import statefile
+from check_netscaler.client.exceptions import NITROCircuitOpenError
+
+
+class CircuitBreaker:
+    """
+    Fails fast while an appliance keeps timing out or refusing connections
+
+    The state of each host is kept in a small state file, so all plugin
+    processes checking the same appliance share it. After ``threshold``
+    consecutive connection failures or timeouts the circuit opens and
+    requests fail immediately for ``cooldown`` seconds. After that a single
+    probe request is let through: if it succeeds the circuit closes, if it
+    fails the circuit stays open for another cool-down period.
+    """
+
+    # Seconds the circuit stays open before a probe request is allowed
+    DEFAULT_COOLDOWN = 60
+
+    def __init__(self, cache_dir: str, threshold: int, cooldown: int = DEFAULT_COOLDOWN):
+        """
+        Initialize circuit breaker
+
+        Args:
+            cache_dir: Directory for the state files (created with mode 0700)
+            threshold: Consecutive failures after which the circuit opens
+            cooldown: Seconds to fail fast before letting a probe through
+        """
+        self.cache_dir = cache_dir
+        self.threshold = threshold
+        self.cooldown = cooldown
+        # Hosts for which this process saw failures in the state file
+        self._failing: Dict[str, bool] = {}
+
+    def _path(self, host: str) -> str:
+        """Return the state file path for a host (host[:port])"""
+        return statefile.state_path(self.cache_dir, "circuit", host)
+
+    def before_request(self, host: str) -> None:
+        """
+        Check whether a request to the host may be sent
+
+        Raises:
+            NITROCircuitOpenError: If the circuit is open, or half-open with a
+                probe already in flight from another process
+        """
+        path = self._path(host)
+        state = statefile.read_json(path)
+        if not state or state.get("failures", 0) < self.threshold:
+            self._failing[host] = bool(state and state.get("failures"))
+            return
+
+        self._failing[host] = True
+        try:
+            with statefile.locked(path):
+                self._admit(host, path)
+        except OSError:
+            # Without a usable state directory the breaker stays out of the way
+            pass
+
+    def _admit(self, host: str, path: str) -> None:
+        """Decide on an open circuit while holding the state file lock"""
+        state = statefile.read_json(path) or {}
+        if state.get("failures", 0) < self.threshold:
+            return
+
+        now = time.time()
+        opened_at = state.get("opened_at") or 0
+        probe_started = state.get("probe_started") or 0
+        if now < opened_at + self.cooldown:
+            raise NITROCircuitOpenError(
+                f"Circuit breaker open for {host} after {state['failures']} consecutive "
+                f"failures, retrying in {opened_at + self.cooldown - now:.0f}s"
+            )
+        if now < probe_started + self.cooldown:
+            raise NITROCircuitOpenError(
+                f"Circuit breaker half-open for {host}, waiting for the probe request"
+            )
+
+        # This process sends the probe
+        state["probe_started"] = now
+        statefile.write_json(path, state)
+
+    def record_success(self, host: str) -> None:
+        """Close the circuit after a successful request"""
+        if not self._failing.get(host):
+            return
+
+        path = self._path(host)
+        try:
+            with statefile.locked(path):
+                statefile.remove(path)
+        except OSError:
+            pass
+        self._failing[host] = False
+
+    def record_failure(self, host: str) -> None:
+        """Count a connection failure or timeout; opens the circuit at the threshold"""
+        path = self._path(host)
+        try:
+            with statefile.locked(path):
+                state = statefile.read_json(path) or {}
+                failures = int(state.get("failures", 0)) + 1
+                state = {"failures": failures}
+                if failures >= self.threshold:
+                    state["opened_at"] = time.time()
+                statefile.write_json(path, state)
+        except OSError:
+            # State errors must not mask the failure being recorded
+            pass
+        self._failing[host] = True
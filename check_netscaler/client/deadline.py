@@ -0,0 +1,53 @@
+"""
+Overall time budget for all NITRO requests of a check
+"""
+
+import time
+from typing import Callable
+
+from check_netscaler.client.exceptions import NITRODeadlineError
+
+
+class Deadline:
+    """
+    Per-invocation deadline drawn down by every request
+
+    ``--timeout`` applies to each request on its own, so a check making
+    several requests could take a multiple of it. With a deadline, each
+    request is given at most the time left in the overall budget.
+    """
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize deadline, starting the clock now
+
+        Args:
+            seconds: Total time budget in seconds
+            clock: Monotonic time source (for tests)
+        """
+        self.seconds = seconds
+        self._clock = clock
+        self._expires = clock() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left in the budget (negative once exceeded)"""
+        return self._expires - self._clock()
+
+    def timeout(self, phase: str, limit: float) -> float:
+        """
+        Return the timeout for the next request
+
+        Args:
+            phase: What the request is for (e.g. 'login', 'stat/lbvserver')
+            limit: Per-request timeout
+
+        Returns:
+            The per-request timeout, capped to the remaining budget
+
+        Raises:
+            NITRODeadlineError: If no time is left
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise NITRODeadlineError(phase, self.seconds)
+        return min(limit, remaining)
@@ -0,0 +1,115 @@
+"""
+Cache of appliance address resolutions shared between plugin invocations
+"""
+
+import ipaddress
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from check_netscaler.client import statefile
+
+
+def is_address(host: str) -> bool:
+    """Return whether a host is an IP address literal (no resolution needed)"""
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+    except ValueError:
+        return False
+    return True
+
+
+class DNSCache:
+    """
+    Pins appliance hostnames to the address they resolved to
+
+    Every plugin invocation would otherwise resolve ``--hostname`` again. A
+    resolved address is kept in a small state file for ``ttl`` seconds, so
+    all plugin processes checking the same appliance share it, and the
+    transports connect straight to it. Hostname verification and the Host
+    header still use the hostname.
+
+    If the resolver fails (e.g. during resolver maintenance), an expired
+    address is used instead of failing the check.
+    """
+
+    # Seconds a resolved address is used before resolving again
+    DEFAULT_TTL = 300
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.time,
+        resolver: Callable[..., Any] = socket.getaddrinfo,
+    ):
+        """
+        Initialize DNS cache
+
+        Args:
+            cache_dir: Directory for the state files (created with mode 0700)
+            ttl: Seconds a resolved address is used
+            clock: Wall clock for the age of entries
+            resolver: getaddrinfo()-compatible resolver function
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.clock = clock
+        self.resolver = resolver
+        # Addresses already looked up by this process, by (host, port)
+        self._addresses: Dict[Tuple[str, int], Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, host: str, port: int) -> str:
+        """Return the state file path for a host and port"""
+        return statefile.state_path(self.cache_dir, "dns", host.lower(), port)
+
+    def resolve(self, host: str, port: int) -> Optional[str]:
+        """
+        Return the address to connect to for a host
+
+        Args:
+            host: Hostname of the appliance
+            port: Port that will be connected to
+
+        Returns:
+            IP address, or None if the host is an address already or could
+            not be resolved (the transport then connects as usual)
+        """
+        if is_address(host):
+            return None
+
+        key = (host, port)
+        with self._lock:
+            if key in self._addresses:
+                return self._addresses[key]
+
+        address = self._load_or_lookup(host, port)
+        with self._lock:
+            self._addresses[key] = address
+        return address
+
+    def _load_or_lookup(self, host: str, port: int) -> Optional[str]:
+        """Return a fresh cached address, or resolve and store the host"""
+        path = self._path(host, port)
+        entry = statefile.read_json(path) or {}
+        cached: Optional[str] = None
+        resolved = entry.get("resolved")
+        if isinstance(entry.get("address"), str) and isinstance(resolved, (int, float)):
+            cached = str(entry["address"])
+            if 0 <= self.clock() - resolved < self.ttl:
+                return cached
+
+        try:
+            infos = self.resolver(host, port, type=socket.SOCK_STREAM)
+            address = str(infos[0][4][0])
+        except (OSError, IndexError, UnicodeError):
+            # Resolver unavailable; an expired address beats no address
+            return cached
+
+        try:
+            statefile.write_json(path, {"address": address, "resolved": self.clock()})
+        except OSError:
+            pass
+        return address
@@ -21,12 +21,33 @@ class NITROConnectionError(NITROException):
     pass
 
 
+class NITROConnectionRefusedError(NITROConnectionError):
+    """Connection refused; the request was not sent"""
+
+    pass
+
+
+class NITROCircuitOpenError(NITROConnectionError):
+    """Request not sent because the circuit breaker for the host is open"""
+
+    pass
+
+
 class NITROTimeoutError(NITROException):
     """Request timed out"""
 
     pass
 
 
+class NITRODeadlineError(NITROTimeoutError):
+    """The overall check deadline ran out"""
+
+    def __init__(self, phase: str, deadline: float):
+        super().__init__(f"Check deadline of {deadline:g}s exceeded during {phase}")
+        self.phase = phase
+        self.deadline = deadline
+
+
 class NITROAPIError(NITROException):
     """API returned an error response"""
 
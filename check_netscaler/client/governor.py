@@ -0,0 +1,113 @@
+"""
+Cross-process limit on concurrent NITRO requests per appliance
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Optional
+
+from check_netscaler.client import statefile
+from check_netscaler.client.exceptions import NITROTimeoutError
+
+
+class ConcurrencyGovernor:
+    """
+    Semaphore with N slots per host, shared by all plugin processes
+
+    Each slot is a lock file in the state directory. A request takes a slot
+    by acquiring a non-blocking flock on one of the files and gives it back
+    by closing the file, so slots held by a crashed process are freed by the
+    kernel. If all slots are taken, the request waits, polling with a short
+    backoff, until a slot is free or its wait budget is used up. On platforms
+    without fcntl the governor does not limit anything.
+    """
+
+    # First and maximum pause between polls for a free slot, in seconds
+    POLL_INTERVAL = 0.02
+    MAX_POLL_INTERVAL = 0.25
+
+    def __init__(self, cache_dir: str, slots: int):
+        """
+        Initialize governor
+
+        Args:
+            cache_dir: Directory for the slot lock files (created with mode 0700)
+            slots: Number of concurrent requests allowed per host
+        """
+        self.cache_dir = cache_dir
+        self.slots = slots
+        # Seconds this process spent waiting for slots
+        self.wait_time = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, host: str, timeout: float) -> Optional[int]:
+        """
+        Take a slot for a request to the host
+
+        Args:
+            host: Host the request goes to (host[:port])
+            timeout: Maximum seconds to wait for a free slot
+
+        Returns:
+            Handle to pass to release(), or None if slots are not enforced
+
+        Raises:
+            NITROTimeoutError: If no slot became free in time
+        """
+        if not statefile.HAVE_FCNTL:
+            return None
+
+        paths = [
+            statefile.state_path(self.cache_dir, "slot", host, n, suffix=".lock")
+            for n in range(self.slots)
+        ]
+        try:
+            statefile.ensure_dir(self.cache_dir)
+        except OSError:
+            return None
+
+        start = time.monotonic()
+        interval = self.POLL_INTERVAL
+        try:
+            while True:
+                # Start at a random slot so waiting processes spread over the files
+                offset = random.randrange(self.slots)
+                for path in paths[offset:] + paths[:offset]:
+                    fd = self._try_lock(path)
+                    if fd is not None:
+                        return fd
+
+                waited = time.monotonic() - start
+                if waited + interval > timeout:
+                    raise NITROTimeoutError(
+                        f"No free request slot for {host} after {waited:.1f}s "
+                        f"({self.slots} slots in use)"
+                    )
+                time.sleep(interval)
+                interval = min(interval * 2, self.MAX_POLL_INTERVAL)
+        finally:
+            with self._lock:
+                self.wait_time += time.monotonic() - start
+
+    @staticmethod
+    def _try_lock(path: str) -> Optional[int]:
+        """Lock a slot file without blocking; returns the descriptor or None"""
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            statefile.fcntl.flock(fd, statefile.fcntl.LOCK_EX | statefile.fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        except BaseException:
+            os.close(fd)
+            raise
+        return fd
+
+    @staticmethod
+    def release(handle: Optional[int]) -> None:
+        """Give a slot back"""
+        if handle is not None:
+            # Closing the descriptor releases the lock
+            os.close(handle)
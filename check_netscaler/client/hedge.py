@@ -0,0 +1,105 @@
+"""
+Hedged requests across several appliances (e.g. both nodes of an HA pair)
+"""
+
+import queue
+import threading
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from check_netscaler.client.exceptions import NITROConnectionError, NITROTimeoutError
+
+# Errors after which the next host is tried right away; any other error is
+# an answer from the appliance and ends the hedged request
+FAILOVER_ERRORS = (NITROConnectionError, NITROTimeoutError)
+
+
+def hedged_call(
+    calls: Sequence[Callable[[], Any]],
+    delay: float,
+    discard: Callable[[Any], None] = lambda result: None,
+) -> Tuple[int, Any]:
+    """
+    Run the first call and hedge it with the next ones
+
+    ``calls[0]`` is started at once. If it has not returned after ``delay``
+    seconds, or failed with a connection error or timeout, ``calls[1]`` is
+    started as well, and so on. The first successful result wins.
+
+    Calls run in daemon threads. Losing calls cannot be interrupted, but
+    they are abandoned: nobody waits for them, and their results are passed
+    to ``discard`` (e.g. to close a response) when they arrive.
+
+    Args:
+        calls: One callable per host, in order of preference
+        delay: Seconds to wait for a call before starting the next one
+        discard: Called with results that arrive after a winner was chosen
+
+    Returns:
+        Tuple of (index of the winning call, its result)
+
+    Raises:
+        The error of a call that failed with something other than a
+        connection error or timeout, or the last error if all calls failed
+    """
+    results: "queue.Queue[Tuple[int, Any, Optional[BaseException]]]" = queue.Queue()
+    lock = threading.Lock()
+    finished = False
+
+    def run(index: int) -> None:
+        try:
+            outcome: Tuple[int, Any, Optional[BaseException]] = (index, calls[index](), None)
+        except Exception as e:
+            outcome = (index, None, e)
+        with lock:
+            if not finished:
+                results.put(outcome)
+                return
+        if outcome[2] is None:
+            discard(outcome[1])
+
+    threads: List[threading.Thread] = []
+
+    def start_next() -> None:
+        thread = threading.Thread(
+            target=run, args=(len(threads),), name=f"nitro-hedge-{len(threads)}", daemon=True
+        )
+        threads.append(thread)
+        thread.start()
+
+    start_next()
+    pending = 1
+    last_error: Optional[BaseException] = None
+    try:
+        while pending:
+            wait = delay if len(threads) < len(calls) else None
+            try:
+                index, result, error = results.get(timeout=wait)
+            except queue.Empty:
+                start_next()
+                pending += 1
+                continue
+
+            pending -= 1
+            if error is None:
+                return index, result
+            if not isinstance(error, FAILOVER_ERRORS):
+                raise error
+
+            last_error = error
+            if len(threads) < len(calls):
+                start_next()
+                pending += 1
+
+        assert last_error is not None
+        raise last_error
+    finally:
+        with lock:
+            finished = True
+        # Results queued while the winner was being returned
+        while True:
+            try:
+                _, result, error = results.get_nowait()
+            except queue.Empty:
+                break
+            if error is None:
+                discard(result)
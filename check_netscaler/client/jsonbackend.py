@@ -0,0 +1,31 @@
+"""
+JSON decoding backend for NITRO responses
+
+Uses orjson when it is installed and the standard library json module
+otherwise. The backend is selected once at import time.
+"""
+
+import importlib
+import json
+from types import ModuleType
+from typing import Any, Optional, Union
+
+try:
+    orjson: Optional[ModuleType] = importlib.import_module("orjson")
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+    _orjson_loads = orjson.loads
+
+    def loads(data: Union[bytes, str]) -> Any:
+        """Decode a JSON document from bytes or text"""
+        return _orjson_loads(data)
+
+else:  # pragma: no cover - depends on the environment
+    BACKEND = "json"
+
+    def loads(data: Union[bytes, str]) -> Any:
+        """Decode a JSON document from bytes or text"""
+        return json.loads(data)
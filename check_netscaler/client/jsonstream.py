@@ -0,0 +1,143 @@
+"""
+Incremental decoding of NITRO JSON responses
+
+NITRO returns collections as ``{"errorcode": 0, ..., "<resource>": [{...}, ...]}``.
+iter_array_items() decodes such a body from a stream of byte chunks and
+yields the objects of the resource array one at a time, so neither the raw
+body nor the complete decoded tree has to be held in memory.
+"""
+
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+_WHITESPACE = " \t\n\r"
+
+
+class _Buffer:
+    """Text buffer filled from an iterator of byte chunks"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk; returns False at the end of the stream"""
+        if self.eof:
+            return False
+
+        # Drop consumed text so the buffer only holds the unparsed remainder
+        self.text = self.text[self.pos :]
+        self.pos = 0
+
+        for chunk in self._chunks:
+            if chunk:
+                self.text += self._decoder.decode(chunk)
+                return True
+
+        self.text += self._decoder.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON response")
+
+    def expect(self, char: str) -> None:
+        """Consume the given character"""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' in JSON response, found '{found}'")
+        self.pos += 1
+
+    def value(self, decoder: json.JSONDecoder) -> Any:
+        """
+        Decode the next JSON value
+
+        A value is only accepted once the character following it is buffered,
+        so numbers and literals split across chunks are not cut short.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+            except ValueError:
+                if not self.fill():
+                    raise
+                continue
+            if end < len(self.text) or not self.fill():
+                self.pos = end
+                return value
+
+
+def iter_array_items(
+    chunks: Iterable[bytes],
+    key: str,
+    fields: Optional[Dict[str, Any]] = None,
+) -> Iterator[Any]:
+    """
+    Yield the items of the array stored under ``key`` in a JSON object
+
+    Args:
+        chunks: Response body as an iterable of byte chunks
+        key: Top-level member holding the array (e.g. 'lbvserver')
+        fields: Optional dictionary receiving the other top-level members
+            (e.g. 'errorcode' and 'message'), and ``key`` itself if it holds
+            a single object instead of an array
+
+    Yields:
+        Array items in order. A single object stored under ``key`` is yielded
+        as the only item.
+
+    Raises:
+        ValueError: If the body is not valid JSON
+    """
+    decoder = json.JSONDecoder()
+    buf = _Buffer(chunks)
+
+    buf.expect("{")
+    if buf.peek() == "}":
+        return
+
+    while True:
+        name = buf.value(decoder)
+        if not isinstance(name, str):
+            raise ValueError("Invalid member name in JSON response")
+        buf.expect(":")
+
+        if name == key and buf.peek() == "[":
+            buf.pos += 1
+            if buf.peek() == "]":
+                buf.pos += 1
+            else:
+                while True:
+                    yield buf.value(decoder)
+                    if buf.peek() == ",":
+                        buf.pos += 1
+                        continue
+                    buf.expect("]")
+                    break
+        elif name == key:
+            value = buf.value(decoder)
+            if fields is not None:
+                fields[name] = value
+            yield value
+        else:
+            value = buf.value(decoder)
+            if fields is not None:
+                fields[name] = value
+
+        if buf.peek() == ",":
+            buf.pos += 1
+            continue
+        buf.expect("}")
+        return
@@ -0,0 +1,117 @@
+"""
+Adaptive request timeouts derived from observed latencies
+"""
+
+import math
+import threading
+from typing import Dict, List, Optional
+
+from check_netscaler.client import statefile
+
+
+class LatencyTracker:
+    """
+    Keeps a rolling window of request latencies per host and endpoint
+
+    The windows are stored in a small state file per host, so latencies seen
+    by earlier plugin invocations determine the timeouts of the next one:
+    ``p99 * factor``, clamped between ``min_timeout`` and the configured
+    per-request timeout. Until enough samples exist, the configured timeout
+    is used unchanged.
+    """
+
+    # Samples kept per endpoint, and needed before the timeout adapts
+    WINDOW = 50
+    MIN_SAMPLES = 5
+    PERCENTILE = 0.99
+
+    DEFAULT_MIN_TIMEOUT = 2.0
+
+    def __init__(self, cache_dir: str, factor: float, min_timeout: float = DEFAULT_MIN_TIMEOUT):
+        """
+        Initialize latency tracker
+
+        Args:
+            cache_dir: Directory for the state files (created with mode 0700)
+            factor: Multiplier applied to the p99 latency
+            min_timeout: Lower bound of derived timeouts in seconds
+        """
+        self.cache_dir = cache_dir
+        self.factor = factor
+        self.min_timeout = min_timeout
+        # Samples per host and endpoint: loaded from disk, and recorded since
+        self._samples: Dict[str, Dict[str, List[float]]] = {}
+        self._new: Dict[str, Dict[str, List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, host: str) -> str:
+        """Return the state file path for a host (host[:port])"""
+        return statefile.state_path(self.cache_dir, "latency", host)
+
+    def _load(self, host: str) -> Dict[str, List[float]]:
+        """Read the stored samples of a host once per process"""
+        if host not in self._samples:
+            data = statefile.read_json(self._path(host)) or {}
+            self._samples[host] = {
+                phase: [float(x) for x in values if isinstance(x, (int, float))]
+                for phase, values in data.items()
+                if isinstance(values, list)
+            }
+        return self._samples[host]
+
+    def percentile(self, host: str, phase: str) -> Optional[float]:
+        """Return the p99 latency of an endpoint, or None without enough samples"""
+        with self._lock:
+            samples = sorted(self._load(host).get(phase, []))
+        if len(samples) < self.MIN_SAMPLES:
+            return None
+        rank = math.ceil(self.PERCENTILE * len(samples)) - 1
+        return samples[rank]
+
+    def timeout(self, host: str, phase: str, limit: float) -> float:
+        """
+        Return the timeout for a request
+
+        Args:
+            host: Host the request goes to (host[:port])
+            phase: Endpoint of the request (e.g. 'login', 'stat/lbvserver')
+            limit: Configured per-request timeout, used as upper bound
+        """
+        p99 = self.percentile(host, phase)
+        if p99 is None:
+            return limit
+        return max(self.min_timeout, min(limit, p99 * self.factor))
+
+    def record(self, host: str, phase: str, seconds: float) -> None:
+        """
+        Add a latency sample
+
+        Requests that time out are recorded with their timeout, so a timeout
+        that turned out too short grows again on the next invocations.
+        """
+        with self._lock:
+            self._load(host).setdefault(phase, []).append(seconds)
+            self._new.setdefault(host, {}).setdefault(phase, []).append(seconds)
+
+    def save(self) -> None:
+        """
+        Merge the new samples into the state files
+
+        Each file is re-read under a lock so samples of concurrent plugin
+        runs are not lost. Errors are ignored; the state is best effort.
+        """
+        with self._lock:
+            new, self._new = self._new, {}
+
+        for host, phases in new.items():
+            path = self._path(host)
+            try:
+                with statefile.locked(path):
+                    data = statefile.read_json(path) or {}
+                    for phase, values in phases.items():
+                        stored = data.get(phase)
+                        stored = stored if isinstance(stored, list) else []
+                        data[phase] = (stored + [round(v, 4) for v in values])[-self.WINDOW :]
+                    statefile.write_json(path, data)
+            except OSError:
+                pass
@@ -2,23 +2,67 @@
 NITRO API client for NetScaler
 """
 
-from typing import Any, Dict, Optional
-
-import requests
+import threading
+import time
+from functools import partial
+from itertools import chain
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
+from check_netscaler.client import jsonbackend
+from check_netscaler.client.circuit_breaker import CircuitBreaker
+from check_netscaler.client.deadline import Deadline
+from check_netscaler.client.dns_cache import DNSCache
 from check_netscaler.client.exceptions import (
     NITROAPIError,
+    NITROAuthenticationError,
     NITROConnectionError,
     NITROPermissionError,
     NITROResourceNotFoundError,
     NITROTimeoutError,
 )
+from check_netscaler.client.governor import ConcurrencyGovernor
+from check_netscaler.client.jsonstream import iter_array_items
+from check_netscaler.client.latency import LatencyTracker
+from check_netscaler.client.retry import RetryPolicy
 from check_netscaler.client.session import NITROSession
+from check_netscaler.client.stats import TransferStats
+from check_netscaler.client.token_cache import TokenCache
+from check_netscaler.utils.filters import build_filter
+
+if TYPE_CHECKING:
+    from check_netscaler.client.cassette import Cassette
+    from check_netscaler.client.response_cache import ResponseCache
+
+# (endpoint, resource_type, resource_name, url_options) as accepted by get_many()
+BatchRequest = Tuple[str, str, Optional[str], Optional[str]]
 
 
 class NITROClient:
     """Client for NetScaler NITRO REST API"""
 
+    # Default number of requests get_many() keeps in flight
+    DEFAULT_MAX_WORKERS = 4
+
+    # Default number of objects per request for iter_objects()
+    DEFAULT_PAGESIZE = 1000
+
+    # Bytes read per step when decoding streamed responses
+    STREAM_CHUNK_SIZE = 16384
+
+    # Seconds to wait for a host before hedging with the next one
+    DEFAULT_HEDGE_DELAY = 1.0
+
     def __init__(
         self,
         hostname: str,
@@ -29,6 +73,19 @@ class NITROClient:
         timeout: int = 15,
         verify_ssl: bool = True,
         api_version: str = "v1",
+        token_cache: Optional[TokenCache] = None,
+        auth_mode: str = "session",
+        transport: str = "requests",
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        deadline: Optional[Deadline] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        latency_tracker: Optional[LatencyTracker] = None,
+        governor: Optional[ConcurrencyGovernor] = None,
+        hedge_hosts: Sequence[str] = (),
+        hedge_delay: float = DEFAULT_HEDGE_DELAY,
+        response_cache: Optional["ResponseCache"] = None,
+        cassette: Optional["Cassette"] = None,
+        dns_cache: Optional[DNSCache] = None,
     ):
         """
         Initialize NITRO API client
@@ -42,25 +99,143 @@ class NITROClient:
             timeout: Request timeout in seconds
             verify_ssl: Verify SSL certificates (default: True)
             api_version: API version (default: v1)
+            token_cache: Reuse session tokens across invocations (default: disabled)
+            auth_mode: 'session' (login/logout) or 'headers' (per-request credentials)
+            transport: HTTP backend, 'requests' or 'stdlib' (default: requests)
+            circuit_breaker: Fail fast while the appliance keeps failing (default: disabled)
+            deadline: Overall time budget shared by all requests (default: none)
+            retry_policy: Retry transient failures (default: no retries)
+            latency_tracker: Derive timeouts from observed latencies (default: fixed timeout)
+            governor: Limit concurrent requests per appliance (default: unlimited)
+            hedge_hosts: Further hosts serving the same data, e.g. the other HA node
+                (default: none)
+            hedge_delay: Seconds to wait for a host before also asking the next one
+            response_cache: Share GET responses with other invocations for a TTL
+                (default: disabled)
+            cassette: Record all traffic into, or replay it from, a cassette; a
+                recording cassette is saved when the client is closed (default: none)
+            dns_cache: Connect to the address the hostname was pinned to by
+                earlier invocations (default: resolve on every connection)
         """
-        self.session = NITROSession(
-            hostname=hostname,
-            username=username,
-            password=password,
-            ssl=ssl,
-            port=port,
-            timeout=timeout,
-            verify_ssl=verify_ssl,
-        )
+
+        def make_session(host: str) -> NITROSession:
+            return NITROSession(
+                hostname=host,
+                username=username,
+                password=password,
+                ssl=ssl,
+                port=port,
+                timeout=timeout,
+                verify_ssl=verify_ssl,
+                token_cache=token_cache,
+                auth_mode=auth_mode,
+                transport=transport,
+                circuit_breaker=circuit_breaker,
+                deadline=deadline,
+                retry_policy=retry_policy,
+                latency_tracker=latency_tracker,
+                governor=governor,
+                cassette=cassette,
+                dns_cache=dns_cache,
+            )
+
+        self.session = make_session(hostname)
+        # Primary session first, then one per hedge host
+        self.sessions = [self.session] + [make_session(host) for host in hedge_hosts]
+        self.hedge_delay = hedge_delay
+        self.response_cache = response_cache
+        self.cassette = cassette
+        # Last configuration change of the appliance, probed once (see _config_version)
+        self._config_version_probed = False
+        self._config_version_value: Optional[str] = None
+        self._config_version_lock = threading.Lock()
+        # Error of a deferred login (see login)
+        self._login_error: Optional[Exception] = None
+        # Hosts that answered hedged requests, in order of first answer
+        self.answered_by: List[str] = []
+        self._hedge_ready = False
+        self._login_locks = {id(session): threading.Lock() for session in self.sessions}
+        self._lock = threading.Lock()
         self.api_version = api_version
+        # Attributes to request per config resource type (see declare_attrs)
+        self.config_attrs: Dict[str, Tuple[str, ...]] = {}
+
+    @property
+    def _serves_stale(self) -> bool:
+        """True if cached responses stand in for an unreachable appliance"""
+        return self.response_cache is not None and self.response_cache.stale_if_error > 0
+
+    @property
+    def hedging(self) -> bool:
+        """True if requests are hedged across several hosts"""
+        return len(self.sessions) > 1
 
     def login(self) -> None:
-        """Authenticate with NetScaler"""
-        self.session.login()
+        """
+        Authenticate with NetScaler
+
+        When hedging, each host logs in on its first request instead, so a
+        stalled host cannot block the check before the first request.
+
+        If the appliance is unreachable and the response cache serves stale
+        responses, the error is raised by the requests instead.
+        """
+        if self.hedging:
+            self._hedge_ready = True
+            return
+        try:
+            self.session.login()
+        except (NITROConnectionError, NITROTimeoutError) as e:
+            if not self._serves_stale:
+                raise
+            # Requests fail with this error, so cached responses can stand in
+            self._login_error = e
 
     def logout(self) -> None:
-        """Logout from NetScaler"""
-        self.session.logout()
+        """
+        Logout from NetScaler
+
+        When hedging, all hosts log out in parallel, and a host that does not
+        answer within the hedge delay is left to expire its session.
+        """
+        if not self.hedging:
+            self.session.logout()
+            return
+
+        self._hedge_ready = False
+        threads = [
+            threading.Thread(target=session.logout, daemon=True)
+            for session in self.sessions
+            if session.is_logged_in
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(self.hedge_delay)
+
+    @property
+    def transfer_stats(self) -> TransferStats:
+        """Per-request transfer statistics of the underlying transport(s)"""
+        if not self.hedging:
+            return self.session.transport.stats
+        return TransferStats.combine(session.transport.stats for session in self.sessions)
+
+    def declare_attrs(self, resource_type: str, attrs: Iterable[str]) -> None:
+        """
+        Restrict config requests for a resource type to the given attributes
+
+        Subsequent config GETs for the resource type send ``attrs=`` so the
+        appliance only serializes these fields. Attributes declared for the
+        same resource type are merged.
+
+        Args:
+            resource_type: Type of resource (e.g., 'sslcertkey')
+            attrs: Attribute names the caller reads
+        """
+        merged = dict.fromkeys(self.config_attrs.get(resource_type, ()))
+        merged.update(dict.fromkeys(attr for attr in attrs if attr))
+        if merged:
+            self.config_attrs[resource_type] = tuple(merged)
 
     def get(
         self,
@@ -72,6 +247,11 @@ class NITROClient:
         """
         Perform GET request to NITRO API
 
+        With a response cache, a body fetched by this or another invocation
+        within the TTL of the endpoint is returned without a request. Cached
+        responses of versioned endpoints are only returned if the appliance
+        configuration has not changed since (see _config_version).
+
         Args:
             resource_type: Type of resource (e.g., 'lbvserver', 'service')
             resource_name: Specific resource name (optional)
@@ -88,63 +268,288 @@ class NITROClient:
             NITROConnectionError: If connection fails
             NITROTimeoutError: If request times out
         """
-        if not self.session.is_logged_in:
+        if self.response_cache is None:
+            return self._get_uncached(resource_type, endpoint, url_options, resource_name)
+
+        # Only bodies that decode without error are stored in the cache
+        decoded: List[Dict[str, Any]] = []
+
+        def fetch() -> bytes:
+            content: bytes = self._send(resource_type, resource_name, endpoint, url_options).content
+            decoded.append(self._decode(content))
+            return content
+
+        key = (
+            self.session.base_url,
+            self.session.username,
+            endpoint,
+            resource_type,
+            resource_name,
+            url_options,
+            self.config_attrs.get(resource_type) if endpoint == "config" else None,
+        )
+        version = None
+        if endpoint in self.response_cache.versioned and resource_type != "nsconfig":
+            version = self._config_version()
+        content = self.response_cache.fetch(endpoint, key, fetch, version)
+        return decoded[0] if decoded else self._decode(content)
+
+    def _get_uncached(
+        self,
+        resource_type: str,
+        endpoint: str,
+        url_options: Optional[str],
+        resource_name: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Perform a GET request, bypassing the response cache (pages and counts)"""
+        response = self._send(resource_type, resource_name, endpoint, url_options)
+        return self._decode(response.content)
+
+    def _config_version(self) -> Optional[str]:
+        """
+        Return the time of the last configuration change on the appliance
+
+        Probed once per client with a small ``config/nsconfig`` request, so
+        cached config responses are only served while the configuration is
+        unchanged. Returns None if nsconfig cannot be read (e.g. no permission).
+        """
+        with self._config_version_lock:
+            if not self._config_version_probed:
+                try:
+                    response = self._send("nsconfig", None, "config", "attrs=lastconfigchangedtime")
+                    nsconfig = self._objects(self._decode(response.content), "nsconfig")
+                    changed = nsconfig[0].get("lastconfigchangedtime") if nsconfig else None
+                    self._config_version_value = str(changed) if changed else None
+                except NITROAPIError:
+                    self._config_version_value = None
+                except (NITROConnectionError, NITROTimeoutError):
+                    if not self._serves_stale:
+                        raise
+                    # Cached responses of any version are served stale instead
+                    self._config_version_value = None
+                self._config_version_probed = True
+            return self._config_version_value
+
+    def _decode(self, content: bytes) -> Dict[str, Any]:
+        """Parse a JSON response body and raise NITRO errors it carries"""
+        # Parse JSON response from the raw body (orjson if available)
+        start = time.perf_counter()
+        try:
+            data: Dict[str, Any] = jsonbackend.loads(content)
+        except ValueError as e:
+            raise NITROAPIError(f"Invalid JSON in API response: {e}") from e
+        finally:
+            self.session.transport.stats.record_parse(time.perf_counter() - start)
+
+        self._check_errorcode(data)
+        return data
+
+    def stream_objects(
+        self,
+        resource_type: str,
+        resource_name: Optional[str] = None,
+        endpoint: str = "stat",
+        url_options: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Perform GET request and decode the resource objects incrementally
+
+        The request is sent immediately, but the body is read and decoded in
+        chunks while the returned iterator is consumed. Only the object being
+        decoded is held in memory, not the raw body or the whole collection.
+
+        Args:
+            resource_type: Type of resource (e.g., 'lbvserver', 'service')
+            resource_name: Specific resource name (optional)
+            endpoint: API endpoint type ('stat' or 'config')
+            url_options: Additional URL options
+
+        Returns:
+            Iterator over the resource objects
+
+        Raises:
+            Same as get(); errors in the body are raised while iterating
+        """
+        response = self._send(resource_type, resource_name, endpoint, url_options, stream=True)
+        return self._iter_response(response, resource_type)
+
+    def _iter_response(
+        self, response: Any, resource_type: str, fields: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the resource objects of a streamed response
+
+        The other top-level members are stored in ``fields``, and the object
+        itself if the response holds a single object (see iter_array_items).
+        The time spent decoding, without waiting for the body, is recorded as
+        parse time like in _decode().
+        """
+        if fields is None:
+            fields = {}
+        chunks = response.iter_content(self.STREAM_CHUNK_SIZE)
+        decoding = 0.0
+        reading = 0.0
+
+        def read() -> Iterator[bytes]:
+            nonlocal reading
+            start = time.perf_counter()
+            for chunk in chunks:
+                reading += time.perf_counter() - start
+                yield chunk
+                start = time.perf_counter()
+            reading += time.perf_counter() - start
+
+        try:
+            objects = iter_array_items(read(), resource_type, fields)
+            while True:
+                start = time.perf_counter()
+                try:
+                    obj = next(objects)
+                except StopIteration:
+                    break
+                finally:
+                    decoding += time.perf_counter() - start
+                self._check_errorcode(fields)
+                yield obj
+            self._check_errorcode(fields)
+        except ValueError as e:
+            raise NITROAPIError(f"Invalid JSON in API response: {e}") from e
+        finally:
+            self.session.transport.stats.record_parse(max(0.0, decoding - reading))
+            response.close()
+
+    def _send(
+        self,
+        resource_type: str,
+        resource_name: Optional[str],
+        endpoint: str,
+        url_options: Optional[str],
+        stream: bool = False,
+    ) -> Any:
+        """
+        Send a GET request, hedged across hosts if configured
+
+        Returns:
+            Transport response with a successful status
+        """
+        if self._login_error is not None:
+            raise self._login_error
+
+        if not self.hedging:
+            return self._send_via(
+                self.session, resource_type, resource_name, endpoint, url_options, stream
+            )
+
+        if not self._hedge_ready:
+            raise NITROAPIError("Not logged in. Call login() first.")
+
+        # Imported here so checks without --hedge-host skip it
+        from check_netscaler.client.hedge import hedged_call
+
+        calls = [
+            partial(
+                self._send_via, session, resource_type, resource_name, endpoint, url_options, stream
+            )
+            for session in self.sessions
+        ]
+        index, response = hedged_call(calls, self.hedge_delay, discard=lambda r: r.close())
+
+        host = self.sessions[index].hostname
+        with self._lock:
+            if host not in self.answered_by:
+                self.answered_by.append(host)
+        return response
+
+    def _ensure_login(self, session: NITROSession) -> None:
+        """Log a hedge session in on first use"""
+        with self._login_locks[id(session)]:
+            if not session.is_logged_in:
+                session.login()
+
+    def _send_via(
+        self,
+        session: NITROSession,
+        resource_type: str,
+        resource_name: Optional[str],
+        endpoint: str,
+        url_options: Optional[str],
+        stream: bool = False,
+    ) -> Any:
+        """
+        Send a GET request through a session and map HTTP error statuses to exceptions
+
+        Returns:
+            Transport response with a successful status
+        """
+        if self.hedging:
+            self._ensure_login(session)
+        elif not session.is_logged_in:
             raise NITROAPIError("Not logged in. Call login() first.")
 
         # Build URL
-        url_parts = [self.session.base_url, endpoint, resource_type]
+        url_parts = [session.base_url, endpoint, resource_type]
         if resource_name:
             url_parts.append(resource_name)
 
         url = "/".join(url_parts)
 
+        # Only transfer the declared attributes, unless the caller asked for specific ones
+        attrs = self.config_attrs.get(resource_type) if endpoint == "config" else None
+        if attrs and "attrs=" not in (url_options or ""):
+            attrs_option = "attrs=" + ",".join(attrs)
+            url_options = f"{url_options}&{attrs_option}" if url_options else attrs_option
+
         if url_options:
             url = f"{url}?{url_options}"
 
-        try:
-            response = self.session.session.get(
-                url,
-                timeout=self.session.timeout,
-                verify=self.session.verify_ssl,
+        transport = session.transport
+        phase = f"{endpoint}/{resource_type}"
+        response = session.send(phase, transport.get, url, stream=stream)
+
+        # A reused session token may have expired on the appliance;
+        # log in once more and repeat the request
+        if response.status_code == 401 and session.token_reused:
+            if stream:
+                response.close()
+            session.refresh()
+            response = session.send(phase, transport.get, url, stream=stream)
+
+        if response.status_code >= 400 and stream:
+            # Error bodies are small; read them so the connection can be reused
+            _ = response.content
+
+        # Handle HTTP errors
+        if response.status_code == 401 and session.auth_mode == "headers":
+            raise NITROAuthenticationError(f"Authentication failed for user '{session.username}'")
+
+        if response.status_code == 404:
+            raise NITROResourceNotFoundError(
+                f"Resource not found: {resource_type}"
+                + (f"/{resource_name}" if resource_name else "")
+            )
+
+        if response.status_code == 403:
+            raise NITROPermissionError(f"Insufficient permissions to access {resource_type}")
+
+        if response.status_code >= 400:
+            raise NITROAPIError(
+                f"API error {response.status_code}: {response.text}",
+                error_code=response.status_code,
             )
 
-            # Handle HTTP errors
-            if response.status_code == 404:
-                raise NITROResourceNotFoundError(
-                    f"Resource not found: {resource_type}"
-                    + (f"/{resource_name}" if resource_name else "")
-                )
-
-            if response.status_code == 403:
-                raise NITROPermissionError(f"Insufficient permissions to access {resource_type}")
-
-            if response.status_code >= 400:
-                raise NITROAPIError(
-                    f"API error {response.status_code}: {response.text}",
-                    error_code=response.status_code,
-                )
-
-            # Parse JSON response
-            data = response.json()
-
-            # Check for NITRO error in response
-            if "errorcode" in data and data["errorcode"] != 0:
-                error_msg = data.get("message", "Unknown error")
-                error_code = data.get("errorcode")
-                raise NITROAPIError(
-                    f"NITRO API error {error_code}: {error_msg}",
-                    error_code=error_code,
-                    response=data,
-                )
-
-            return data
-
-        except requests.exceptions.Timeout as e:
-            raise NITROTimeoutError(f"Request timed out: {e}") from e
-        except requests.exceptions.ConnectionError as e:
-            raise NITROConnectionError(f"Connection failed: {e}") from e
-        except requests.exceptions.RequestException as e:
-            raise NITROConnectionError(f"Request failed: {e}") from e
+        return response
+
+    @staticmethod
+    def _check_errorcode(data: Dict[str, Any]) -> None:
+        """Raise NITROAPIError if a response carries a NITRO error code"""
+        if "errorcode" in data and data["errorcode"] != 0:
+            error_msg = data.get("message", "Unknown error")
+            error_code = data["errorcode"]
+            raise NITROAPIError(
+                f"NITRO API error {error_code}: {error_msg}",
+                error_code=error_code,
+                response=data,
+            )
 
     def get_stat(
         self,
@@ -184,6 +589,252 @@ class NITROClient:
         """
         return self.get(resource_type, resource_name, endpoint="config", url_options=url_options)
 
+    def get_many(
+        self,
+        requests: Sequence[BatchRequest],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> Dict[BatchRequest, Union[Dict[str, Any], Exception]]:
+        """
+        Perform several GET requests concurrently
+
+        The requests share the session and the connection pool of the
+        transport. A failing request does not abort the batch; its exception
+        is returned in place of the response.
+
+        Args:
+            requests: (endpoint, resource_type, resource_name, url_options) tuples
+            max_workers: Maximum number of requests in flight at once
+
+        Returns:
+            Dictionary mapping each request tuple to its response or exception
+        """
+        unique: List[BatchRequest] = list(dict.fromkeys(requests))
+        if not unique:
+            return {}
+
+        # Imported here so commands that make a single request skip it
+        from concurrent.futures import ThreadPoolExecutor
+
+        def fetch(request: BatchRequest) -> Union[Dict[str, Any], Exception]:
+            endpoint, resource_type, resource_name, url_options = request
+            get = self.get_config if endpoint == "config" else self.get_stat
+            try:
+                return get(resource_type, resource_name, url_options)
+            except Exception as e:
+                return e
+
+        workers = max(1, min(max_workers, len(unique)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="nitro") as executor:
+            results = list(executor.map(fetch, unique))
+
+        return dict(zip(unique, results))
+
+    def count(
+        self,
+        resource_type: str,
+        endpoint: str = "config",
+        url_options: Optional[str] = None,
+        filter: Optional[Dict[str, str]] = None,
+    ) -> int:
+        """
+        Return the number of objects in a collection (count=yes)
+
+        Only the count is transferred, so this is a cheap way to learn e.g. how
+        many vServers are DOWN: ``count("lbvserver", "stat", filter={"state": "DOWN"})``.
+
+        Args:
+            resource_type: Type of resource
+            endpoint: API endpoint type ('stat' or 'config')
+            url_options: Additional URL options
+            filter: Server-side filter conditions, attribute -> value; values
+                enclosed in slashes are regular expressions (e.g. '/^web_/')
+
+        Returns:
+            Number of objects
+
+        Raises:
+            NITROAPIError: If the response carries no count
+        """
+        if filter:
+            url_options = "&".join(o for o in (url_options, build_filter(filter)) if o)
+        total = self._get_count(resource_type, endpoint, url_options)
+        if total is None:
+            raise NITROAPIError(f"Invalid count response for {resource_type}")
+        return total
+
+    def _get_count(
+        self, resource_type: str, endpoint: str, url_options: Optional[str]
+    ) -> Optional[int]:
+        """Request count=yes and return the count, or None if the response has none"""
+        options = "count=yes" + (f"&{url_options}" if url_options else "")
+        data = self._get_uncached(resource_type, endpoint, options)
+
+        # NITRO omits the resource key for empty collections
+        if resource_type not in data:
+            return 0
+
+        try:
+            return int(data[resource_type][0]["__count"])
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+
+    def iter_objects(
+        self,
+        resource_type: str,
+        endpoint: str = "config",
+        pagesize: int = DEFAULT_PAGESIZE,
+        url_options: Optional[str] = None,
+        stream: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the objects of a collection, fetching them page by page
+
+        The collection is sized with count=yes and then requested with
+        pagesize/pageno, so only one page is held in memory at a time. If the
+        response carries no count, pages are requested until a short page is
+        returned.
+
+        Args:
+            resource_type: Type of resource
+            endpoint: API endpoint type ('stat' or 'config')
+            pagesize: Objects per request; 0 fetches the collection at once
+            url_options: Additional URL options (e.g., a filter)
+            stream: Decode each response incrementally (see stream_objects)
+
+        Returns:
+            Iterator over the resource objects
+        """
+        if not pagesize:
+            return self._fetch_objects(resource_type, endpoint, url_options, stream)
+
+        total = self._get_count(resource_type, endpoint, url_options)
+        return self._iter_pages(resource_type, endpoint, pagesize, url_options, total, stream)
+
+    def get_resource(
+        self,
+        resource_type: str,
+        endpoint: str = "config",
+        pagesize: int = DEFAULT_PAGESIZE,
+        url_options: Optional[str] = None,
+        stream: bool = False,
+    ) -> Union[Dict[str, Any], Iterator[Dict[str, Any]]]:
+        """
+        Fetch a resource that is either a single object or a collection
+
+        Like iter_objects(), but a single object (e.g. 'system') is returned
+        as it is. The first page is requested without sizing the collection,
+        so no count=yes request is sent unless the resource is a collection
+        that fills the first page.
+
+        Args:
+            resource_type: Type of resource
+            endpoint: API endpoint type ('stat' or 'config')
+            pagesize: Objects per request; 0 fetches the collection at once
+            url_options: Additional URL options (e.g., a filter)
+            stream: Decode each response incrementally (see stream_objects)
+
+        Returns:
+            The object of a singleton resource, or an iterator over the
+            objects of a collection
+        """
+        options = self._page_options(pagesize, 1, url_options) if pagesize else url_options
+
+        page: Iterator[Dict[str, Any]]
+        if stream:
+            fields: Dict[str, Any] = {}
+            response = self._send(resource_type, None, endpoint, options, stream=True)
+            page = self._iter_response(response, resource_type, fields)
+            first = next(page, None)
+            if isinstance(fields.get(resource_type), dict):
+                # Reads the rest of the body, checking it for errors
+                for _ in page:
+                    pass
+                single: Dict[str, Any] = fields[resource_type]
+                return single
+            page = chain([first] if first is not None else [], page)
+        else:
+            if pagesize:
+                data = self._get_uncached(resource_type, endpoint, options)
+            else:
+                data = self.get(resource_type, endpoint=endpoint, url_options=options)
+            objects = data.get(resource_type)
+            if isinstance(objects, dict):
+                return objects
+            page = iter(objects if isinstance(objects, list) else [])
+
+        if not pagesize:
+            return page
+        return self._continue_pages(resource_type, endpoint, pagesize, url_options, page, stream)
+
+    def _continue_pages(
+        self,
+        resource_type: str,
+        endpoint: str,
+        pagesize: int,
+        url_options: Optional[str],
+        first_page: Iterator[Dict[str, Any]],
+        stream: bool,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the objects of a first page, then those of the following pages"""
+        received = 0
+        for obj in first_page:
+            received += 1
+            yield obj
+        if received == pagesize:
+            total = self._get_count(resource_type, endpoint, url_options)
+            yield from self._iter_pages(
+                resource_type, endpoint, pagesize, url_options, total, stream, pageno=2
+            )
+
+    @staticmethod
+    def _page_options(pagesize: int, pageno: int, url_options: Optional[str]) -> str:
+        """Return the URL options requesting a page"""
+        options = f"pagesize={pagesize}&pageno={pageno}"
+        return f"{options}&{url_options}" if url_options else options
+
+    def _fetch_objects(
+        self, resource_type: str, endpoint: str, url_options: Optional[str], stream: bool
+    ) -> Iterator[Dict[str, Any]]:
+        """Request a collection page and return an iterator over its objects"""
+        if stream:
+            return self.stream_objects(resource_type, endpoint=endpoint, url_options=url_options)
+        data = self._get_uncached(resource_type, endpoint, url_options)
+        return iter(self._objects(data, resource_type))
+
+    def _iter_pages(
+        self,
+        resource_type: str,
+        endpoint: str,
+        pagesize: int,
+        url_options: Optional[str],
+        total: Optional[int],
+        stream: bool = False,
+        pageno: int = 1,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the objects of a collection page by page, starting at pageno"""
+        while total is None or (pageno - 1) * pagesize < total:
+            options = self._page_options(pagesize, pageno, url_options)
+
+            received = 0
+            for obj in self._fetch_objects(resource_type, endpoint, options, stream):
+                received += 1
+                yield obj
+
+            # A short page is the last one; a longer one means paging was ignored
+            if received != pagesize:
+                return
+            pageno += 1
+
+    @staticmethod
+    def _objects(data: Dict[str, Any], resource_type: str) -> List[Dict[str, Any]]:
+        """Return the objects of a response as a list"""
+        objects = data.get(resource_type)
+        if isinstance(objects, list):
+            return objects
+        if isinstance(objects, dict):
+            return [objects]
+        return []
+
     def __enter__(self):
         """Context manager entry"""
         self.login()
@@ -192,4 +843,8 @@ class NITROClient:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit"""
         self.logout()
+        if self.session.latency_tracker is not None:
+            self.session.latency_tracker.save()
+        if self.cassette is not None and self.cassette.recording:
+            self.cassette.save()
         return False
@@ -0,0 +1,255 @@
+"""
+On-disk cache of NITRO responses shared between plugin invocations
+"""
+
+import os
+import threading
+import time
+from contextlib import ExitStack
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from check_netscaler.client import statefile
+from check_netscaler.client.exceptions import NITROConnectionError, NITROTimeoutError
+
+
+def parse_ttls(spec: str) -> Dict[str, float]:
+    """
+    Parse a per-endpoint TTL specification
+
+    Args:
+        spec: Comma-separated ``endpoint=seconds`` pairs (e.g. 'stat=10,config=60')
+
+    Returns:
+        Dictionary mapping endpoint to TTL in seconds
+
+    Raises:
+        ValueError: If the specification is malformed
+    """
+    ttls: Dict[str, float] = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        endpoint, sep, value = part.partition("=")
+        ttl: Optional[float]
+        try:
+            ttl = float(value)
+        except ValueError:
+            ttl = None
+        if not sep or not endpoint.strip() or ttl is None:
+            raise ValueError(f"Invalid cache TTL '{part}' (expected endpoint=seconds)")
+        if ttl < 0:
+            raise ValueError(f"Invalid cache TTL '{part}' (must not be negative)")
+        ttls[endpoint.strip()] = ttl
+    return ttls
+
+
+class ResponseCache:
+    """
+    Caches successful GET response bodies in the state directory
+
+    Checks of different services on the same monitoring host often request
+    the same resource within seconds (e.g. ``state``, ``perfdata`` and
+    ``matches`` for ``stat/lbvserver``). A response younger than the TTL of
+    its endpoint is served from disk instead of the appliance.
+
+    Entries are written atomically, and a lock per entry makes sure only one
+    process fetches an expired entry; concurrent callers wait for it and then
+    read the fresh body.
+
+    Entries of versioned endpoints are stored with a version supplied by the
+    caller, e.g. the appliance's last configuration change, and are only
+    served while that version is current.
+
+    With ``stale_if_error``, every response is stored, and if the appliance
+    cannot be reached, the last stored response is served instead of raising
+    as long as it is not older than ``stale_if_error`` seconds.
+    """
+
+    DEFAULT_TTLS = {"stat": 10.0, "config": 60.0}
+
+    # Errors that mean the appliance could not answer, not that it refused the request
+    UNREACHABLE_ERRORS = (NITROConnectionError, NITROTimeoutError)
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttls: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.time,
+        versioned: Iterable[str] = (),
+        stale_if_error: float = 0,
+    ):
+        """
+        Initialize response cache
+
+        Args:
+            cache_dir: Directory for the cache files (created with mode 0700)
+            ttls: Seconds a response stays fresh, per endpoint ('stat', 'config');
+                endpoints without TTL or with TTL 0 are not served from the cache
+            clock: Wall clock, comparable to file modification times
+            versioned: Endpoints whose entries are only valid for the version
+                passed to fetch()
+            stale_if_error: Maximum age in seconds of a response served when the
+                appliance is unreachable (default: 0 = never)
+        """
+        self.cache_dir = cache_dir
+        self.ttls = dict(self.DEFAULT_TTLS if ttls is None else ttls)
+        self.clock = clock
+        self.versioned = frozenset(versioned)
+        self.stale_if_error = stale_if_error
+        self.hits = 0
+        self.misses = 0
+        # Age of the oldest stale response served, None if none was
+        self.stale_age: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def ttl(self, endpoint: str) -> float:
+        """Return the TTL of an endpoint in seconds (0: not cached)"""
+        return self.ttls.get(endpoint, 0.0)
+
+    def _path(self, key: Sequence[object]) -> str:
+        """Return the cache file path for a request key"""
+        return statefile.state_path(self.cache_dir, "response", *key, suffix=".body")
+
+    def _read(
+        self, path: str, max_age: float, version: Optional[str] = None
+    ) -> Optional[Tuple[bytes, float]]:
+        """
+        Read an entry if it is younger than max_age
+
+        Args:
+            path: Cache file path
+            max_age: Maximum age in seconds
+            version: Version the entry must have been stored with (None: any)
+
+        Returns:
+            (body, age in seconds), or None if there is no such entry
+        """
+        try:
+            age = self.clock() - os.stat(path).st_mtime
+        except OSError:
+            return None
+        if not 0 <= age < max_age:
+            return None
+
+        content = statefile.read_bytes(path)
+        if content is None or b"\n" not in content:
+            return None
+        stored, body = content.split(b"\n", 1)
+        if version is not None and stored != version.encode("utf-8"):
+            return None
+        return body, age
+
+    def _write(self, path: str, body: bytes, version: Optional[str]) -> None:
+        """Store an entry; the first line holds the version"""
+        header = (version or "").replace("\n", " ").encode("utf-8")
+        try:
+            statefile.write_bytes(path, header + b"\n" + body)
+        except OSError:
+            pass
+
+    def _count(self, hit: bool) -> None:
+        """Count a cache hit or miss"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _serve_stale(self, path: str) -> Optional[bytes]:
+        """Return the last stored body if it is within the stale window"""
+        entry = self._read(path, self.stale_if_error)
+        if entry is None:
+            return None
+        body, age = entry
+        with self._lock:
+            self.stale_age = max(age, self.stale_age or 0.0)
+        return body
+
+    def fetch(
+        self,
+        endpoint: str,
+        key: Sequence[object],
+        fetch: Callable[[], bytes],
+        version: Optional[str] = None,
+    ) -> bytes:
+        """
+        Return a cached response body, fetching and storing it if expired
+
+        Args:
+            endpoint: API endpoint type, selects the TTL
+            key: Values identifying the request (host, user, URL parts)
+            fetch: Performs the request and returns the body; must raise
+                instead of returning error responses, which are not cached
+            version: Current version of the data of a versioned endpoint; without
+                it, entries of versioned endpoints are not served fresh
+
+        Returns:
+            Response body
+
+        Raises:
+            Whatever fetch() raises, unless a stale response can be served
+        """
+        ttl = self.ttl(endpoint)
+        if endpoint in self.versioned and version is None:
+            ttl = 0
+        if ttl <= 0 and not self.stale_if_error:
+            return fetch()
+
+        path = self._path(key)
+        if ttl > 0:
+            entry = self._read(path, ttl, version)
+            if entry is not None:
+                self._count(hit=True)
+                return entry[0]
+
+        waiting_since = self.clock()
+        with ExitStack() as stack:
+            try:
+                stack.enter_context(statefile.locked(path))
+            except OSError:
+                # Cache directory not usable; fetch uncached
+                self._count(hit=False)
+                return fetch()
+
+            # Another process may have fetched it while we waited for the lock
+            if ttl > 0:
+                entry = self._read(path, ttl, version)
+                if entry is not None:
+                    self._count(hit=True)
+                    return entry[0]
+
+            # If it failed to reach the appliance instead, do not wait for
+            # another timeout
+            if self.stale_if_error and self._failed_since(path, waiting_since):
+                body = self._serve_stale(path)
+                if body is not None:
+                    return body
+
+            self._count(hit=False)
+            try:
+                body = fetch()
+            except self.UNREACHABLE_ERRORS:
+                if not self.stale_if_error:
+                    raise
+                self._mark_failed(path)
+                body = self._serve_stale(path)
+                if body is None:
+                    raise
+                return body
+
+            self._write(path, body, version)
+            return body
+
+    def _failed_since(self, path: str, since: float) -> bool:
+        """Return whether a fetch of the entry failed at or after the given time"""
+        try:
+            return os.stat(f"{path}.failed").st_mtime >= since
+        except OSError:
+            return False
+
+    def _mark_failed(self, path: str) -> None:
+        """Record that the appliance could not be reached for an entry"""
+        try:
+            statefile.write_bytes(f"{path}.failed", b"")
+        except OSError:
+            pass
@@ -0,0 +1,94 @@
+"""
+Retry policy for transient NITRO failures
+"""
+
+import random
+import time
+from typing import Any, Callable, Optional
+
+from check_netscaler.client.exceptions import (
+    NITROCircuitOpenError,
+    NITROConnectionError,
+    NITROConnectionRefusedError,
+    NITROException,
+)
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for transient failures
+
+    The NetScaler management daemon briefly answers 502/503/504 or resets
+    connections while the configuration is saved. GETs are idempotent and
+    are retried on these errors. Login is not idempotent: a login that timed
+    out or whose connection broke may have created a session on the
+    appliance. It is only retried when the request was certainly not
+    processed (503 or connection refused). Logout is never retried.
+    """
+
+    RETRY_STATUSES = (502, 503, 504)
+    LOGIN_RETRY_STATUSES = (503,)
+
+    # Backoff before retry n is random between 0 and min(MAX_DELAY, BASE_DELAY * 2**n)
+    DEFAULT_BASE_DELAY = 0.5
+    DEFAULT_MAX_DELAY = 8.0
+
+    def __init__(
+        self,
+        retries: int,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        sleep: Callable[[float], None] = time.sleep,
+        rand: Callable[[], float] = random.random,
+    ):
+        """
+        Initialize retry policy
+
+        Args:
+            retries: Maximum number of retries per request
+            base_delay: Backoff of the first retry in seconds (before jitter)
+            max_delay: Upper bound of the backoff in seconds
+            sleep: Sleep function (for tests)
+            rand: Random number source in [0, 1) (for tests)
+        """
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self._rand = rand
+
+    def delay(self, attempt: int) -> float:
+        """Return the jittered backoff before retry number ``attempt`` (0-based)"""
+        return self._rand() * min(self.max_delay, self.base_delay * 2.0**attempt)
+
+    def should_retry(
+        self, phase: str, response: Any = None, error: Optional[NITROException] = None
+    ) -> bool:
+        """
+        Decide whether a failed request may be repeated
+
+        Args:
+            phase: What the request was for ('login', 'logout' or '<endpoint>/<type>')
+            response: Response received, if any
+            error: Exception raised instead of a response, if any
+        """
+        if phase == "logout":
+            return False
+
+        if phase == "login":
+            if error is not None:
+                return isinstance(error, NITROConnectionRefusedError)
+            return response.status_code in self.LOGIN_RETRY_STATUSES
+
+        if error is not None:
+            return isinstance(error, NITROConnectionError) and not isinstance(
+                error, NITROCircuitOpenError
+            )
+        return response.status_code in self.RETRY_STATUSES
+
+    @staticmethod
+    def reason(response: Any = None, error: Optional[NITROException] = None) -> str:
+        """Describe why a request is retried"""
+        if error is not None:
+            return str(error)
+        return f"HTTP {response.status_code}"
@@ -2,22 +2,38 @@
 Session management for NITRO API
 """
 
-from typing import Optional
-
-import requests
-import urllib3
-from urllib3.exceptions import InsecureRequestWarning
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 
+from check_netscaler.client.circuit_breaker import CircuitBreaker
+from check_netscaler.client.deadline import Deadline
+from check_netscaler.client.dns_cache import DNSCache
 from check_netscaler.client.exceptions import (
     NITROAuthenticationError,
+    NITROCircuitOpenError,
     NITROConnectionError,
+    NITRODeadlineError,
+    NITROException,
     NITROTimeoutError,
 )
+from check_netscaler.client.governor import ConcurrencyGovernor
+from check_netscaler.client.latency import LatencyTracker
+from check_netscaler.client.retry import RetryPolicy
+from check_netscaler.client.token_cache import TokenCache
+from check_netscaler.client.transport import Transport, create_transport
+
+if TYPE_CHECKING:
+    from check_netscaler.client.cassette import Cassette
 
 
 class NITROSession:
     """Manages authentication and session with NetScaler NITRO API"""
 
+    # Supported authentication modes:
+    #   session - login/logout around the check, requests carry the session cookie
+    #   headers - every request carries X-NITRO-USER/X-NITRO-PASS, no session is created
+    AUTH_MODES = ("session", "headers")
+
     def __init__(
         self,
         hostname: str,
@@ -27,6 +43,16 @@ class NITROSession:
         port: Optional[int] = None,
         timeout: int = 15,
         verify_ssl: bool = True,
+        token_cache: Optional[TokenCache] = None,
+        auth_mode: str = "session",
+        transport: str = "requests",
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        deadline: Optional[Deadline] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        latency_tracker: Optional[LatencyTracker] = None,
+        governor: Optional[ConcurrencyGovernor] = None,
+        cassette: Optional["Cassette"] = None,
+        dns_cache: Optional[DNSCache] = None,
     ):
         """
         Initialize NITRO session
@@ -39,15 +65,34 @@ class NITROSession:
             port: Custom port (default: 80 for HTTP, 443 for HTTPS)
             timeout: Request timeout in seconds
             verify_ssl: Verify SSL certificates (default: True)
+            token_cache: Reuse session tokens across invocations (default: disabled)
+            auth_mode: 'session' (login/logout) or 'headers' (per-request credentials)
+            transport: HTTP backend, 'requests' or 'stdlib' (default: requests)
+            circuit_breaker: Fail fast while the appliance keeps failing (default: disabled)
+            deadline: Overall time budget shared by all requests (default: none)
+            retry_policy: Retry transient failures (default: no retries)
+            latency_tracker: Derive timeouts from observed latencies (default: fixed timeout)
+            governor: Limit concurrent requests per appliance (default: unlimited)
+            cassette: Record all traffic into, or replay it from, a cassette
+                (default: none)
+            dns_cache: Connect to the address the hostname was pinned to by
+                earlier invocations (default: resolve on every connection)
         """
+        if auth_mode not in self.AUTH_MODES:
+            raise ValueError(f"Invalid auth mode: {auth_mode}")
+
         self.hostname = hostname
         self.username = username
         self.password = password
         self.ssl = ssl
         self.timeout = timeout
         self.verify_ssl = verify_ssl
-        if self.ssl and not self.verify_ssl:
-            urllib3.disable_warnings(InsecureRequestWarning)
+        self.token_cache = token_cache
+        self.auth_mode = auth_mode
+        self.deadline = deadline
+        self.retry_policy = retry_policy
+        self.latency_tracker = latency_tracker
+        self.governor = governor
 
         # Determine port
         if port:
@@ -60,60 +105,251 @@ class NITROSession:
         self.base_url = f"{protocol}://{hostname}:{self.port}/nitro/v1"
 
         # Session state
-        self.session = requests.Session()
+        self.transport: Transport
+        self.circuit_breaker = circuit_breaker
+        if cassette is None:
+            self.transport = create_transport(transport, verify_ssl=verify_ssl or not ssl)
+        else:
+            # Imported here so checks without --record/--replay skip it
+            from check_netscaler.client.cassette import RecordingTransport, ReplayTransport
+
+            if cassette.recording:
+                inner = create_transport(transport, verify_ssl=verify_ssl or not ssl)
+                self.transport = RecordingTransport(inner, cassette)
+            else:
+                self.transport = ReplayTransport(cassette)
+                # Replayed failures say nothing about the appliance
+                self.circuit_breaker = None
+        self.transport.dns_cache = dns_cache
         self.session_id: Optional[str] = None
         self.is_logged_in = False
+        self.token_reused = False
 
     def login(self) -> None:
         """
         Authenticate with NetScaler and establish session
 
+        With a token cache, a cached session token is reused instead of
+        performing a login request. In 'headers' auth mode no request is made;
+        the credentials are attached to every subsequent request instead.
+
         Raises:
             NITROAuthenticationError: If login fails
             NITROConnectionError: If connection fails
             NITROTimeoutError: If request times out
         """
+        if self.auth_mode == "headers":
+            self.transport.headers.update(
+                {"X-NITRO-USER": self.username, "X-NITRO-PASS": self.password}
+            )
+            self.is_logged_in = True
+            return
+
+        if self.token_cache:
+            token = self.token_cache.load(self.hostname, self.port, self.username)
+            if token:
+                self._use_token(token)
+                self.token_reused = True
+                return
+
+        self._login()
+
+    def refresh(self) -> None:
+        """
+        Discard a reused session token and log in again
+
+        Used when the appliance rejects a cached token (e.g. it was expired or
+        cleared on the appliance side).
+        """
+        if self.token_cache:
+            self.token_cache.invalidate(self.hostname, self.port, self.username)
+        self.transport.clear_cookies()
+        self.is_logged_in = False
+        self.session_id = None
+        self.token_reused = False
+        self._login()
+
+    def send(self, phase: str, method: Callable[..., Any], url: str, **kwargs: Any) -> Any:
+        """
+        Perform a transport request with the time left for it
+
+        Transient failures are retried according to the retry policy, as
+        long as the deadline leaves room for the backoff. The circuit breaker
+        counts the outcome once, after the retries.
+
+        Args:
+            phase: What the request is for, named in deadline errors
+            method: Transport method (e.g. self.transport.get)
+            url: Request URL
+            kwargs: Further arguments for the transport method
+
+        Raises:
+            NITRODeadlineError: If the deadline ran out before or during the request
+        """
+        start = time.perf_counter()
+        try:
+            return self._send_guarded(phase, method, url, **kwargs)
+        finally:
+            self.transport.stats.record_phase(phase, time.perf_counter() - start)
+
+    def _send_guarded(self, phase: str, method: Callable[..., Any], url: str, **kwargs: Any) -> Any:
+        """Perform a request, recording its outcome in the circuit breaker"""
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return self._send_retrying(phase, method, url, **kwargs)
+
+        host = f"{self.hostname}:{self.port}"
+        try:
+            response = self._send_retrying(phase, method, url, **kwargs)
+        except (NITRODeadlineError, NITROCircuitOpenError):
+            # Our own time budget ran out, or nothing was sent
+            raise
+        except (NITROConnectionError, NITROTimeoutError):
+            breaker.record_failure(host)
+            raise
+        breaker.record_success(host)
+        return response
+
+    def _send_retrying(
+        self, phase: str, method: Callable[..., Any], url: str, **kwargs: Any
+    ) -> Any:
+        """Perform a request, retrying transient failures"""
+        policy = self.retry_policy
+        if policy is None:
+            return self._send_once(phase, method, url, **kwargs)
+
+        attempt = 0
+        while True:
+            error: Optional[NITROException]
+            try:
+                response, error = self._send_once(phase, method, url, **kwargs), None
+            except (NITROConnectionError, NITROTimeoutError) as e:
+                response, error = None, e
+
+            delay = self._retry_delay(policy, attempt, phase, response, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+
+            if response is not None:
+                response.close()
+            attempt += 1
+            self.transport.stats.record_retry(
+                phase, attempt, RetryPolicy.reason(response, error), delay
+            )
+            policy.sleep(delay)
+
+    def _send_once(self, phase: str, method: Callable[..., Any], url: str, **kwargs: Any) -> Any:
+        """Perform a single request in a governor slot"""
+        host = f"{self.hostname}:{self.port}"
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_request(host)
+        if self.governor is None:
+            return self._request(host, phase, method, url, **kwargs)
+
+        # Wait for a slot as long as the deadline (or the request timeout) allows
+        budget = self.deadline.remaining() if self.deadline is not None else float(self.timeout)
+        try:
+            slot = self.governor.acquire(host, max(budget, 0.0))
+        except NITROTimeoutError as e:
+            if self.deadline is not None:
+                raise NITRODeadlineError(phase, self.deadline.seconds) from e
+            raise
+        try:
+            return self._request(host, phase, method, url, **kwargs)
+        finally:
+            self.governor.release(slot)
+
+    def _request(
+        self, host: str, phase: str, method: Callable[..., Any], url: str, **kwargs: Any
+    ) -> Any:
+        """Perform a single request with the timeout for its phase"""
+        limit = float(self.timeout)
+        if self.latency_tracker is not None:
+            limit = self.latency_tracker.timeout(host, phase, limit)
+
+        deadline = self.deadline
+        timeout = limit
+        if deadline is not None:
+            timeout = deadline.timeout(phase, limit)
+
+        start = time.monotonic()
+        try:
+            response = method(url, timeout=timeout, **kwargs)
+        except NITROTimeoutError as e:
+            if self.latency_tracker is not None:
+                self.latency_tracker.record(host, phase, timeout)
+            if deadline is not None and timeout < limit:
+                # The request only had the rest of the budget
+                raise NITRODeadlineError(phase, deadline.seconds) from e
+            raise
+
+        if self.latency_tracker is not None:
+            self.latency_tracker.record(host, phase, time.monotonic() - start)
+        return response
+
+    def _retry_delay(
+        self,
+        policy: RetryPolicy,
+        attempt: int,
+        phase: str,
+        response: Any,
+        error: Optional[NITROException],
+    ) -> Optional[float]:
+        """Return the backoff before the next attempt, or None to give up"""
+        if attempt >= policy.retries:
+            return None
+        if not policy.should_retry(phase, response, error):
+            return None
+
+        delay = policy.delay(attempt)
+        if self.deadline is not None and self.deadline.remaining() <= delay:
+            return None
+        return delay
+
+    def _use_token(self, token: str) -> None:
+        """Attach an existing session token to the HTTP session"""
+        self.transport.set_cookie("NITRO_AUTH_TOKEN", token)
+        self.session_id = token
+        self.is_logged_in = True
+
+    def _login(self) -> None:
+        """Perform the login request"""
         login_url = f"{self.base_url}/config/login"
-        login_data = {
+        login_data: Dict[str, Dict[str, Any]] = {
             "login": {
                 "username": self.username,
                 "password": self.password,
             }
         }
+        if self.token_cache:
+            # Pin the idle timeout the cache assumes for this session
+            login_data["login"]["timeout"] = self.token_cache.idle_timeout
 
-        try:
-            response = self.session.post(
-                login_url,
-                json=login_data,
-                timeout=self.timeout,
-                verify=self.verify_ssl,
-            )
+        response = self.send("login", self.transport.post, login_url, json=login_data)
 
-            # Check HTTP status
-            if response.status_code == 401:
-                raise NITROAuthenticationError(f"Authentication failed for user '{self.username}'")
+        # Check HTTP status
+        if response.status_code == 401:
+            raise NITROAuthenticationError(f"Authentication failed for user '{self.username}'")
 
-            if response.status_code != 201:
-                raise NITROAuthenticationError(
-                    f"Login failed with status {response.status_code}: {response.text}"
-                )
+        if response.status_code != 201:
+            raise NITROAuthenticationError(
+                f"Login failed with status {response.status_code}: {response.text}"
+            )
 
-            # Extract session ID from Set-Cookie header or response
-            if "Set-Cookie" in response.headers:
-                # Session ID is in cookie
-                for cookie in response.cookies:
-                    if cookie.name in ["NITRO_AUTH_TOKEN", "sessionid"]:
-                        self.session_id = cookie.value
-                        break
+        # Extract session ID from Set-Cookie header or response
+        if "Set-Cookie" in response.headers:
+            # Session ID is in cookie
+            for cookie in response.cookies:
+                if cookie.name in ["NITRO_AUTH_TOKEN", "sessionid"]:
+                    self.session_id = cookie.value
+                    break
 
-            self.is_logged_in = True
+        self.is_logged_in = True
 
-        except requests.exceptions.Timeout as e:
-            raise NITROTimeoutError(f"Login request timed out: {e}") from e
-        except requests.exceptions.ConnectionError as e:
-            raise NITROConnectionError(f"Connection failed: {e}") from e
-        except requests.exceptions.RequestException as e:
-            raise NITROConnectionError(f"Request failed: {e}") from e
+        if self.token_cache and self.session_id:
+            self.token_cache.store(self.hostname, self.port, self.username, self.session_id)
 
     def logout(self) -> None:
         """
@@ -121,20 +357,31 @@ class NITROSession:
 
         Note: Logout failures are silently ignored to avoid
         masking the actual error if called during exception handling.
+
+        With a token cache, the session is kept open on the appliance and
+        its last-use time is refreshed in the cache instead.
         """
         if not self.is_logged_in:
             return
 
+        if self.auth_mode == "headers":
+            self.transport.headers.pop("X-NITRO-USER", None)
+            self.transport.headers.pop("X-NITRO-PASS", None)
+            self.is_logged_in = False
+            return
+
+        if self.token_cache:
+            if self.session_id:
+                self.token_cache.store(self.hostname, self.port, self.username, self.session_id)
+            self.is_logged_in = False
+            self.session_id = None
+            return
+
         logout_url = f"{self.base_url}/config/logout"
-        logout_data = {"logout": {}}
+        logout_data: Dict[str, Dict[str, Any]] = {"logout": {}}
 
         try:
-            self.session.post(
-                logout_url,
-                json=logout_data,
-                timeout=self.timeout,
-                verify=self.verify_ssl,
-            )
+            self.send("logout", self.transport.post, logout_url, json=logout_data)
         except Exception:
             # Silently ignore logout errors
             pass
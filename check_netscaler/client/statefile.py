@@ -0,0 +1,147 @@
+"""
+Helpers for small state files shared between plugin invocations
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import fcntl
+
+    HAVE_FCNTL = True
+except ImportError:  # pragma: no cover - not available on Windows
+    HAVE_FCNTL = False
+
+
+def default_cache_dir() -> str:
+    """
+    Return the default directory for check_netscaler state files
+
+    Uses ``$NETSCALER_CACHE_DIR`` if set, otherwise ``$XDG_CACHE_HOME/check_netscaler``
+    (falling back to ``~/.cache/check_netscaler``).
+    """
+    cache_dir = os.getenv("NETSCALER_CACHE_DIR")
+    if cache_dir:
+        return cache_dir
+
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "check_netscaler")
+
+
+def state_path(cache_dir: str, prefix: str, *key_parts: Any, suffix: str = ".json") -> str:
+    """
+    Build the path of a state file for the given key
+
+    The key parts are hashed so hostnames, usernames or URLs never end up
+    verbatim in file names.
+
+    Args:
+        cache_dir: Directory holding the state files
+        prefix: File name prefix identifying the kind of state (e.g. 'token')
+        key_parts: Values identifying the entry (e.g. host, port, user)
+        suffix: File name extension (default: .json)
+
+    Returns:
+        Absolute path of the state file
+    """
+    key = "\0".join(str(part) for part in key_parts)
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+    return os.path.join(cache_dir, f"{prefix}-{digest}{suffix}")
+
+
+def ensure_dir(cache_dir: str) -> None:
+    """Create the state directory with owner-only permissions if missing"""
+    os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+
+
+def read_json(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a JSON state file
+
+    Returns:
+        Parsed content, or None if the file is missing or unreadable
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    return data if isinstance(data, dict) else None
+
+
+def read_bytes(path: str) -> Optional[bytes]:
+    """
+    Read a binary state file
+
+    Returns:
+        File content, or None if the file is missing or unreadable
+    """
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def write_bytes(path: str, data: bytes) -> None:
+    """
+    Atomically write a state file readable only by the current user
+
+    The content is written to a temporary file in the same directory and
+    renamed over the target, so concurrent readers never see partial data.
+    """
+    directory = os.path.dirname(path)
+    ensure_dir(directory)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_json(path: str, data: Dict[str, Any]) -> None:
+    """Atomically write a JSON state file readable only by the current user (see write_bytes)"""
+    write_bytes(path, json.dumps(data).encode("utf-8"))
+
+
+def remove(path: str) -> None:
+    """Remove a state file, ignoring missing files"""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+@contextmanager
+def locked(path: str) -> Iterator[None]:
+    """
+    Hold an exclusive lock for a state file
+
+    The lock is taken on a separate ``<path>.lock`` file, because write_json()
+    replaces the state file itself. On platforms without fcntl this is a no-op.
+    """
+    ensure_dir(os.path.dirname(path))
+    if not HAVE_FCNTL:
+        yield
+        return
+
+    fd = os.open(f"{path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
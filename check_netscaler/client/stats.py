@@ -0,0 +1,202 @@
+"""
+Per-request transfer statistics of the HTTP transports
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class RequestRecord:
+    """Transfer statistics of a single HTTP request"""
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        status_code: int,
+        wire_bytes: int,
+        body_bytes: int,
+        elapsed: float,
+        wait: Optional[float] = None,
+    ):
+        """
+        Initialize request record
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            status_code: HTTP status code
+            wire_bytes: Response body size as transferred (compressed)
+            body_bytes: Response body size after decompression
+            elapsed: Seconds from sending the request until the body was read
+            wait: Seconds from sending the request until the response headers
+                arrived (connection setup, appliance processing and round trip)
+        """
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        self.wire_bytes = wire_bytes
+        self.body_bytes = body_bytes
+        self.elapsed = elapsed
+        self.wait = wait
+
+    @property
+    def path(self) -> str:
+        """Request path without host and query string"""
+        return urlsplit(self.url).path
+
+    @property
+    def ratio(self) -> float:
+        """Compression ratio (decompressed / transferred size)"""
+        return self.body_bytes / self.wire_bytes if self.wire_bytes else 1.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.method} {self.path} {self.status_code}: "
+            f"{self.wire_bytes} bytes transferred, {self.body_bytes} bytes decoded "
+            f"({self.ratio:.1f}x) in {self.elapsed * 1000:.0f} ms"
+        )
+
+
+class TransferStats:
+    """
+    Collects the RequestRecords, TLS handshakes and retries of a transport (thread-safe)
+
+    Also collects timings of the phases of a check: DNS cache lookups, new
+    connections (DNS unless pinned, TCP and TLS), session requests including
+    retries and waits (login, stat/..., config/...), and JSON decoding.
+    """
+
+    def __init__(self):
+        self.requests: List[RequestRecord] = []
+        self.handshakes: List[Tuple[str, bool]] = []
+        # (phase, attempt, reason, backoff seconds)
+        self.retries: List[Tuple[str, int, str, float]] = []
+        # (host, seconds) per DNS cache lookup
+        self.resolves: List[Tuple[str, float]] = []
+        # (host, seconds) per new connection
+        self.connects: List[Tuple[str, float]] = []
+        # (phase, seconds) per session request
+        self.phases: List[Tuple[str, float]] = []
+        self.parse_time = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def combine(cls, parts: Iterable["TransferStats"]) -> "TransferStats":
+        """Merge the statistics of several transports (e.g. of hedged hosts)"""
+        combined = cls()
+        for part in parts:
+            with part._lock:
+                combined.requests.extend(part.requests)
+                combined.handshakes.extend(part.handshakes)
+                combined.retries.extend(part.retries)
+                combined.resolves.extend(part.resolves)
+                combined.connects.extend(part.connects)
+                combined.phases.extend(part.phases)
+                combined.parse_time += part.parse_time
+        return combined
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        status_code: int,
+        wire_bytes: int,
+        body_bytes: int,
+        elapsed: float,
+        wait: Optional[float] = None,
+    ) -> RequestRecord:
+        """Add a record for a completed request"""
+        entry = RequestRecord(method, url, status_code, wire_bytes, body_bytes, elapsed, wait)
+        with self._lock:
+            self.requests.append(entry)
+        return entry
+
+    def record_handshake(self, host: str, resumed: bool) -> None:
+        """Add a TLS handshake and whether it resumed an earlier session"""
+        with self._lock:
+            self.handshakes.append((host, resumed))
+
+    def record_retry(self, phase: str, attempt: int, reason: str, delay: float) -> None:
+        """Add a retry of a request"""
+        with self._lock:
+            self.retries.append((phase, attempt, reason, delay))
+
+    def record_resolve(self, host: str, elapsed: float) -> None:
+        """Add the time of looking up the pinned address of a host"""
+        with self._lock:
+            self.resolves.append((host, elapsed))
+
+    def record_connect(self, host: str, elapsed: float) -> None:
+        """Add the setup time of a new connection (DNS, TCP and TLS)"""
+        with self._lock:
+            self.connects.append((host, elapsed))
+
+    def record_phase(self, phase: str, elapsed: float) -> None:
+        """Add the time of a session request, including retries and slot waits"""
+        with self._lock:
+            self.phases.append((phase, elapsed))
+
+    def record_parse(self, elapsed: float) -> None:
+        """Add time spent decoding a JSON response"""
+        with self._lock:
+            self.parse_time += elapsed
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Return totals per phase of the check
+
+        Returns:
+            Dictionary with nitro_login_ms, nitro_get_ms, nitro_wait_ms,
+            nitro_bytes, nitro_requests, parse_ms, nitro_resolve_ms if a DNS
+            cache was used and, if connections were timed (stdlib transport),
+            nitro_connect_ms
+        """
+        login = sum(elapsed for phase, elapsed in self.phases if phase == "login")
+        get = sum(elapsed for phase, elapsed in self.phases if phase not in ("login", "logout"))
+        wait = sum(r.wait for r in self.requests if r.wait is not None)
+
+        metrics = {
+            "nitro_login_ms": login * 1000,
+            "nitro_get_ms": get * 1000,
+            "nitro_wait_ms": wait * 1000,
+            "nitro_bytes": float(self.wire_bytes),
+            "nitro_requests": float(len(self.requests)),
+            "parse_ms": self.parse_time * 1000,
+        }
+        if self.resolves:
+            metrics["nitro_resolve_ms"] = sum(elapsed for _, elapsed in self.resolves) * 1000
+        if self.connects:
+            metrics["nitro_connect_ms"] = sum(elapsed for _, elapsed in self.connects) * 1000
+        return metrics
+
+    @property
+    def wire_bytes(self) -> int:
+        """Total response bytes transferred"""
+        return sum(r.wire_bytes for r in self.requests)
+
+    @property
+    def body_bytes(self) -> int:
+        """Total response bytes after decompression"""
+        return sum(r.body_bytes for r in self.requests)
+
+    def summary(self) -> List[str]:
+        """Return one line per TLS handshake and request plus a total line"""
+        lines = [
+            f"TLS handshake with {host}: {'resumed' if resumed else 'full'}"
+            for host, resumed in self.handshakes
+        ]
+        lines.extend(str(r) for r in self.requests)
+        lines.extend(
+            f"retry {attempt} of {phase} after {reason} (backoff {delay:.2f}s)"
+            for phase, attempt, reason, delay in self.retries
+        )
+        if self.requests:
+            ratio = self.body_bytes / self.wire_bytes if self.wire_bytes else 1.0
+            lines.append(
+                f"total: {len(self.requests)} requests, {len(self.retries)} retries, "
+                f"{self.wire_bytes} bytes transferred, {self.body_bytes} bytes decoded "
+                f"({ratio:.1f}x)"
+            )
+        return lines
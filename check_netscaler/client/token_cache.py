@@ -0,0 +1,88 @@
+"""
+Persistent NITRO session token cache shared across plugin invocations
+"""
+
+import time
+from typing import Optional
+
+from check_netscaler.client import statefile
+from check_netscaler.constants import DEFAULT_SESSION_TIMEOUT
+
+
+class TokenCache:
+    """
+    Stores NITRO_AUTH_TOKEN values on disk, keyed by host, port and user
+
+    A cached token is considered usable until ``idle_timeout - margin`` seconds
+    after it was last used, so it is dropped before the appliance expires the
+    session on its side.
+    """
+
+    # Seconds before the idle timeout at which a cached token is no longer reused
+    DEFAULT_MARGIN = 60
+
+    def __init__(
+        self,
+        cache_dir: str,
+        idle_timeout: int = DEFAULT_SESSION_TIMEOUT,
+        margin: int = DEFAULT_MARGIN,
+    ):
+        """
+        Initialize token cache
+
+        Args:
+            cache_dir: Directory for the token files (created with mode 0700)
+            idle_timeout: NITRO session idle timeout in seconds
+            margin: Safety margin in seconds before the idle timeout
+        """
+        self.cache_dir = cache_dir
+        self.idle_timeout = idle_timeout
+        self.margin = margin
+
+    def _path(self, hostname: str, port: int, username: str) -> str:
+        """Return the token file path for a host/port/user combination"""
+        return statefile.state_path(self.cache_dir, "token", hostname, port, username)
+
+    def load(self, hostname: str, port: int, username: str) -> Optional[str]:
+        """
+        Return a cached token if it is still within the idle timeout
+
+        Args:
+            hostname: NetScaler hostname or IP address
+            port: NITRO API port
+            username: NITRO API username
+
+        Returns:
+            Token string or None if nothing usable is cached
+        """
+        data = statefile.read_json(self._path(hostname, port, username))
+        if not data:
+            return None
+
+        token = data.get("token")
+        last_used = data.get("last_used")
+        if not token or not isinstance(last_used, (int, float)):
+            return None
+
+        if time.time() - last_used >= self.idle_timeout - self.margin:
+            return None
+
+        return str(token)
+
+    def store(self, hostname: str, port: int, username: str, token: str) -> None:
+        """
+        Store a token and mark it as used now
+
+        Write errors are ignored; the cache is an optimization only.
+        """
+        try:
+            statefile.write_json(
+                self._path(hostname, port, username),
+                {"token": token, "last_used": time.time()},
+            )
+        except OSError:
+            pass
+
+    def invalidate(self, hostname: str, port: int, username: str) -> None:
+        """Drop the cached token for a host/port/user combination"""
+        statefile.remove(self._path(hostname, port, username))
@@ -0,0 +1,809 @@
+"""
+HTTP transports for the NITRO API client
+
+A transport performs the actual HTTP requests for NITROSession/NITROClient.
+Two backends are available:
+
+- ``requests`` - based on the requests library (default)
+- ``stdlib``   - based on ``http.client`` and ``ssl`` only; avoids importing
+  requests/urllib3, which dominates plugin startup time
+
+Responses returned by a transport expose the subset of the requests.Response
+interface the client relies on: ``status_code``, ``headers``, ``content``,
+``text``, ``json()`` and ``cookies`` (iterable of objects with ``name`` and
+``value``). Responses of streamed GETs (``stream=True``) additionally provide
+``iter_content(chunk_size)`` and ``close()``; their body is read on demand.
+
+Both transports negotiate ``gzip``/``deflate`` content encoding and hand out
+the decompressed body. Every request is recorded in ``Transport.stats``
+(TransferStats) with its transferred and decompressed body size.
+
+The stdlib transport resumes TLS sessions: new connections to a host offer
+the session of an earlier connection, so only the first handshake of a
+plugin run is a full one.
+
+Transport errors are mapped to NITROTimeoutError and NITROConnectionError
+(NITROConnectionRefusedError if the connection was refused, i.e. the request
+was not sent).
+
+If a DNSCache is attached, new connections go straight to the address the
+cache pins the host to; SNI, certificate verification and the Host header
+still use the hostname.
+"""
+
+import http.client
+import json
+import socket
+import ssl
+import threading
+import time
+import zlib
+from http.cookies import SimpleCookie
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+from check_netscaler import __version__
+from check_netscaler.client import jsonbackend
+from check_netscaler.client.dns_cache import DNSCache
+from check_netscaler.client.exceptions import (
+    NITROConnectionError,
+    NITROConnectionRefusedError,
+    NITROTimeoutError,
+)
+from check_netscaler.client.stats import TransferStats
+
+ACCEPT_ENCODING = "gzip, deflate"
+
+
+class Transport:
+    """Base class for HTTP transports"""
+
+    name = ""
+
+    def __init__(self, verify_ssl: bool = True):
+        """
+        Initialize transport
+
+        Args:
+            verify_ssl: Verify SSL certificates (default: True)
+        """
+        self.verify_ssl = verify_ssl
+        self.stats = TransferStats()
+        self.dns_cache: Optional[DNSCache] = None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Default headers sent with every request (mutable)"""
+        raise NotImplementedError
+
+    def get_cookie(self, name: str) -> Optional[str]:
+        """Return the value of a stored cookie"""
+        raise NotImplementedError
+
+    def set_cookie(self, name: str, value: str) -> None:
+        """Store a cookie that is sent with every subsequent request"""
+        raise NotImplementedError
+
+    def clear_cookies(self) -> None:
+        """Remove all stored cookies"""
+        raise NotImplementedError
+
+    def get(self, url: str, timeout: float, stream: bool = False) -> Any:
+        """Perform a GET request; with stream=True the body is read on demand"""
+        raise NotImplementedError
+
+    def post(self, url: str, json: Any, timeout: float) -> Any:
+        """Perform a POST request with a JSON body"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release pooled connections"""
+
+    def _pinned_address(self, host: str, port: int) -> Optional[str]:
+        """Return the address the DNS cache pins a host to, timing the lookup"""
+        dns_cache = self.dns_cache
+        if dns_cache is None:
+            return None
+        start = time.perf_counter()
+        address = dns_cache.resolve(host, port)
+        self.stats.record_resolve(host, time.perf_counter() - start)
+        return address
+
+
+class RequestsTransport(Transport):
+    """Transport based on the requests library"""
+
+    name = "requests"
+
+    _dns_cache: Optional[DNSCache] = None
+
+    def __init__(self, verify_ssl: bool = True):
+        # Imported here so the stdlib transport never pays for it
+        import requests
+
+        super().__init__(verify_ssl)
+        self._requests = requests
+        self.session = requests.Session()
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+
+        if not verify_ssl:
+            import urllib3
+            from urllib3.exceptions import InsecureRequestWarning
+
+            urllib3.disable_warnings(InsecureRequestWarning)
+
+    @property
+    def dns_cache(self) -> Optional[DNSCache]:
+        """DNS cache new connections are pinned with"""
+        return self._dns_cache
+
+    @dns_cache.setter
+    def dns_cache(self, dns_cache: Optional[DNSCache]) -> None:
+        if (dns_cache is None) != (self._dns_cache is None):
+            self._mount_pools(pinned=dns_cache is not None)
+        self._dns_cache = dns_cache
+
+    def _mount_pools(self, pinned: bool) -> None:
+        """Switch the connection pools of direct connections to pinned ones, or back"""
+        from requests.adapters import HTTPAdapter
+        from urllib3.poolmanager import pool_classes_by_scheme
+
+        # Proxied connections are left alone
+        pool_classes = (
+            _pinned_pool_classes(self._pinned_address) if pinned else pool_classes_by_scheme
+        )
+        for adapter in self.session.adapters.values():
+            if isinstance(adapter, HTTPAdapter):
+                adapter.poolmanager.pool_classes_by_scheme = pool_classes
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return self.session.headers  # type: ignore[return-value]
+
+    def get_cookie(self, name: str) -> Optional[str]:
+        return self.session.cookies.get(name)
+
+    def set_cookie(self, name: str, value: str) -> None:
+        self.session.cookies.set(name, value)
+
+    def clear_cookies(self) -> None:
+        self.session.cookies.clear()
+
+    def get(self, url: str, timeout: float, stream: bool = False) -> Any:
+        start = time.perf_counter()
+        response = self._call(
+            self.session.get, url, timeout=timeout, verify=self.verify_ssl, stream=stream
+        )
+        if stream:
+
+            def record(body_bytes: int) -> None:
+                self.stats.record(
+                    "GET",
+                    url,
+                    response.status_code,
+                    self._wire_bytes(response, body_bytes),
+                    body_bytes,
+                    time.perf_counter() - start,
+                    self._wait(response),
+                )
+
+            return RequestsStreamingResponse(response, record)
+
+        self._record("GET", url, response, start)
+        return response
+
+    def post(self, url: str, json: Any, timeout: float) -> Any:
+        start = time.perf_counter()
+        response = self._call(
+            self.session.post, url, json=json, timeout=timeout, verify=self.verify_ssl
+        )
+        self._record("POST", url, response, start)
+        return response
+
+    def _record(self, method: str, url: str, response: Any, start: float) -> None:
+        """Record the transfer statistics of a completely read response"""
+        content = response.content
+        body_bytes = len(content) if isinstance(content, bytes) else 0
+        self.stats.record(
+            method,
+            url,
+            response.status_code,
+            self._wire_bytes(response, body_bytes),
+            body_bytes,
+            time.perf_counter() - start,
+            self._wait(response),
+        )
+
+    @staticmethod
+    def _wait(response: Any) -> Optional[float]:
+        """Seconds until the response headers were parsed, as measured by requests"""
+        try:
+            return float(response.elapsed.total_seconds())
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _wire_bytes(response: Any, default: int) -> int:
+        """Number of body bytes urllib3 read from the socket (before decompression)"""
+        try:
+            return int(response.raw.tell())
+        except (AttributeError, TypeError, ValueError):
+            return default
+
+    def _call(self, method, url: str, **kwargs) -> Any:
+        """Call a requests method and map its exceptions"""
+        exceptions = self._requests.exceptions
+        try:
+            return method(url, **kwargs)
+        except exceptions.Timeout as e:
+            raise NITROTimeoutError(f"Request timed out: {e}") from e
+        except exceptions.ConnectionError as e:
+            if _is_refused(e):
+                raise NITROConnectionRefusedError(f"Connection failed: {e}") from e
+            raise NITROConnectionError(f"Connection failed: {e}") from e
+        except exceptions.RequestException as e:
+            raise NITROConnectionError(f"Request failed: {e}") from e
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def _pinned_pool_classes(resolve: Callable[[str, int], Optional[str]]) -> Dict[str, Any]:
+    """Return urllib3 connection pool classes that connect to pinned addresses"""
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    classes: Dict[str, Any] = {}
+    for scheme, pool_class in (("http", HTTPConnectionPool), ("https", HTTPSConnectionPool)):
+
+        class PinnedConnectionPool(pool_class):  # type: ignore[valid-type,misc]
+            def _new_conn(self) -> Any:
+                conn = super()._new_conn()
+                address = resolve(self.host, self.port)
+                if address is not None:
+                    _pin_urllib3(conn, address)
+                return conn
+
+        # Errors keep naming the stock pool class
+        PinnedConnectionPool.__name__ = pool_class.__name__
+        PinnedConnectionPool.__qualname__ = pool_class.__qualname__
+        classes[scheme] = PinnedConnectionPool
+    return classes
+
+
+def _pin_urllib3(conn: Any, address: str) -> None:
+    """
+    Make a urllib3 connection open its socket to the given address
+
+    urllib3 connects to ``_dns_host``, which also backs ``host`` (used for
+    SNI, certificate verification and the Host header), so it is replaced
+    only while the socket is opened.
+    """
+    new_conn = conn._new_conn
+
+    def new_pinned_conn() -> socket.socket:
+        host, conn._dns_host = conn._dns_host, address
+        try:
+            sock: socket.socket = new_conn()
+        finally:
+            conn._dns_host = host
+        return sock
+
+    conn._new_conn = new_pinned_conn
+
+
+def _pin(conn: http.client.HTTPConnection, address: str) -> None:
+    """Make an http.client connection open its socket to the given address"""
+    create_connection = conn._create_connection  # type: ignore[attr-defined]
+
+    def create_pinned(target: Tuple[str, int], *args: Any, **kwargs: Any) -> socket.socket:
+        sock: socket.socket = create_connection((address, target[1]), *args, **kwargs)
+        return sock
+
+    conn._create_connection = create_pinned  # type: ignore[attr-defined]
+
+
+def _is_refused(error: BaseException) -> bool:
+    """Check whether a ConnectionRefusedError is among the causes of an exception"""
+    seen = set()
+    pending = [error]
+    while pending:
+        current = pending.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        if isinstance(current, ConnectionRefusedError):
+            return True
+        # requests wraps urllib3 errors in args, urllib3 keeps the cause in .reason
+        linked = [current.__cause__, current.__context__, getattr(current, "reason", None)]
+        linked.extend(current.args)
+        pending.extend(e for e in linked if isinstance(e, BaseException))
+    return False
+
+
+class RequestsStreamingResponse:
+    """
+    Streamed requests.Response that reports its size once the body is consumed
+
+    All other attributes are delegated to the wrapped response.
+    """
+
+    def __init__(self, response: Any, record: Callable[[int], None]):
+        self._response = response
+        self._record: Optional[Callable[[int], None]] = record
+        self._body_bytes = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+    @property
+    def content(self) -> bytes:
+        """Response body, read completely on first access"""
+        content: bytes = self._response.content
+        if self._record is not None and isinstance(content, bytes):
+            self._body_bytes = len(content)
+        self._finish()
+        return content
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        """Iterate over the decompressed response body"""
+        for chunk in self._response.iter_content(chunk_size):
+            self._body_bytes += len(chunk)
+            yield chunk
+        self._finish()
+
+    def close(self) -> None:
+        """Close the response, recording what was read so far"""
+        self._finish()
+        self._response.close()
+
+    def _finish(self) -> None:
+        """Record the transfer statistics exactly once"""
+        if self._record is not None:
+            record, self._record = self._record, None
+            record(self._body_bytes)
+
+
+class ContentDecoder:
+    """Incremental decoder for the Content-Encoding of a response body"""
+
+    def __init__(self, encoding: Optional[str]):
+        """
+        Initialize decoder
+
+        Args:
+            encoding: Value of the Content-Encoding header (None for identity)
+
+        Raises:
+            NITROConnectionError: If the encoding is not supported
+        """
+        self.encoding = (encoding or "identity").strip().lower()
+        self._decompressor: Any = None
+        if self.encoding in ("gzip", "x-gzip"):
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif self.encoding == "deflate":
+            self._decompressor = zlib.decompressobj(zlib.MAX_WBITS)
+        elif self.encoding != "identity":
+            raise NITROConnectionError(f"Unsupported content encoding: {encoding}")
+        self._started = False
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decode the next chunk of the body"""
+        if self._decompressor is None or not data:
+            return data
+
+        first, self._started = not self._started, True
+        try:
+            decoded: bytes = self._decompressor.decompress(data)
+        except zlib.error as e:
+            if first and self.encoding == "deflate":
+                # Some servers send raw deflate data without the zlib wrapper
+                self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+                return self.decompress(data)
+            raise NITROConnectionError(f"Invalid {self.encoding} response body: {e}") from e
+        return decoded
+
+    def flush(self) -> bytes:
+        """Return any data still buffered in the decompressor"""
+        if self._decompressor is None:
+            return b""
+        rest: bytes = self._decompressor.flush()
+        return rest
+
+
+class Cookie(NamedTuple):
+    """Cookie received with a response"""
+
+    name: str
+    value: str
+
+
+class StdlibResponse:
+    """Response returned by HTTPClientTransport"""
+
+    def __init__(
+        self,
+        status_code: int,
+        headers: http.client.HTTPMessage,
+        content: bytes,
+        cookies: List[Cookie],
+    ):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.cookies = cookies
+
+    @property
+    def text(self) -> str:
+        """Response body decoded as text"""
+        charset = self.headers.get_content_charset() or "utf-8"
+        return self.content.decode(charset, errors="replace")
+
+    def json(self) -> Any:
+        """Response body decoded as JSON"""
+        return jsonbackend.loads(self.content)
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        """Iterate over the response body"""
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start : start + chunk_size]
+
+    def close(self) -> None:
+        """Release the response (no-op, the body is already read)"""
+
+
+class StdlibStreamingResponse(StdlibResponse):
+    """
+    Streamed response returned by HTTPClientTransport
+
+    The connection is handed back to the pool once the body has been read
+    completely, and closed if the response is closed before that. The body is
+    decompressed chunk by chunk while it is read.
+    """
+
+    def __init__(
+        self,
+        raw: http.client.HTTPResponse,
+        cookies: List[Cookie],
+        release: Callable[[bool], None],
+        decoder: Optional[ContentDecoder] = None,
+        record: Optional[Callable[[int, int], None]] = None,
+    ):
+        super().__init__(raw.status, raw.headers, b"", cookies)
+        self._raw = raw
+        self._release: Optional[Callable[[bool], None]] = release
+        self._decoder = decoder or ContentDecoder(None)
+        self._record = record
+        self.wire_bytes = 0
+        self.body_bytes = 0
+
+    @property
+    def content(self) -> bytes:
+        """Response body, read completely on first access"""
+        if self._release is not None:
+            self._content = b"".join(self.iter_content(65536))
+        return self._content
+
+    @content.setter
+    def content(self, value: bytes) -> None:
+        self._content = value
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        """Iterate over the response body, reading it from the connection"""
+        if self._release is None:
+            yield from super().iter_content(chunk_size)
+            return
+
+        try:
+            while True:
+                chunk = self._raw.read(chunk_size)
+                if not chunk:
+                    break
+                self.wire_bytes += len(chunk)
+                data = self._decoder.decompress(chunk)
+                if data:
+                    self.body_bytes += len(data)
+                    yield data
+            data = self._decoder.flush()
+        except socket.timeout as e:
+            self._finish(reusable=False)
+            raise NITROTimeoutError(f"Request timed out: {e}") from e
+        except (OSError, http.client.HTTPException) as e:
+            self._finish(reusable=False)
+            raise NITROConnectionError(f"Connection failed: {e}") from e
+        except NITROConnectionError:
+            self._finish(reusable=False)
+            raise
+
+        self._finish(reusable=True)
+        if data:
+            self.body_bytes += len(data)
+            yield data
+
+    def close(self) -> None:
+        """Release the connection, closing it if the body was not read completely"""
+        self._finish(reusable=False)
+
+    def _finish(self, reusable: bool) -> None:
+        """Hand the connection back exactly once"""
+        if self._release is not None:
+            release, self._release = self._release, None
+            release(reusable and not self._raw.will_close)
+            if self._record is not None:
+                self._record(self.wire_bytes, self.body_bytes)
+
+
+class ResumableHTTPSConnection(http.client.HTTPSConnection):
+    """HTTPSConnection that offers a previous TLS session for resumption"""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        timeout: float,
+        context: ssl.SSLContext,
+        tls_session: Optional[ssl.SSLSession] = None,
+        on_handshake: Optional[Callable[[ssl.SSLSocket], None]] = None,
+    ):
+        super().__init__(host, port, timeout=timeout, context=context)
+        self.tls_session = tls_session
+        self.on_handshake = on_handshake
+
+    def connect(self) -> None:
+        """Connect and perform the TLS handshake, resuming the session if possible"""
+        http.client.HTTPConnection.connect(self)
+        server_hostname = self._tunnel_host or self.host  # type: ignore[attr-defined]
+        context: ssl.SSLContext = self._context  # type: ignore[attr-defined]
+
+        sock = None
+        if self.tls_session is not None:
+            try:
+                sock = context.wrap_socket(
+                    self.sock, server_hostname=server_hostname, session=self.tls_session
+                )
+            except (ssl.SSLError, ValueError):
+                # The server choked on the offered session; start over without it
+                self.tls_session = None
+                self.sock.close()
+                http.client.HTTPConnection.connect(self)
+
+        if sock is None:
+            sock = context.wrap_socket(self.sock, server_hostname=server_hostname)
+
+        self.sock = sock
+        if self.on_handshake is not None:
+            self.on_handshake(sock)
+
+
+class HTTPClientTransport(Transport):
+    """
+    Minimal transport based on http.client and ssl
+
+    Keeps a small pool of keep-alive connections per host so it can be used
+    from several threads at once.
+    """
+
+    name = "stdlib"
+
+    def __init__(self, verify_ssl: bool = True):
+        super().__init__(verify_ssl)
+        self._headers: Dict[str, str] = {
+            "User-Agent": f"check_netscaler/{__version__}",
+            "Accept": "application/json",
+            "Accept-Encoding": ACCEPT_ENCODING,
+        }
+        self._cookies: Dict[str, str] = {}
+        self._pool: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        self._tls_sessions: Dict[Tuple[str, str, int], ssl.SSLSession] = {}
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return self._headers
+
+    def get_cookie(self, name: str) -> Optional[str]:
+        return self._cookies.get(name)
+
+    def set_cookie(self, name: str, value: str) -> None:
+        self._cookies[name] = value
+
+    def clear_cookies(self) -> None:
+        self._cookies.clear()
+
+    def get(self, url: str, timeout: float, stream: bool = False) -> StdlibResponse:
+        return self._request("GET", url, None, timeout, stream)
+
+    def post(self, url: str, json: Any, timeout: float) -> StdlibResponse:
+        return self._request("POST", url, json, timeout)
+
+    def close(self) -> None:
+        with self._lock:
+            pools = list(self._pool.values())
+            self._pool.clear()
+        for connections in pools:
+            for conn in connections:
+                conn.close()
+
+    def _get_ssl_context(self) -> ssl.SSLContext:
+        """Create the SSL context on first use"""
+        if self._ssl_context is None:
+            context = ssl.create_default_context()
+            if not self.verify_ssl:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            self._ssl_context = context
+        return self._ssl_context
+
+    def _acquire(self, key: Tuple[str, str, int], timeout: float) -> Tuple[Any, bool]:
+        """
+        Take an idle connection from the pool or create a new one
+
+        Returns:
+            Tuple of (connection, reused)
+        """
+        conn: http.client.HTTPConnection
+        with self._lock:
+            idle = self._pool.get(key)
+            if idle:
+                conn = idle.pop()
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+
+        scheme, host, port = key
+        if scheme == "https":
+
+            def on_handshake(sock: ssl.SSLSocket) -> None:
+                self.stats.record_handshake(host, bool(sock.session_reused))
+
+            with self._lock:
+                tls_session = self._tls_sessions.get(key)
+            conn = ResumableHTTPSConnection(
+                host,
+                port,
+                timeout=timeout,
+                context=self._get_ssl_context(),
+                tls_session=tls_session,
+                on_handshake=on_handshake,
+            )
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+
+        address = self._pinned_address(host, port)
+        if address is not None:
+            _pin(conn, address)
+        return conn, False
+
+    def _remember_tls_session(
+        self, key: Tuple[str, str, int], conn: http.client.HTTPConnection
+    ) -> None:
+        """Keep the TLS session of a connection for later resumption"""
+        session = getattr(conn.sock, "session", None)
+        if session is not None:
+            with self._lock:
+                self._tls_sessions[key] = session
+
+    def _release(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        """Return a connection to the pool"""
+        with self._lock:
+            self._pool.setdefault(key, []).append(conn)
+
+    def _request(
+        self, method: str, url: str, body: Any, timeout: float, stream: bool = False
+    ) -> StdlibResponse:
+        """Perform a request, retrying once if a pooled connection went stale"""
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname or "", port)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+
+        headers = dict(self._headers)
+        if self._cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self._cookies.items())
+
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+
+        start = time.perf_counter()
+        while True:
+            conn, reused = self._acquire(key, timeout)
+            try:
+                if not reused:
+                    connect_start = time.perf_counter()
+                    conn.connect()
+                    self.stats.record_connect(key[1], time.perf_counter() - connect_start)
+                conn.request(method, path, body=payload, headers=headers)
+                raw = conn.getresponse()
+                wait = time.perf_counter() - start
+                content = b"" if stream else raw.read()
+            except socket.timeout as e:
+                conn.close()
+                raise NITROTimeoutError(f"Request timed out: {e}") from e
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                conn.close()
+                if reused:
+                    # Keep-alive connection was closed by the server; retry on a new one
+                    continue
+                raise NITROConnectionError(f"Connection failed: {e}") from e
+            except ConnectionRefusedError as e:
+                conn.close()
+                raise NITROConnectionRefusedError(f"Connection failed: {e}") from e
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise NITROConnectionError(f"Connection failed: {e}") from e
+            break
+
+        cookies = self._store_cookies(raw.headers.get_all("Set-Cookie") or [])
+
+        def release(reusable: bool) -> None:
+            # TLS 1.3 session tickets arrive after the handshake, so pick
+            # up the session once the response has been read
+            self._remember_tls_session(key, conn)
+            if reusable:
+                self._release(key, conn)
+            else:
+                conn.close()
+
+        def record(wire_bytes: int, body_bytes: int) -> None:
+            self.stats.record(
+                method, url, raw.status, wire_bytes, body_bytes, time.perf_counter() - start, wait
+            )
+
+        try:
+            decoder = ContentDecoder(raw.headers.get("Content-Encoding"))
+        except NITROConnectionError:
+            release(False)
+            raise
+
+        if stream:
+            return StdlibStreamingResponse(raw, cookies, release, decoder, record)
+
+        release(not raw.will_close)
+        body = decoder.decompress(content) + decoder.flush()
+        record(len(content), len(body))
+        return StdlibResponse(raw.status, raw.headers, body, cookies)
+
+    def _store_cookies(self, set_cookie_headers: List[str]) -> List[Cookie]:
+        """Parse Set-Cookie headers and store the cookies"""
+        cookies = []
+        for header in set_cookie_headers:
+            parsed: SimpleCookie = SimpleCookie()
+            try:
+                parsed.load(header)
+            except Exception:
+                continue
+            for morsel in parsed.values():
+                cookies.append(Cookie(morsel.key, morsel.value))
+                self._cookies[morsel.key] = morsel.value
+        return cookies
+
+
+TRANSPORTS = {
+    RequestsTransport.name: RequestsTransport,
+    HTTPClientTransport.name: HTTPClientTransport,
+}
+
+
+def create_transport(name: str, verify_ssl: bool = True) -> Transport:
+    """
+    Create a transport by name
+
+    Args:
+        name: Transport name ('requests' or 'stdlib')
+        verify_ssl: Verify SSL certificates
+
+    Returns:
+        Transport instance
+
+    Raises:
+        ValueError: If the transport name is unknown
+    """
+    try:
+        transport_class = TRANSPORTS[name]
+    except KeyError:
+        raise ValueError(f"Invalid transport: {name}") from None
+    return transport_class(verify_ssl=verify_ssl)
@@ -4,9 +4,15 @@ Base class for all check commands
 
 from abc import ABC, abstractmethod
 from argparse import Namespace
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from check_netscaler.client import NITROClient
+from check_netscaler.client.exceptions import (
+    NITROAPIError,
+    NITROPermissionError,
+    NITROResourceNotFoundError,
+)
+from check_netscaler.utils.filters import nitro_filter
 
 
 class CheckResult:
@@ -37,6 +43,15 @@ class CheckResult:
 class BaseCommand(ABC):
     """Base class for all check commands"""
 
+    # Config attributes the command reads, per resource type. Config requests
+    # for these resource types only transfer the listed fields (attrs=).
+    CONFIG_ATTRS: Dict[str, Tuple[str, ...]] = {}
+
+    # Whether simple --limit patterns may be sent to the appliance as filter=.
+    # Commands whose output depends on the position of objects in the
+    # unfiltered collection (e.g. index labels) disable this.
+    LIMIT_PUSHDOWN = True
+
     def __init__(self, client: NITROClient, args: Namespace):
         """
         Initialize command
@@ -48,6 +63,18 @@ class BaseCommand(ABC):
         self.client = client
         self.args = args
 
+        for resource_type, attrs in self.config_attrs().items():
+            self.client.declare_attrs(resource_type, attrs)
+
+    def config_attrs(self) -> Dict[str, Tuple[str, ...]]:
+        """
+        Return the config attributes to request, per resource type
+
+        Defaults to CONFIG_ATTRS; commands whose fields depend on the
+        arguments override this.
+        """
+        return self.CONFIG_ATTRS
+
     @abstractmethod
     def execute(self) -> CheckResult:
         """
@@ -60,3 +87,124 @@ class BaseCommand(ABC):
             NITROException: On API errors
         """
         raise NotImplementedError("Subclasses must implement execute()")
+
+    def fetch_concurrently(self, *requests: Tuple[str, str, Optional[str]]) -> List[Any]:
+        """
+        Fetch independent NITRO resources concurrently
+
+        Args:
+            requests: (endpoint, resource_type, resource_name) tuples
+
+        Returns:
+            Responses in request order. A request that failed is returned as
+            its exception instance, see unwrap_result().
+        """
+        batch = [
+            (endpoint, resource_type, resource_name, None)
+            for endpoint, resource_type, resource_name in requests
+        ]
+        results = self.client.get_many(batch, max_workers=len(batch))
+        return [results[request] for request in batch]
+
+    @staticmethod
+    def unwrap_result(result: Any) -> Any:
+        """Return a result of fetch_concurrently(), raising it if it is an exception"""
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def get_limited(
+        self,
+        endpoint: str,
+        resource_type: str,
+        resource_name: Optional[str] = None,
+        field: str = "name",
+    ) -> Dict[str, Any]:
+        """
+        Fetch a resource, letting the appliance apply -l/--limit when possible
+
+        Simple --limit patterns are sent as a NITRO ``filter=`` so only matching
+        objects are transferred. The command must still apply --limit itself,
+        since complex patterns are not translated. If the appliance rejects
+        the filter, the request is repeated without it.
+
+        Args:
+            endpoint: API endpoint type ('stat' or 'config')
+            resource_type: Type of resource
+            resource_name: Specific resource name (optional)
+            field: Attribute --limit applies to
+
+        Returns:
+            API response as dictionary
+        """
+        get = self.client.get_config if endpoint == "config" else self.client.get_stat
+
+        url_options = None
+        if not resource_name and self.LIMIT_PUSHDOWN:
+            url_options = nitro_filter(getattr(self.args, "limit", None), field)
+
+        if url_options:
+            try:
+                return get(resource_type, resource_name, url_options)
+            except (NITROResourceNotFoundError, NITROPermissionError):
+                raise
+            except NITROAPIError:
+                # Filter not supported for this resource; filter on the client instead
+                pass
+
+        return get(resource_type, resource_name)
+
+    def iter_objects(
+        self,
+        endpoint: str,
+        resource_type: str,
+        resource_name: Optional[str] = None,
+        field: str = "name",
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the objects of a resource
+
+        With --pagesize, collections are fetched page by page, and with
+        --stream responses are decoded incrementally, so memory use does not
+        grow with the collection size. Otherwise the response is fetched at
+        once via get_limited(). Simple --limit patterns are sent as NITRO
+        filter in both cases.
+
+        Args:
+            endpoint: API endpoint type ('stat' or 'config')
+            resource_type: Type of resource
+            resource_name: Specific resource name (optional)
+            field: Attribute --limit applies to
+
+        Returns:
+            Iterator over the resource objects
+        """
+        if resource_name or not self.streaming():
+            data = self.get_limited(endpoint, resource_type, resource_name, field)
+            objects = data.get(resource_type)
+            if isinstance(objects, dict):
+                objects = [objects]
+            return iter(objects or [])
+
+        pagesize = getattr(self.args, "pagesize", None) or 0
+        stream = bool(getattr(self.args, "stream", False))
+
+        url_options = None
+        if self.LIMIT_PUSHDOWN:
+            url_options = nitro_filter(getattr(self.args, "limit", None), field)
+        if url_options:
+            try:
+                return self.client.iter_objects(
+                    resource_type, endpoint, pagesize, url_options, stream=stream
+                )
+            except (NITROResourceNotFoundError, NITROPermissionError):
+                raise
+            except NITROAPIError:
+                # Filter not supported for this resource; filter on the client instead
+                pass
+
+        return self.client.iter_objects(resource_type, endpoint, pagesize, stream=stream)
+
+    def streaming(self) -> bool:
+        """Return whether collections are consumed as a stream (--pagesize or --stream)"""
+        return bool(getattr(self.args, "pagesize", None) or getattr(self.args, "stream", False))
@@ -20,8 +20,14 @@ class HWInfoCommand(BaseCommand):
             CheckResult with hardware and version information (always OK)
         """
         try:
+            # Fetch hardware and version information concurrently
+            hw_data, ver_data = self.fetch_concurrently(
+                ("config", "nshardware", None),
+                ("config", "nsversion", None),
+            )
+
             # Get hardware information
-            hw_data = self.client.get_config("nshardware")
+            hw_data = self.unwrap_result(hw_data)
 
             if "nshardware" not in hw_data:
                 return CheckResult(
@@ -36,7 +42,7 @@ class HWInfoCommand(BaseCommand):
                 hw = hw[0] if hw else {}
 
             # Get version information
-            ver_data = self.client.get_config("nsversion")
+            ver_data = self.unwrap_result(ver_data)
 
             if "nsversion" not in ver_data:
                 return CheckResult(
@@ -17,6 +17,23 @@ from check_netscaler.constants import (
 class InterfacesCommand(BaseCommand):
     """Check network interfaces status"""
 
+    CONFIG_ATTRS = {
+        "interface": (
+            "devicename",
+            "linkstate",
+            "intfstate",
+            "state",
+            "actspeed",
+            "actualmtu",
+            "vlan",
+            "intftype",
+            "rxbytes",
+            "txbytes",
+            "rxerrors",
+            "txerrors",
+        )
+    }
+
     def execute(self) -> CheckResult:
         """
         Execute interfaces check
@@ -3,7 +3,8 @@ String matching command - matches and matches_not
 """
 
 import re
-from typing import Any, Dict, List
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Tuple
 
 from check_netscaler.client.exceptions import NITROException
 from check_netscaler.commands.base import BaseCommand, CheckResult
@@ -18,6 +19,21 @@ from check_netscaler.constants import (
 class MatchesCommand(BaseCommand):
     """Check if field values match or don't match specific strings"""
 
+    def config_attrs(self) -> Dict[str, Tuple[str, ...]]:
+        """Request only the -n fields, the label field and the name used by -f/-l"""
+        objecttype = getattr(self.args, "objecttype", None)
+        fields_str = getattr(self.args, "objectname", None)
+        if not objecttype or not fields_str:
+            return {}
+
+        attrs = [f.strip() for f in fields_str.split(",")]
+        label_field = getattr(self.args, "label", None)
+        if label_field:
+            attrs.append(label_field)
+        if getattr(self.args, "filter", None) or getattr(self.args, "limit", None):
+            attrs.append("name")
+        return {objecttype: tuple(attrs)}
+
     def execute(self) -> CheckResult:
         """
         Execute matches/matches_not check
@@ -59,24 +75,35 @@ class MatchesCommand(BaseCommand):
             # Get endpoint (default to stat)
             endpoint = getattr(self.args, "endpoint", None) or "stat"
 
-            # Fetch data
-            if endpoint == "stat":
-                data = self.client.get_stat(objecttype)
-            elif endpoint == "config":
-                data = self.client.get_config(objecttype)
-            else:
+            if endpoint not in ("stat", "config"):
                 return CheckResult(
                     status=STATE_UNKNOWN,
                     message=f"Invalid endpoint: {endpoint}",
                 )
 
-            if objecttype not in data:
-                return CheckResult(
-                    status=STATE_UNKNOWN,
-                    message=f"{mode}: objecttype '{objecttype}' not found in API response",
+            # Fetch data (collections are streamed with --pagesize/--stream,
+            # single objects are returned as they are)
+            response: Any
+            if self.streaming():
+                response = self.client.get_resource(
+                    objecttype,
+                    endpoint,
+                    getattr(self.args, "pagesize", None) or 0,
+                    stream=bool(getattr(self.args, "stream", False)),
                 )
+            else:
+                if endpoint == "stat":
+                    data = self.client.get_stat(objecttype)
+                else:
+                    data = self.client.get_config(objecttype)
+
+                if objecttype not in data:
+                    return CheckResult(
+                        status=STATE_UNKNOWN,
+                        message=f"{mode}: objecttype '{objecttype}' not found in API response",
+                    )
 
-            response = data[objecttype]
+                response = data[objecttype]
 
             # Parse field names (can be comma-separated)
             field_names = [f.strip() for f in objectname.split(",")]
@@ -104,9 +131,11 @@ class MatchesCommand(BaseCommand):
                         worst_status = status
                     messages.append(msg)
 
-            elif isinstance(response, list):
+            elif isinstance(response, (list, Iterator)):
                 # Multiple objects - check field in each object
-                if not response:
+                objects = iter(response)
+                first = next(objects, None)
+                if first is None:
                     return CheckResult(
                         status=STATE_UNKNOWN,
                         message=f"{mode}: no objects found",
@@ -134,7 +163,7 @@ class MatchesCommand(BaseCommand):
                             message=f"Invalid limit regex: {e}",
                         )
 
-                for idx, obj in enumerate(response):
+                for idx, obj in enumerate(chain([first], objects)):
                     # Get object name for filtering
                     obj_name = obj.get("name", "")
 
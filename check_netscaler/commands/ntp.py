@@ -25,8 +25,14 @@ class NTPCommand(BaseCommand):
             CheckResult indicating NTP synchronization status
         """
         try:
+            # Fetch sync state and peer list concurrently
+            sync_data, status_data = self.fetch_concurrently(
+                ("config", "ntpsync", None),
+                ("config", "ntpstatus", None),
+            )
+
             # Check if NTP sync is enabled
-            sync_data = self.client.get_config("ntpsync")
+            sync_data = self.unwrap_result(sync_data)
 
             if "ntpsync" not in sync_data:
                 return CheckResult(
@@ -46,7 +52,7 @@ class NTPCommand(BaseCommand):
                 )
 
             # Get NTP status (peer list)
-            status_data = self.client.get_config("ntpstatus")
+            status_data = self.unwrap_result(status_data)
 
             if "ntpstatus" not in status_data:
                 return CheckResult(
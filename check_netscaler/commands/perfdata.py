@@ -3,7 +3,8 @@ Generic performance data collection command
 """
 
 import re
-from typing import Dict
+from itertools import chain, islice
+from typing import Dict, Tuple
 
 from check_netscaler.client.exceptions import NITROException
 from check_netscaler.commands.base import BaseCommand, CheckResult
@@ -24,6 +25,24 @@ class PerfdataCommand(BaseCommand):
         "ssltransactionsrate": ("SSLConn", "C/s"),
     }
 
+    # Labels without -L are indexed by position in the unfiltered collection
+    LIMIT_PUSHDOWN = False
+
+    def config_attrs(self) -> Dict[str, Tuple[str, ...]]:
+        """Request only the -n fields, the label field and the name used by -f/-l"""
+        objecttype = getattr(self.args, "objecttype", None)
+        fields_str = getattr(self.args, "objectname", None)
+        if not objecttype or not fields_str:
+            return {}
+
+        attrs = [f.strip() for f in fields_str.split(",")]
+        label_field = getattr(self.args, "label", None)
+        if label_field:
+            attrs.append(label_field)
+        if getattr(self.args, "filter", None) or getattr(self.args, "limit", None):
+            attrs.append("name")
+        return {objecttype: tuple(attrs)}
+
     def execute(self) -> CheckResult:
         """
         Execute perfdata check
@@ -58,34 +77,36 @@ class PerfdataCommand(BaseCommand):
             # For perfdata, we always query all objects (no object name filter)
             objectname = None
 
-            # Fetch data
-            if endpoint == "stat":
-                data = self.client.get_stat(objecttype, objectname)
-            elif endpoint == "config":
-                data = self.client.get_config(objecttype, objectname)
-            else:
+            if endpoint not in ("stat", "config"):
                 return CheckResult(
                     status=STATE_UNKNOWN,
                     message=f"Invalid endpoint: {endpoint}",
                 )
 
-            if objecttype not in data:
-                return CheckResult(
-                    status=STATE_UNKNOWN,
-                    message=f"perfdata: objecttype '{objecttype}' not found in API response",
-                )
+            # Fetch data (streamed with --pagesize/--stream)
+            if self.streaming():
+                objects = self.iter_objects(endpoint, objecttype, objectname)
+            else:
+                data = self.get_limited(endpoint, objecttype, objectname)
 
-            response = data[objecttype]
+                if objecttype not in data:
+                    return CheckResult(
+                        status=STATE_UNKNOWN,
+                        message=f"perfdata: objecttype '{objecttype}' not found in API response",
+                    )
 
-            # Handle both single object and list
-            if not isinstance(response, list):
-                response = [response]
+                # Handle both single object and list
+                response = data[objecttype]
+                objects = iter(response if isinstance(response, list) else [response])
 
-            if not response:
+            # Look ahead two objects to know whether labels need a prefix
+            head = list(islice(objects, 2))
+            if not head:
                 return CheckResult(
                     status=STATE_UNKNOWN,
                     message="perfdata: no data found",
                 )
+            multiple = len(head) > 1
 
             # Compile filter and limit regex if provided
             filter_regex = None
@@ -116,7 +137,7 @@ class PerfdataCommand(BaseCommand):
             # Collect performance data
             perfdata: Dict[str, float] = {}
 
-            for idx, obj in enumerate(response):
+            for idx, obj in enumerate(chain(head, objects)):
                 # Get object name for filtering
                 obj_name = obj.get("name", "")
 
@@ -131,7 +152,7 @@ class PerfdataCommand(BaseCommand):
                 # Determine label for this object
                 if label_field and label_field in obj:
                     label_prefix = str(obj[label_field])
-                elif len(response) > 1:
+                elif multiple:
                     # Multiple objects without label field, use index
                     label_prefix = str(idx)
                 else:
@@ -164,7 +185,7 @@ class PerfdataCommand(BaseCommand):
                 )
 
             # Build message
-            message = self._build_message(objecttype, response, fields, perfdata)
+            message = self._build_message(objecttype, head, fields, perfdata)
 
             return CheckResult(
                 status=STATE_OK,
@@ -17,6 +17,24 @@ from check_netscaler.constants import (
 class ServiceGroupCommand(BaseCommand):
     """Check ServiceGroup state and member quorum"""
 
+    CONFIG_ATTRS = {
+        "servicegroup": (
+            "servicegroupname",
+            "servicetype",
+            "servicegroupeffectivestate",
+            "state",
+            "monstate",
+            "healthmonitor",
+        ),
+        "servicegroup_servicegroupmember_binding": (
+            "servername",
+            "ip",
+            "port",
+            "state",
+            "svrstate",
+        ),
+    }
+
     def execute(self) -> CheckResult:
         """
         Execute servicegroup check
@@ -56,8 +74,15 @@ class ServiceGroupCommand(BaseCommand):
                         message=f"Invalid critical threshold: {self.args.critical}",
                     )
 
+            # Fetch servicegroup and its member bindings concurrently
+            binding_type = "servicegroup_servicegroupmember_binding"
+            sg_data, members_data = self.fetch_concurrently(
+                ("config", "servicegroup", objectname),
+                ("config", binding_type, objectname),
+            )
+
             # Get servicegroup information
-            sg_data = self.client.get_config("servicegroup", objectname)
+            sg_data = self.unwrap_result(sg_data)
 
             if "servicegroup" not in sg_data:
                 return CheckResult(
@@ -100,8 +125,7 @@ class ServiceGroupCommand(BaseCommand):
                 )
 
             # Get servicegroup members
-            binding_type = "servicegroup_servicegroupmember_binding"
-            members_data = self.client.get_config(binding_type, objectname)
+            members_data = self.unwrap_result(members_data)
 
             if binding_type not in members_data:
                 return CheckResult(
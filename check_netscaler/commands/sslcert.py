@@ -18,6 +18,8 @@ from check_netscaler.constants import (
 class SSLCertCommand(BaseCommand):
     """Check SSL certificate expiration status"""
 
+    CONFIG_ATTRS = {"sslcertkey": ("certkey", "daystoexpiration")}
+
     def execute(self) -> CheckResult:
         """
         Execute sslcert check
@@ -52,7 +54,7 @@ class SSLCertCommand(BaseCommand):
             # Get SSL certificates
             objecttype = getattr(self.args, "objecttype", None) or "sslcertkey"
             objectname = getattr(self.args, "objectname", None)
-            data = self.client.get_config(objecttype, objectname)
+            data = self.get_limited("config", objecttype, objectname, field="certkey")
 
             if objecttype not in data:
                 return CheckResult(
@@ -18,6 +18,11 @@ from check_netscaler.constants import (
 class STAServerCommand(BaseCommand):
     """Check STA (Secure Ticket Authority) server availability"""
 
+    CONFIG_ATTRS = {
+        "vpnglobal_staserver_binding": ("staserver", "staauthid"),
+        "vpnvserver_staserver_binding": ("staserver", "staauthid"),
+    }
+
     def execute(self) -> CheckResult:
         """
         Execute staserver check
@@ -3,7 +3,8 @@ State check command - monitors vServer, service, servicegroup, and server states
 """
 
 import re
-from typing import Any, Dict, List, Optional, Tuple
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from check_netscaler.client.exceptions import NITROResourceNotFoundError
 from check_netscaler.commands.base import BaseCommand, CheckResult
@@ -13,16 +14,23 @@ from check_netscaler.constants import (
     STATE_UNKNOWN,
     STATE_WARNING,
 )
+from check_netscaler.utils.filters import build_filter, filter_value
 
 
 class StateCommand(BaseCommand):
     """Check state of NetScaler objects"""
 
+    # Only the backup vServer check reads config data
+    CONFIG_ATTRS = {"lbvserver": ("name", "backupvserver", "backupvserverstatus")}
+
     # State mappings - which states are considered OK
     OK_STATES = {"UP", "ENABLED", "ACTIVE"}
     WARNING_STATES = {"OUT OF SERVICE", "GOING OUT OF SERVICE", "UNKNOWN"}
     CRITICAL_STATES = {"DOWN", "DISABLED", "INACTIVE"}
 
+    # Unhealthy objects are named in the message up to this many
+    NAMED_OBJECTS = 5
+
     def execute(self) -> CheckResult:
         """
         Execute state check
@@ -39,18 +47,41 @@ class StateCommand(BaseCommand):
                 message="No objecttype specified (use -o/--objecttype)",
             )
 
-        try:
-            # Get data from NITRO API
-            data = self.client.get_stat(objecttype, objectname)
+        check_backup = getattr(self.args, "check_backup", None) and objecttype == "lbvserver"
 
-            # Extract objects from response
-            objects = self._extract_objects(data, objecttype)
+        if getattr(self.args, "count_only", False):
+            unsupported = self._count_only_unsupported(objecttype)
+            if unsupported:
+                return CheckResult(
+                    status=STATE_UNKNOWN,
+                    message=f"--count-only cannot be combined with {unsupported}",
+                )
+
+        try:
+            if getattr(self.args, "count_only", False):
+                return self._count_states(objecttype, objectname)
+
+            # Get data from NITRO API; the backup check needs the config as well,
+            # which is fetched concurrently
+            if check_backup:
+                data, config_data = self.fetch_concurrently(
+                    ("stat", objecttype, objectname),
+                    ("config", "lbvserver", objectname),
+                )
+                objects: Iterator[Dict] = iter(
+                    self._extract_objects(self.unwrap_result(data), objecttype)
+                )
+            else:
+                # Streamed with --pagesize/--stream
+                objects = self.iter_objects("stat", objecttype, objectname)
 
-            if not objects:
+            first = next(objects, None)
+            if first is None:
                 return CheckResult(
                     status=STATE_UNKNOWN,
-                    message=f"No {objecttype} objects found",
+                    message=self._no_objects_message(objecttype),
                 )
+            objects = chain([first], objects)
 
             # Apply filters if specified
             if self.args.filter:
@@ -59,22 +90,17 @@ class StateCommand(BaseCommand):
             if self.args.limit:
                 objects = self._apply_limit(objects, self.args.limit)
 
-            if not objects:
+            # Evaluate state for all objects
+            result = self._evaluate_states(objects, objecttype)
+            if result is None:
                 return CheckResult(
                     status=STATE_UNKNOWN,
                     message=f"No {objecttype} objects after filtering",
                 )
 
-            # Evaluate state for all objects
-            result = self._evaluate_states(objects, objecttype)
-
             # Check backup vServer status if requested (only for lbvserver)
-            if (
-                hasattr(self.args, "check_backup")
-                and self.args.check_backup
-                and objecttype == "lbvserver"
-            ):
-                result = self._check_backup_status(result, objectname)
+            if check_backup:
+                result = self._check_backup_status(result, config_data)
 
             return result
 
@@ -89,6 +115,124 @@ class StateCommand(BaseCommand):
                 message=f"Error checking {objecttype}: {str(e)}",
             )
 
+    def _no_objects_message(self, objecttype: str) -> str:
+        """Return the message for an empty response, which --limit may have filtered"""
+        if self.args.limit and not self.args.objectname:
+            return f"No {objecttype} objects after filtering"
+        return f"No {objecttype} objects found"
+
+    def _count_only_unsupported(self, objecttype: str) -> Optional[str]:
+        """Return the option that needs per-object data, if --count-only is used with one"""
+        if self.args.filter:
+            return "--filter"
+        if self.args.limit and not self.args.objectname and filter_value(self.args.limit) is None:
+            return "a complex --limit pattern"
+        if objecttype == "lbvserver" and getattr(self.args, "check_backup", None):
+            return "--check-backup"
+        if objecttype == "lbvserver" and self._lbvserver_health_check_enabled():
+            return "health thresholds (-w/-c)"
+        return None
+
+    def _count_states(self, objecttype: str, objectname: Optional[str]) -> CheckResult:
+        """
+        Evaluate states from object counts instead of the objects (--count-only)
+
+        The appliance counts all objects and those in the OK, WARNING and
+        CRITICAL states (count=yes with a state filter); the remaining objects
+        are in unknown states, which are WARNING like in _evaluate_states().
+        Only if a few objects are not OK and all of them are in known states,
+        they are fetched by a further filtered request so the message can
+        name them.
+
+        Args:
+            objecttype: Type of objects being checked
+            objectname: Specific object name (optional)
+
+        Returns:
+            CheckResult with aggregated state counts
+        """
+        if objectname and self.args.limit:
+            # The name filter is the objectname, so --limit is applied to it here
+            if next(self._apply_limit(iter([{"name": objectname}]), self.args.limit), None) is None:
+                return CheckResult(
+                    status=STATE_UNKNOWN,
+                    message=f"No {objecttype} objects after filtering",
+                )
+
+        conditions: Dict[str, str] = {}
+        # A complex --limit pattern was rejected by _count_only_unsupported()
+        name = objectname or filter_value(self.args.limit)
+        if name:
+            conditions["name"] = name
+
+        def count(states: Optional[set] = None) -> int:
+            match = dict(conditions, state=self._state_pattern(states)) if states else conditions
+            return self.client.count(objecttype, "stat", filter=match)
+
+        total = count()
+        if total == 0:
+            return CheckResult(
+                status=STATE_UNKNOWN,
+                message=self._no_objects_message(objecttype),
+            )
+
+        ok_count = count(self.OK_STATES)
+        warning_count = 0
+        critical_count = 0
+        unknown_count = 0
+        if ok_count < total:
+            warning_count = count(self.WARNING_STATES)
+            critical_count = count(self.CRITICAL_STATES)
+            # States in none of the known sets cannot be matched by a filter
+            unknown_count = total - ok_count - warning_count - critical_count
+
+        critical_objects = []
+        warning_objects = []
+        if unknown_count == 0 and 0 < total - ok_count <= self.NAMED_OBJECTS:
+            unhealthy = dict(
+                conditions, state=self._state_pattern(self.WARNING_STATES | self.CRITICAL_STATES)
+            )
+            data = self.client.get_stat(objecttype, None, build_filter(unhealthy))
+            for obj in self._extract_objects(data, objecttype):
+                name = obj.get("name", "unknown")
+                if str(obj.get("state", "")).upper() in self.CRITICAL_STATES:
+                    critical_objects.append(name)
+                else:
+                    warning_objects.append(name)
+
+        if critical_count > 0:
+            overall_status = STATE_CRITICAL
+        elif warning_count > 0 or unknown_count > 0:
+            overall_status = STATE_WARNING
+        else:
+            overall_status = STATE_OK
+
+        message = self._build_message(
+            objecttype,
+            total,
+            ok_count,
+            warning_count,
+            critical_count,
+            unknown_count,
+            critical_objects,
+            warning_objects,
+        )
+
+        perfdata = {
+            "total": total,
+            "ok": ok_count,
+            "warning": warning_count,
+            "critical": critical_count,
+            "unknown": unknown_count,
+        }
+
+        return CheckResult(status=overall_status, message=message, perfdata=perfdata)
+
+    @staticmethod
+    def _state_pattern(states: Iterable[str]) -> str:
+        """Return a NITRO filter value matching any of the given states exactly"""
+        return "/^(" + "|".join(sorted(states)) + ")$/"
+
     def _extract_objects(self, data: Dict[str, Any], objecttype: str) -> List[Dict]:
         """Extract object list from API response"""
         # NITRO API returns data in format: {objecttype: [...]}
@@ -101,39 +245,41 @@ class StateCommand(BaseCommand):
                 return [obj_data]
         return []
 
-    def _apply_filter(self, objects: List[Dict], filter_pattern: str) -> List[Dict]:
+    def _apply_filter(self, objects: Iterator[Dict], filter_pattern: str) -> Iterator[Dict]:
         """Filter out objects matching regex pattern"""
         try:
             regex = re.compile(filter_pattern)
-            return [obj for obj in objects if not regex.search(obj.get("name", ""))]
         except re.error:
             # Invalid regex, return all objects
             return objects
+        return (obj for obj in objects if not regex.search(obj.get("name", "")))
 
-    def _apply_limit(self, objects: List[Dict], limit_pattern: str) -> List[Dict]:
+    def _apply_limit(self, objects: Iterator[Dict], limit_pattern: str) -> Iterator[Dict]:
         """Limit to objects matching regex pattern"""
         try:
             regex = re.compile(limit_pattern)
-            return [obj for obj in objects if regex.search(obj.get("name", ""))]
         except re.error:
             # Invalid regex, return all objects
             return objects
+        return (obj for obj in objects if regex.search(obj.get("name", "")))
 
-    def _evaluate_states(self, objects: List[Dict], objecttype: str) -> CheckResult:
+    def _evaluate_states(self, objects: Iterable[Dict], objecttype: str) -> Optional[CheckResult]:
         """
         Evaluate state for all objects and aggregate results
 
+        Objects are consumed one at a time, so they can be streamed.
+
         Args:
-            objects: List of objects from NITRO API
+            objects: Objects from NITRO API
             objecttype: Type of objects being checked
 
         Returns:
-            CheckResult with aggregated status
+            CheckResult with aggregated status, or None if there were no objects
         """
         if objecttype == "lbvserver" and self._lbvserver_health_check_enabled():
             return self._evaluate_lbvserver_states(objects)
 
-        total = len(objects)
+        total = 0
         ok_count = 0
         warning_count = 0
         critical_count = 0
@@ -144,6 +290,7 @@ class StateCommand(BaseCommand):
         long_output = []
 
         for obj in objects:
+            total += 1
             name = obj.get("name", "unknown")
             state = obj.get("state", "UNKNOWN").upper()
 
@@ -167,6 +314,9 @@ class StateCommand(BaseCommand):
             # Add to long output with Icinga2-compatible status tags
             long_output.append(f"[{status_str}] {name}: {state}")
 
+        if total == 0:
+            return None
+
         # Determine overall status
         if critical_count > 0:
             overall_status = STATE_CRITICAL
@@ -200,12 +350,13 @@ class StateCommand(BaseCommand):
             status=overall_status,
             message=message,
             perfdata=perfdata,
-            long_output=long_output if len(objects) > 1 else [],
+            long_output=long_output if total > 1 else [],
         )
 
-    def _evaluate_lbvserver_states(self, objects: List[Dict]) -> CheckResult:
+    def _evaluate_lbvserver_states(self, objects: Iterable[Dict]) -> Optional[CheckResult]:
         """Evaluate lbvserver status using stat state and health percentage."""
-        total = len(objects)
+        total = 0
+        first: Optional[Dict] = None
         ok_count = 0
         warning_count = 0
         critical_count = 0
@@ -214,10 +365,13 @@ class StateCommand(BaseCommand):
         critical_objects = []
         warning_objects = []
         long_output = []
-        perfdata = {}
+        health_perfdata: Dict[str, Any] = {}
         warning_threshold, critical_threshold = self._get_lbvserver_health_thresholds()
 
         for obj in objects:
+            total += 1
+            if first is None:
+                first = obj
             name = obj.get("name", "unknown")
             state = self._get_lbvserver_state(obj)
             health = self._get_lbvserver_health(obj)
@@ -245,11 +399,17 @@ class StateCommand(BaseCommand):
             details = state if health_text is None else f"{state}, health={health_text}"
             long_output.append(f"[{status_str}] {name}: {details}")
 
-            if total > 1 and health is not None:
-                perfdata[f"{name}.health"] = self._build_lbvserver_health_perfdata(
+            if health is not None:
+                health_perfdata[f"{name}.health"] = self._build_lbvserver_health_perfdata(
                     health, warning_threshold, critical_threshold
                 )
 
+        if first is None:
+            return None
+
+        # Per-object health is only reported when several objects are checked
+        perfdata = health_perfdata if total > 1 else {}
+
         if critical_count > 0:
             overall_status = STATE_CRITICAL
         elif warning_count > 0 or unknown_count > 0:
@@ -258,7 +418,8 @@ class StateCommand(BaseCommand):
             overall_status = STATE_OK
 
         message = self._build_lbvserver_message(
-            objects,
+            first,
+            total,
             ok_count,
             warning_count,
             critical_count,
@@ -278,7 +439,7 @@ class StateCommand(BaseCommand):
         )
 
         if total == 1:
-            health = self._get_lbvserver_health(objects[0])
+            health = self._get_lbvserver_health(first)
             if health is not None:
                 perfdata["health"] = self._build_lbvserver_health_perfdata(
                     health, warning_threshold, critical_threshold
@@ -288,7 +449,7 @@ class StateCommand(BaseCommand):
             status=overall_status,
             message=message,
             perfdata=perfdata,
-            long_output=long_output if len(objects) > 1 else [],
+            long_output=long_output if total > 1 else [],
         )
 
     def _lbvserver_health_check_enabled(self) -> bool:
@@ -300,7 +461,8 @@ class StateCommand(BaseCommand):
 
     def _build_lbvserver_message(
         self,
-        objects: List[Dict],
+        first: Dict,
+        total: int,
         ok: int,
         warning: int,
         critical: int,
@@ -309,9 +471,8 @@ class StateCommand(BaseCommand):
         warning_objects: List[str],
     ) -> str:
         """Build lbvserver-specific messages with state and health."""
-        total = len(objects)
         if total == 1:
-            obj = objects[0]
+            obj = first
             name = obj.get("name", "unknown")
             state = self._get_lbvserver_state(obj)
             health_text = self._format_health(self._get_lbvserver_health(obj))
@@ -430,20 +591,19 @@ class StateCommand(BaseCommand):
 
         return " ".join(parts) if parts else f"{total} {objecttype} checked"
 
-    def _check_backup_status(self, result: CheckResult, objectname: str) -> CheckResult:
+    def _check_backup_status(self, result: CheckResult, config_data: Any) -> CheckResult:
         """
         Check backup vServer status for lbvserver objects
 
         Args:
             result: Current check result
-            objectname: Name of the lbvserver to check
+            config_data: lbvserver config response (or the exception fetching it raised)
 
         Returns:
             Modified CheckResult with backup status evaluation
         """
         try:
-            # Get config data to check backup status
-            config_data = self.client.get_config("lbvserver", objectname)
+            config_data = self.unwrap_result(config_data)
 
             if "lbvserver" not in config_data:
                 # No config data found, return original result
@@ -23,3 +23,4 @@ DEFAULT_PORT_HTTP = 80
 DEFAULT_PORT_HTTPS = 443
 DEFAULT_TIMEOUT = 15
 DEFAULT_API_VERSION = "v1"
+DEFAULT_SESSION_TIMEOUT = 900  # NITRO session idle timeout in seconds
@@ -0,0 +1,73 @@
+"""
+Translation of --limit patterns into NITRO server-side filters
+"""
+
+import re
+from typing import Dict, Optional
+from urllib.parse import quote
+
+# Patterns made of these characters mean the same to Python's re and to the
+# appliance, and need no escaping inside a NITRO filter value
+_SIMPLE_PATTERN = re.compile(r"^\^?[A-Za-z0-9_.\-]+\$?$")
+
+
+def nitro_filter(pattern: Optional[str], field: str = "name") -> Optional[str]:
+    """
+    Build a NITRO ``filter=`` URL option equivalent to a --limit regex
+
+    Only simple patterns are translated: a literal (``web``), a prefix
+    (``^web_``) or an anchored name (``^web_01$``). Anything else returns
+    None and has to be filtered on the client. The server-side filter only
+    narrows the response; callers still apply the regex themselves.
+
+    Args:
+        pattern: Regular expression given with -l/--limit
+        field: Attribute the pattern applies to
+
+    Returns:
+        URL option string (e.g. 'filter=name:web_01') or None
+    """
+    value = filter_value(pattern)
+    if value is None:
+        return None
+    return build_filter({field: value})
+
+
+def filter_value(pattern: Optional[str]) -> Optional[str]:
+    """
+    Translate a --limit regex into a NITRO filter value
+
+    Args:
+        pattern: Regular expression given with -l/--limit
+
+    Returns:
+        Exact value (e.g. 'web_01'), regular expression value (e.g. '/^web_/')
+        or None if the pattern cannot be translated
+    """
+    if not pattern or not _SIMPLE_PATTERN.match(pattern):
+        return None
+
+    literal = pattern.lstrip("^").rstrip("$")
+    if pattern.startswith("^") and pattern.endswith("$") and "." not in literal:
+        # Exact match
+        return literal
+    # Regular expression match
+    return f"/{pattern}/"
+
+
+def build_filter(conditions: Dict[str, str]) -> str:
+    """
+    Build a NITRO ``filter=`` URL option from attribute conditions
+
+    The appliance returns objects matching all conditions. Values enclosed in
+    slashes are regular expressions, anything else must match exactly.
+
+    Args:
+        conditions: Attribute name -> filter value (e.g. {'state': 'DOWN'})
+
+    Returns:
+        URL option string (e.g. 'filter=name:/%5Eweb_/,state:DOWN')
+    """
+    return "filter=" + ",".join(
+        f"{field}:{quote(value, safe='/')}" for field, value in conditions.items()
+    )
@@ -0,0 +1,95 @@
+"""Integration tests for Matches Command"""
+
+from argparse import Namespace
+
+import pytest
+
+from check_netscaler.client import NITROClient
+from check_netscaler.commands.matches import MatchesCommand
+from check_netscaler.constants import STATE_CRITICAL, STATE_OK
+
+
+class TestMatchesCommandIntegration:
+    """Test matches command against mock API"""
+
+    def run(
+        self,
+        server,
+        objecttype,
+        objectname,
+        critical,
+        pagesize=0,
+        stream=False,
+        endpoint=None,
+        label=None,
+        requests=None,
+    ):
+        """Run matches against the mock server"""
+        with NITROClient(
+            hostname=server.host,
+            port=server.port,
+            username="nsroot",
+            password="nsroot",
+            ssl=False,
+        ) as client:
+            args = Namespace(
+                command="matches",
+                objecttype=objecttype,
+                objectname=objectname,
+                warning="WARN",
+                critical=critical,
+                endpoint=endpoint,
+                filter=None,
+                limit=None,
+                label=label,
+                pagesize=pagesize,
+                stream=stream,
+            )
+            result = MatchesCommand(client, args).execute()
+            if requests is not None:
+                requests.extend(client.transfer_stats.requests)
+            return result
+
+    @pytest.mark.parametrize("pagesize,stream", [(0, False), (2, False), (0, True), (2, True)])
+    def test_singleton_resource(self, mock_nitro_server, pagesize, stream):
+        """Test a single object is checked like without --pagesize/--stream"""
+        result = self.run(mock_nitro_server, "system", "numcpus", "4", pagesize, stream)
+
+        assert result.status == STATE_CRITICAL
+        assert "system.numcpus" in result.message
+        assert "[0]" not in result.message
+        assert result.message == self.run(mock_nitro_server, "system", "numcpus", "4").message
+
+    @pytest.mark.parametrize("pagesize,stream", [(1, False), (2, True)])
+    def test_paged_collection(self, mock_nitro_server, pagesize, stream):
+        """Test every object of a collection is checked across pages"""
+        result = self.run(mock_nitro_server, "lbvserver", "state", "DOWN", pagesize, stream)
+        expected = self.run(mock_nitro_server, "lbvserver", "state", "DOWN")
+
+        assert result.status == STATE_CRITICAL
+        assert result.message == expected.message
+
+    def test_no_match(self, mock_nitro_server):
+        """Test values differing from the critical string are OK"""
+        result = self.run(mock_nitro_server, "system", "numcpus", "8", pagesize=2)
+
+        assert result.status == STATE_OK
+
+    def test_config_labels(self, mock_nitro_server):
+        """Test -L on the config endpoint requests the label field and keeps the labels"""
+        requests = []
+        result = self.run(
+            mock_nitro_server,
+            "lbvserver",
+            "servicetype",
+            "SSL",
+            endpoint="config",
+            label="name",
+            requests=requests,
+        )
+
+        (record,) = [r for r in requests if r.path == "/nitro/v1/config/lbvserver"]
+        assert "attrs=servicetype,name" in record.url
+        assert result.status == STATE_CRITICAL
+        assert "servicetype[lb_ssl]" in result.message
+        assert "[0]" not in result.message
@@ -26,3 +26,21 @@ class TestNSConfigCommandIntegration:
 
             assert result.status == STATE_OK
             assert "No unsaved configuration changes" in result.message
+
+    def test_nsconfig_header_authentication(self, mock_nitro_server):
+        """Test nsconfig with stateless header authentication"""
+        with NITROClient(
+            hostname=mock_nitro_server.host,
+            port=mock_nitro_server.port,
+            username="nsroot",
+            password="nsroot",
+            ssl=False,
+            auth_mode="headers",
+        ) as client:
+            args = Namespace(command="nsconfig")
+
+            command = NSConfigCommand(client, args)
+            result = command.execute()
+
+            assert result.status == STATE_OK
+            assert mock_nitro_server.sessions == {}
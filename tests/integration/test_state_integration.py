@@ -133,3 +133,105 @@ class TestStateCommandIntegration:
             assert "CRITICAL" in result.message
             assert "lb_down" in result.message
             assert "1/3" in result.message
+
+    def test_state_check_limit_is_filtered_server_side(self, mock_nitro_server):
+        """Test a simple --limit pattern is sent as NITRO filter and still applied"""
+        with NITROClient(
+            hostname=mock_nitro_server.host,
+            port=mock_nitro_server.port,
+            username="nsroot",
+            password="nsroot",
+            ssl=False,
+        ) as client:
+            args = Namespace(
+                command="state",
+                objecttype="lbvserver",
+                objectname=None,
+                filter=None,
+                limit="^lb_(web|ssl)$",
+            )
+            assert StateCommand(client, args).execute().status == STATE_OK
+
+            args.limit = "^lb_d"
+            result = StateCommand(client, args).execute()
+
+            assert result.status == STATE_CRITICAL
+            assert result.message == "1/1 lbvserver CRITICAL (lb_down)"
+
+    def test_state_check_paged(self, mock_nitro_server):
+        """Test objects fetched page by page are evaluated like a single response"""
+        with NITROClient(
+            hostname=mock_nitro_server.host,
+            port=mock_nitro_server.port,
+            username="nsroot",
+            password="nsroot",
+            ssl=False,
+        ) as client:
+            args = Namespace(
+                command="state",
+                objecttype="lbvserver",
+                objectname=None,
+                filter=None,
+                limit=None,
+                pagesize=2,
+            )
+
+            result = StateCommand(client, args).execute()
+
+            assert result.status == STATE_CRITICAL
+            assert result.message == "1/3 lbvserver CRITICAL (lb_down)"
+            assert result.perfdata["total"] == 3
+
+    def test_state_check_streamed(self, mock_nitro_server):
+        """Test objects decoded incrementally are evaluated like a single response"""
+        with NITROClient(
+            hostname=mock_nitro_server.host,
+            port=mock_nitro_server.port,
+            username="nsroot",
+            password="nsroot",
+            ssl=False,
+        ) as client:
+            args = Namespace(
+                command="state",
+                objecttype="lbvserver",
+                objectname=None,
+                filter=None,
+                limit=None,
+                stream=True,
+            )
+            parse_time = client.transfer_stats.parse_time
+
+            result = StateCommand(client, args).execute()
+
+            assert result.status == STATE_CRITICAL
+            assert result.message == "1/3 lbvserver CRITICAL (lb_down)"
+            # The incremental decode counts towards parse_ms
+            assert client.transfer_stats.parse_time > parse_time
+
+    def test_state_check_count_only(self, mock_nitro_server):
+        """Test --count-only evaluates counts and fetches only the unhealthy objects"""
+        with NITROClient(
+            hostname=mock_nitro_server.host,
+            port=mock_nitro_server.port,
+            username="nsroot",
+            password="nsroot",
+            ssl=False,
+        ) as client:
+            args = Namespace(
+                command="state",
+                objecttype="lbvserver",
+                objectname=None,
+                filter=None,
+                limit=None,
+                count_only=True,
+            )
+
+            result = StateCommand(client, args).execute()
+
+            assert result.status == STATE_CRITICAL
+            assert result.message == "1/3 lbvserver CRITICAL (lb_down)"
+            assert result.perfdata["ok"] == 2
+            assert result.perfdata["unknown"] == 0
+            urls = [r.url for r in client.transfer_stats.requests if "/stat/" in r.url]
+            assert sum("count=yes" in url for url in urls) == 4
+            assert len(urls) == 5
@@ -15,8 +15,11 @@ Usage:
 """
 
 import argparse
+import gzip
 import json
+import re
 import threading
+import zlib
 from pathlib import Path
 from typing import Dict, Optional
 
@@ -103,9 +106,10 @@ class MockNITROServer:
             resource_type: Type of resource (e.g., 'lbvserver')
             resource_name: Specific resource name (optional)
         """
-        # Check authentication
+        # Check authentication (session cookie or X-NITRO-USER/X-NITRO-PASS headers)
         session_id = request.cookies.get("NITRO_AUTH_TOKEN")
-        if session_id not in self.sessions:
+        header_auth = request.headers.get("X-NITRO-USER") and request.headers.get("X-NITRO-PASS")
+        if session_id not in self.sessions and not header_auth:
             return jsonify({"errorcode": 444, "message": "Not authenticated"}), 401
 
         # Parse query arguments (e.g., args=filelocation:/nsconfig/license)
@@ -121,7 +125,102 @@ class MockNITROServer:
                 404,
             )
 
-        return jsonify(fixture_data)
+        # Server-side filter (e.g., filter=name:lb_web or filter=name:/^lb_/)
+        filter_param = request.args.get("filter")
+        if filter_param:
+            fixture_data = self._apply_filter(fixture_data, resource_type, filter_param)
+
+        # Object count (count=yes) and pagination (pagesize/pageno)
+        if request.args.get("count") == "yes":
+            fixture_data = self._count(fixture_data, resource_type)
+        elif request.args.get("pagesize"):
+            fixture_data = self._paginate(
+                fixture_data,
+                resource_type,
+                int(request.args["pagesize"]),
+                int(request.args.get("pageno", "1")),
+            )
+
+        # Attribute projection (e.g., attrs=name,state), config endpoint only
+        attrs_param = request.args.get("attrs")
+        if attrs_param and endpoint == "config":
+            fixture_data = self._project_attrs(fixture_data, resource_type, attrs_param)
+
+        return self._compress(jsonify(fixture_data))
+
+    def _compress(self, response):
+        """Apply gzip/deflate content encoding if the client accepts it"""
+        accepted = request.headers.get("Accept-Encoding", "")
+        if "gzip" in accepted:
+            response.set_data(gzip.compress(response.get_data()))
+            response.headers["Content-Encoding"] = "gzip"
+        elif "deflate" in accepted:
+            response.set_data(zlib.compress(response.get_data()))
+            response.headers["Content-Encoding"] = "deflate"
+        return response
+
+    def _apply_filter(self, data: Dict, resource_type: str, filter_str: str) -> Dict:
+        """
+        Keep only resource objects matching all filter conditions
+
+        Example: "name:lb_web" (exact) or "name:/^lb_/" (regular expression)
+        """
+        conditions = []
+        for part in filter_str.split(","):
+            if ":" in part:
+                key, value = part.split(":", 1)
+                conditions.append((key.strip(), value.strip()))
+
+        def matches(resource: Dict) -> bool:
+            for key, value in conditions:
+                actual = str(resource.get(key, ""))
+                if len(value) > 1 and value.startswith("/") and value.endswith("/"):
+                    if not re.search(value[1:-1], actual):
+                        return False
+                elif actual != value:
+                    return False
+            return True
+
+        resources = data.get(resource_type)
+        if isinstance(resources, list):
+            data[resource_type] = [r for r in resources if matches(r)]
+        elif isinstance(resources, dict) and not matches(resources):
+            data[resource_type] = []
+
+        return data
+
+    def _count(self, data: Dict, resource_type: str) -> Dict:
+        """Replace the resource objects by their count, like NITRO's count=yes"""
+        resources = data.get(resource_type)
+        if isinstance(resources, dict):
+            resources = [resources]
+        if not resources:
+            return {"errorcode": 0, "message": "Done"}
+        return {"errorcode": 0, "message": "Done", resource_type: [{"__count": len(resources)}]}
+
+    def _paginate(self, data: Dict, resource_type: str, pagesize: int, pageno: int) -> Dict:
+        """Return only the requested page of resource objects"""
+        resources = data.get(resource_type)
+        if isinstance(resources, list):
+            start = (pageno - 1) * pagesize
+            data[resource_type] = resources[start : start + pagesize]
+        return data
+
+    def _project_attrs(self, data: Dict, resource_type: str, attrs_str: str) -> Dict:
+        """
+        Keep only the requested attributes of each resource object
+
+        Example: "name,state" keeps only the name and state fields
+        """
+        attrs = {attr.strip() for attr in attrs_str.split(",")}
+        resources = data.get(resource_type)
+
+        if isinstance(resources, list):
+            data[resource_type] = [{k: v for k, v in r.items() if k in attrs} for r in resources]
+        elif isinstance(resources, dict):
+            data[resource_type] = {k: v for k, v in resources.items() if k in attrs}
+
+        return data
 
     def _parse_args(self, args_str: str) -> Dict:
         """
@@ -0,0 +1,85 @@
+"""
+Tests for the asyncio interface
+"""
+
+import asyncio
+import threading
+import time
+from functools import partial
+from unittest.mock import Mock
+
+import pytest
+
+from check_netscaler.client import NITROClient
+from check_netscaler.client.aio import AsyncNITROClient
+from check_netscaler.client.exceptions import NITROResourceNotFoundError
+
+
+def create_mock_client():
+    """Create a mock NITRO client batching requests with get_many()"""
+    client = Mock()
+    client.get_many.side_effect = partial(NITROClient.get_many, client)
+    return client
+
+
+class TestAsyncNITROClient:
+    """Test the coroutine wrapper around NITROClient.get_many()"""
+
+    def test_get_dispatches_by_endpoint(self):
+        """Test stat and config requests call the matching client method"""
+        client = create_mock_client()
+        client.get_stat.return_value = {"lbvserver": []}
+        client.get_config.return_value = {"nsversion": {}}
+
+        async def run():
+            aclient = AsyncNITROClient(client)
+            stat = await aclient.get_stat("lbvserver", "vs1")
+            config = await aclient.get("nsversion", endpoint="config", url_options="attrs=version")
+            return stat, config
+
+        assert asyncio.run(run()) == ({"lbvserver": []}, {"nsversion": {}})
+        client.get_stat.assert_called_once_with("lbvserver", "vs1", None)
+        client.get_config.assert_called_once_with("nsversion", None, "attrs=version")
+        client.get_many.assert_called_with(
+            [("config", "nsversion", None, "attrs=version")], max_workers=4
+        )
+
+    def test_get_raises_failure(self):
+        """Test a failing request raises its exception"""
+        client = create_mock_client()
+        client.get_config.side_effect = NITROResourceNotFoundError("Resource not found")
+
+        with pytest.raises(NITROResourceNotFoundError):
+            asyncio.run(AsyncNITROClient(client).get_config("nsversion"))
+
+    def test_requests_run_concurrently(self):
+        """Test gathered requests overlap instead of running back to back"""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def slow_get(resource_type, *args):
+            barrier.wait()
+            return {resource_type: []}
+
+        client = create_mock_client()
+        client.get_config.side_effect = slow_get
+
+        async def run():
+            aclient = AsyncNITROClient(client)
+            return await asyncio.gather(
+                aclient.get_config("ntpsync"), aclient.get_config("ntpstatus")
+            )
+
+        start = time.monotonic()
+        assert asyncio.run(run()) == [{"ntpsync": []}, {"ntpstatus": []}]
+        assert time.monotonic() - start < 5
+
+    def test_get_many(self):
+        """Test a batch is handed to NITROClient.get_many() as is"""
+        client = create_mock_client()
+        client.get_config.side_effect = lambda resource_type, *args: {resource_type: []}
+        requests = [("config", "ntpsync", None, None), ("config", "ntpstatus", None, None)]
+
+        results = asyncio.run(AsyncNITROClient(client, max_workers=2).get_many(requests))
+
+        assert results == {requests[0]: {"ntpsync": []}, requests[1]: {"ntpstatus": []}}
+        client.get_many.assert_called_once_with(requests, max_workers=2)
@@ -0,0 +1,62 @@
+"""
+Tests for helpers shared by all commands
+"""
+
+from functools import partial
+from unittest.mock import Mock
+
+import pytest
+
+from check_netscaler.client import NITROClient
+from check_netscaler.client.exceptions import NITROResourceNotFoundError
+from check_netscaler.commands.base import BaseCommand
+
+
+class DummyCommand(BaseCommand):
+    def execute(self):
+        pass
+
+
+def create_mock_client():
+    """Create a mock NITRO client batching requests with get_many()"""
+    client = Mock()
+    client.get_many.side_effect = partial(NITROClient.get_many, client)
+    return client
+
+
+class TestFetchConcurrently:
+    """Test BaseCommand.fetch_concurrently"""
+
+    def test_results_in_request_order(self):
+        """Test responses are returned in the order they were requested"""
+        client = create_mock_client()
+        client.get_stat.return_value = {"lbvserver": [{"name": "vs1"}]}
+        client.get_config.return_value = {"lbvserver": [{"name": "vs1", "backupvserver": ""}]}
+
+        command = DummyCommand(client, Mock())
+        stat, config = command.fetch_concurrently(
+            ("stat", "lbvserver", "vs1"), ("config", "lbvserver", "vs1")
+        )
+
+        assert stat == client.get_stat.return_value
+        assert config == client.get_config.return_value
+        client.get_many.assert_called_once()
+
+    def test_failures_are_returned(self):
+        """Test a failing request does not hide the others"""
+        client = create_mock_client()
+        client.get_config.side_effect = [
+            {"nshardware": {}},
+            NITROResourceNotFoundError("Resource not found"),
+        ]
+
+        command = DummyCommand(client, Mock())
+        results = command.fetch_concurrently(
+            ("config", "nshardware", None), ("config", "nsversion", None)
+        )
+
+        assert len(results) == 2
+        assert any(isinstance(r, NITROResourceNotFoundError) for r in results)
+        with pytest.raises(NITROResourceNotFoundError):
+            for result in results:
+                command.unwrap_result(result)
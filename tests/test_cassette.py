@@ -0,0 +1,122 @@
+"""
+Tests for recording and replaying NITRO traffic
+"""
+
+import gzip
+import json
+import os
+
+import pytest
+
+from check_netscaler.cli import main
+from check_netscaler.client import Cassette, NITROClient, NITROConnectionError
+from check_netscaler.client.cassette import REDACTED, ReplayTransport
+
+
+@pytest.fixture
+def recorded(mock_nitro_server, tmp_path):
+    """Record a session against the mock server and return the cassette path"""
+    path = str(tmp_path / "appliance.cassette.gz")
+    with NITROClient(
+        hostname=mock_nitro_server.host,
+        port=mock_nitro_server.port,
+        username="nsroot",
+        password="nsroot",
+        ssl=False,
+        cassette=Cassette(path, record=True),
+    ) as client:
+        client.get_stat("lbvserver")
+        client.get_config("nsconfig")
+        client.get_stat("lbvserver", url_options="count=yes")
+    return path
+
+
+class TestRecording:
+    """Test cassettes written by RecordingTransport"""
+
+    def test_cassette_format(self, recorded):
+        """Test the cassette is gzip-compressed JSON Lines without scheme and host"""
+        with gzip.open(recorded, "rt", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+
+        assert lines[0] == {"cassette": 1}
+        assert [(entry["method"], entry["url"]) for entry in lines[1:]] == [
+            ("POST", "/nitro/v1/config/login"),
+            ("GET", "/nitro/v1/stat/lbvserver"),
+            ("GET", "/nitro/v1/config/nsconfig"),
+            ("GET", "/nitro/v1/stat/lbvserver?count=yes"),
+            ("POST", "/nitro/v1/config/logout"),
+        ]
+
+    def test_secrets_are_redacted(self, recorded, mock_nitro_server):
+        """Test credentials and session tokens do not end up in the cassette"""
+        with gzip.open(recorded, "rt", encoding="utf-8") as f:
+            content = f.read()
+        login = json.loads(content.splitlines()[1])
+
+        assert "nsroot" not in content
+        assert json.loads(login["body"])["sessionid"] == REDACTED
+        assert login["cookies"] == ["NITRO_AUTH_TOKEN"]
+        for session_id in mock_nitro_server.sessions:
+            assert session_id not in content
+
+    def test_cassette_is_private(self, recorded):
+        """Test the cassette is readable by the owner only"""
+        assert os.stat(recorded).st_mode & 0o777 == 0o600
+
+
+class TestReplay:
+    """Test serving a cassette with ReplayTransport"""
+
+    def test_replay_without_network(self, recorded, mock_nitro_server):
+        """Test replayed responses equal the recorded ones, for any host"""
+        with NITROClient(
+            hostname=mock_nitro_server.host,
+            port=mock_nitro_server.port,
+            username="nsroot",
+            password="nsroot",
+            ssl=False,
+        ) as client:
+            expected = client.get_stat("lbvserver")
+
+        with NITROClient("192.0.2.1", "nsroot", "wrong", cassette=Cassette(recorded)) as client:
+            assert isinstance(client.session.transport, ReplayTransport)
+            assert client.get_stat("lbvserver") == expected
+            assert client.count("lbvserver", "stat") == 3
+            # Responses are repeated once used up
+            assert client.get_stat("lbvserver") == expected
+
+    def test_unrecorded_request(self, recorded):
+        """Test a request missing from the cassette fails like an unreachable appliance"""
+        with NITROClient("192.0.2.1", "nsroot", "nsroot", cassette=Cassette(recorded)) as client:
+            with pytest.raises(NITROConnectionError, match="No recorded response for GET"):
+                client.get_stat("service")
+
+    def test_invalid_cassette(self, tmp_path):
+        """Test files that are not cassettes are rejected"""
+        path = tmp_path / "not-a-cassette"
+        path.write_bytes(b"plain text")
+
+        with pytest.raises(ValueError, match="Cannot read cassette"):
+            Cassette(str(path))
+
+    def test_cli_record_and_replay(self, mock_nitro_server, tmp_path, capsys):
+        """Test a check recorded with --record gives the same result with --replay"""
+        path = str(tmp_path / "state.cassette.gz")
+        check = ["-C", "state", "-o", "lbvserver"]
+        recorded_status = main(
+            [
+                "-H",
+                mock_nitro_server.host,
+                "--no-ssl",
+                "-P",
+                str(mock_nitro_server.port),
+                "--record",
+                path,
+            ]
+            + check
+        )
+        recorded_output = capsys.readouterr().out
+
+        assert main(["--replay", path] + check) == recorded_status
+        assert capsys.readouterr().out == recorded_output
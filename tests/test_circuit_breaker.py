@@ -0,0 +1,186 @@
+"""
+Tests for the per-appliance circuit breaker
+"""
+
+import socket
+import time
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from check_netscaler.cli import main
+from check_netscaler.client import (
+    CircuitBreaker,
+    Deadline,
+    NITROCircuitOpenError,
+    NITROClient,
+    NITROConnectionError,
+    NITRODeadlineError,
+    NITROTimeoutError,
+    RetryPolicy,
+)
+
+HOST = "192.168.1.1:443"
+
+
+class TestCircuitBreaker:
+    """Test state transitions of the breaker"""
+
+    def test_opens_after_threshold(self, tmp_path):
+        """Test the circuit opens after N consecutive failures"""
+        breaker = CircuitBreaker(str(tmp_path), threshold=2, cooldown=60)
+        breaker.before_request(HOST)
+        breaker.record_failure(HOST)
+        breaker.before_request(HOST)
+        breaker.record_failure(HOST)
+
+        with pytest.raises(NITROCircuitOpenError, match="after 2 consecutive failures"):
+            breaker.before_request(HOST)
+
+    def test_success_resets_failures(self, tmp_path):
+        """Test failures must be consecutive to open the circuit"""
+        breaker = CircuitBreaker(str(tmp_path), threshold=2)
+        breaker.record_failure(HOST)
+        breaker.before_request(HOST)
+        breaker.record_success(HOST)
+        breaker.record_failure(HOST)
+
+        breaker.before_request(HOST)
+
+    def test_state_is_shared_and_per_host(self, tmp_path):
+        """Test breakers of other processes see the state; other hosts are unaffected"""
+        CircuitBreaker(str(tmp_path), threshold=1).record_failure(HOST)
+
+        other = CircuitBreaker(str(tmp_path), threshold=1)
+        with pytest.raises(NITROCircuitOpenError):
+            other.before_request(HOST)
+        other.before_request("192.168.1.2:443")
+
+    def test_single_probe_after_cooldown(self, tmp_path):
+        """Test only one probe is let through once the cool-down has passed"""
+        breaker = CircuitBreaker(str(tmp_path), threshold=1, cooldown=10)
+        breaker.record_failure(HOST)
+
+        with patch("time.time", return_value=time.time() + 11):
+            breaker.before_request(HOST)
+            with pytest.raises(NITROCircuitOpenError, match="half-open"):
+                CircuitBreaker(str(tmp_path), threshold=1, cooldown=10).before_request(HOST)
+
+            breaker.record_success(HOST)
+            CircuitBreaker(str(tmp_path), threshold=1, cooldown=10).before_request(HOST)
+
+    def test_failed_probe_reopens(self, tmp_path):
+        """Test a failing probe starts another cool-down period"""
+        breaker = CircuitBreaker(str(tmp_path), threshold=1, cooldown=10)
+        breaker.record_failure(HOST)
+
+        later = time.time() + 11
+        with patch("time.time", return_value=later):
+            breaker.before_request(HOST)
+            breaker.record_failure(HOST)
+        with patch("time.time", return_value=later + 5):
+            with pytest.raises(NITROCircuitOpenError, match="open for"):
+                breaker.before_request(HOST)
+
+    def test_unusable_cache_dir_is_ignored(self, tmp_path):
+        """Test state errors never mask the actual request outcome"""
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        breaker = CircuitBreaker(str(blocker / "cache"), threshold=1)
+        breaker.record_failure(HOST)
+        breaker.before_request(HOST)
+
+
+class TestTransportIntegration:
+    """Test the breaker wraps real requests"""
+
+    @pytest.mark.parametrize("transport", ["requests", "stdlib"])
+    def test_connection_failures_open_circuit(self, tmp_path, transport):
+        """Test refused connections are counted and later requests fail fast"""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        def make_client():
+            return NITROClient(
+                hostname="127.0.0.1",
+                port=port,
+                username="nsroot",
+                password="nsroot",
+                ssl=False,
+                transport=transport,
+                circuit_breaker=CircuitBreaker(str(tmp_path), threshold=2),
+            )
+
+        for _ in range(2):
+            with pytest.raises(NITROConnectionError) as exc_info:
+                make_client().login()
+            assert not isinstance(exc_info.value, NITROCircuitOpenError)
+
+        with patch.object(requests.Session, "post") as mock_post:
+            with pytest.raises(NITROCircuitOpenError):
+                make_client().login()
+        mock_post.assert_not_called()
+
+    def test_retries_count_as_one_failure(self, tmp_path):
+        """Test a request that exhausts --retries counts once, even with retries >= N"""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        def make_client():
+            return NITROClient(
+                hostname="127.0.0.1",
+                port=port,
+                username="nsroot",
+                password="nsroot",
+                ssl=False,
+                circuit_breaker=CircuitBreaker(str(tmp_path), threshold=2),
+                retry_policy=RetryPolicy(3, sleep=lambda delay: None),
+            )
+
+        for _ in range(2):
+            client = make_client()
+            with pytest.raises(NITROConnectionError) as exc_info:
+                client.login()
+            assert not isinstance(exc_info.value, NITROCircuitOpenError)
+            assert len(client.transfer_stats.retries) == 3
+
+        with pytest.raises(NITROCircuitOpenError):
+            make_client().login()
+
+    @patch("requests.Session.get", side_effect=requests.exceptions.Timeout("read timeout"))
+    def test_deadline_timeouts_are_not_counted(self, mock_get, tmp_path):
+        """Test a timeout on the rest of the --deadline budget leaves the breaker alone"""
+        breaker = CircuitBreaker(str(tmp_path), threshold=1)
+        client = NITROClient(
+            hostname="192.168.1.1",
+            username="nsroot",
+            password="nsroot",
+            circuit_breaker=breaker,
+            deadline=Deadline(1),
+        )
+        client.session.is_logged_in = True
+
+        with pytest.raises(NITRODeadlineError):
+            client.get_stat("lbvserver")
+        breaker.before_request("192.168.1.1:443")
+
+        client.session.deadline = None
+        with pytest.raises(NITROTimeoutError):
+            client.get_stat("lbvserver")
+        with pytest.raises(NITROCircuitOpenError):
+            breaker.before_request("192.168.1.1:443")
+
+    def test_cli_reports_open_circuit(self, tmp_path, capsys):
+        """Test an open circuit ends the check with UNKNOWN immediately"""
+        CircuitBreaker(str(tmp_path), threshold=1).record_failure("192.168.1.1:443")
+
+        status = main(
+            ["-H", "192.168.1.1", "-C", "state", "--circuit-breaker", "1"]
+            + ["--cache-dir", str(tmp_path)]
+        )
+
+        assert status == 3
+        assert "Circuit breaker open for 192.168.1.1:443" in capsys.readouterr().out
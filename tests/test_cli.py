@@ -2,6 +2,9 @@
 Tests for CLI argument parsing and basic functionality
 """
 
+import os
+import re
+
 import pytest
 
 from check_netscaler.cli import create_parser, main
@@ -45,6 +48,22 @@ class TestArgumentParser:
         assert args.ssl is True  # SSL is now default
         assert args.timeout == 15
 
+    def test_pagesize(self):
+        """Test paging is disabled by default and can be enabled"""
+        parser = create_parser()
+
+        assert parser.parse_args(["-H", "192.168.1.1", "-C", "state"]).pagesize == 0
+
+        args = parser.parse_args(["-H", "192.168.1.1", "-C", "state", "--pagesize", "500"])
+        assert args.pagesize == 500
+
+    def test_stream(self):
+        """Test incremental decoding is disabled by default and can be enabled"""
+        parser = create_parser()
+
+        assert parser.parse_args(["-H", "192.168.1.1", "-C", "state"]).stream is False
+        assert parser.parse_args(["-H", "192.168.1.1", "-C", "state", "--stream"]).stream is True
+
     def test_no_ssl_flag(self):
         """Test --no-ssl flag to disable SSL"""
         parser = create_parser()
@@ -226,6 +245,94 @@ class TestMainFunction:
             main(["-C", "state"])
         # Should exit with error about missing hostname
 
+    @pytest.mark.parametrize("option", [["--pagesize", "100"], ["--stream"], ["--count-only"]])
+    def test_main_stale_if_error_with_uncached_option(self, option, capsys):
+        """Test --stale-if-error is rejected with options that bypass the response cache"""
+        with pytest.raises(SystemExit):
+            main(["-H", "192.168.1.1", "-C", "state", "--stale-if-error", "300"] + option)
+        assert f"not allowed with argument {option[0]}" in capsys.readouterr().err
+
+    def test_main_verbose_transfer_stats(self, mock_nitro_server, capsys):
+        """Test -v prints per-request transfer sizes to stderr"""
+        status = main(
+            [
+                "-H",
+                mock_nitro_server.host,
+                "--no-ssl",
+                "-P",
+                str(mock_nitro_server.port),
+                "-u",
+                "nsroot",
+                "-p",
+                "nsroot",
+                "-C",
+                "state",
+                "-o",
+                "lbvserver",
+                "-v",
+            ]
+        )
+
+        captured = capsys.readouterr()
+        assert status in (0, 1, 2)
+        assert "GET /nitro/v1/stat/lbvserver 200" in captured.err
+        assert "bytes transferred" in captured.err
+        assert "total:" in captured.err
+        assert "bytes transferred" not in captured.out
+
+    @pytest.mark.parametrize("transport", ["requests", "stdlib"])
+    def test_main_self_metrics(self, mock_nitro_server, capsys, transport):
+        """Test --self-metrics appends request timings and sizes to the perfdata"""
+        main(
+            [
+                "-H",
+                mock_nitro_server.host,
+                "--no-ssl",
+                "-P",
+                str(mock_nitro_server.port),
+                "--transport",
+                transport,
+                "-C",
+                "state",
+                "-o",
+                "lbvserver",
+                "--self-metrics",
+            ]
+        )
+
+        perfdata = capsys.readouterr().out.split("|", 1)[1]
+        for label in ("nitro_login_ms", "nitro_get_ms", "parse_ms", "total_ms"):
+            assert re.search(rf"'{label}'=\d+\.\dms;;;0;", perfdata)
+        assert re.search(r"'nitro_bytes'=[1-9]\d*B;;;0;", perfdata)
+        # login, stat/lbvserver and logout
+        assert "'nitro_requests'=3;;;0;" in perfdata
+        assert ("'nitro_connect_ms'=" in perfdata) == (transport == "stdlib")
+        assert "'nitro_resolve_ms'=" not in perfdata
+
+    def test_main_dns_cache(self, mock_nitro_server, capsys, tmp_path):
+        """Test --dns-cache pins the hostname and reports the lookup time"""
+        main(
+            [
+                "-H",
+                "localhost",
+                "--no-ssl",
+                "-P",
+                str(mock_nitro_server.port),
+                "--dns-cache",
+                "300",
+                "--cache-dir",
+                str(tmp_path),
+                "-C",
+                "state",
+                "-o",
+                "lbvserver",
+                "--self-metrics",
+            ]
+        )
+
+        assert re.search(r"'nitro_resolve_ms'=\d+\.\dms;;;0;", capsys.readouterr().out)
+        assert [name for name in os.listdir(tmp_path) if name.startswith("dns-")]
+
 
 class TestEnvironmentVariables:
     """Test environment variable support"""
@@ -296,3 +403,29 @@ class TestEnvironmentVariables:
         assert args.hostname == "10.0.0.1"
         assert args.username == "nsroot"  # default
         assert args.password == "nsroot"  # default
+
+    @pytest.mark.parametrize(
+        "option, variable",
+        [
+            ("pagesize", "NETSCALER_PAGESIZE"),
+            ("circuit_breaker", "NETSCALER_CIRCUIT_BREAKER"),
+            ("circuit_cooldown", "NETSCALER_CIRCUIT_COOLDOWN"),
+            ("deadline", "NETSCALER_DEADLINE"),
+            ("retries", "NETSCALER_RETRIES"),
+            ("adaptive_timeout", "NETSCALER_ADAPTIVE_TIMEOUT"),
+            ("min_timeout", "NETSCALER_MIN_TIMEOUT"),
+            ("hedge_delay", "NETSCALER_HEDGE_DELAY"),
+            ("max_concurrent", "NETSCALER_MAX_CONCURRENT"),
+            ("config_cache", "NETSCALER_CONFIG_CACHE"),
+            ("stale_if_error", "NETSCALER_STALE_IF_ERROR"),
+            ("dns_cache", "NETSCALER_DNS_CACHE"),
+        ],
+    )
+    def test_numeric_option_from_env(self, monkeypatch, option, variable):
+        """Test numeric options are read from the environment and validated by argparse"""
+        monkeypatch.setenv(variable, "5")
+        assert getattr(create_parser().parse_args(["-C", "state"]), option) == 5
+
+        monkeypatch.setenv(variable, "five")
+        with pytest.raises(SystemExit):
+            create_parser().parse_args(["-C", "state"])
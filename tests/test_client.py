@@ -2,6 +2,8 @@
 Tests for NITRO API client
 """
 
+import json
+import threading
 from unittest.mock import Mock, patch
 
 import pytest
@@ -62,7 +64,7 @@ class TestNITROSession:
         assert session.port == 8443
         assert session.base_url == "https://192.168.1.1:8443/nitro/v1"
 
-    @patch("check_netscaler.client.session.urllib3.disable_warnings")
+    @patch("urllib3.disable_warnings")
     def test_session_disables_insecure_request_warning(self, mock_disable_warnings):
         """Test HTTPS sessions with verify_ssl disabled suppress urllib3 warnings."""
         NITROSession(
@@ -75,7 +77,7 @@ class TestNITROSession:
 
         mock_disable_warnings.assert_called_once()
 
-    @patch("check_netscaler.client.session.urllib3.disable_warnings")
+    @patch("urllib3.disable_warnings")
     def test_session_keeps_warnings_when_verifying_ssl(self, mock_disable_warnings):
         """Test verified HTTPS sessions do not suppress urllib3 warnings."""
         NITROSession(
@@ -228,7 +230,9 @@ class TestNITROClient:
         # Mock GET request
         mock_get_response = Mock()
         mock_get_response.status_code = 200
-        mock_get_response.json.return_value = {"lbvserver": [{"name": "test", "state": "UP"}]}
+        mock_get_response.content = json.dumps(
+            {"lbvserver": [{"name": "test", "state": "UP"}]}
+        ).encode()
         mock_get.return_value = mock_get_response
 
         client = NITROClient(
@@ -258,7 +262,9 @@ class TestNITROClient:
         # Mock GET request
         mock_get_response = Mock()
         mock_get_response.status_code = 200
-        mock_get_response.json.return_value = {"lbvserver": [{"name": "test", "ipv46": "10.0.0.1"}]}
+        mock_get_response.content = json.dumps(
+            {"lbvserver": [{"name": "test", "ipv46": "10.0.0.1"}]}
+        ).encode()
         mock_get.return_value = mock_get_response
 
         client = NITROClient(
@@ -287,7 +293,9 @@ class TestNITROClient:
         # Mock GET request
         mock_get_response = Mock()
         mock_get_response.status_code = 200
-        mock_get_response.json.return_value = {"lbvserver": [{"name": "my_vserver", "state": "UP"}]}
+        mock_get_response.content = json.dumps(
+            {"lbvserver": [{"name": "my_vserver", "state": "UP"}]}
+        ).encode()
         mock_get.return_value = mock_get_response
 
         client = NITROClient(
@@ -389,3 +397,360 @@ class TestNITROClient:
 
         # After context, should be logged out
         assert client.session.is_logged_in is False
+
+
+class TestHeaderAuthentication:
+    """Test stateless header authentication mode"""
+
+    def test_invalid_auth_mode(self):
+        """Test unknown auth modes are rejected"""
+        with pytest.raises(ValueError, match="Invalid auth mode"):
+            NITROSession(
+                hostname="192.168.1.1",
+                username="admin",
+                password="secret",
+                auth_mode="basic",
+            )
+
+    @patch("requests.Session.post")
+    @patch("requests.Session.get")
+    def test_headers_mode_skips_login_and_logout(self, mock_get, mock_post):
+        """Test header auth sends credentials with each GET and never logs in or out"""
+        mock_get_response = Mock()
+        mock_get_response.status_code = 200
+        mock_get_response.content = json.dumps({"nsconfig": {"configchanged": False}}).encode()
+        mock_get.return_value = mock_get_response
+
+        with NITROClient(
+            hostname="192.168.1.1",
+            username="admin",
+            password="secret",
+            auth_mode="headers",
+        ) as client:
+            assert client.session.transport.headers["X-NITRO-USER"] == "admin"
+            assert client.session.transport.headers["X-NITRO-PASS"] == "secret"
+            client.get_config("nsconfig")
+
+        mock_post.assert_not_called()
+        mock_get.assert_called_once()
+        assert "X-NITRO-PASS" not in client.session.transport.headers
+
+    @patch("requests.Session.get")
+    def test_headers_mode_unauthorized(self, mock_get):
+        """Test a 401 in header mode is reported as an authentication error"""
+        mock_get_response = Mock()
+        mock_get_response.status_code = 401
+        mock_get.return_value = mock_get_response
+
+        client = NITROClient(
+            hostname="192.168.1.1",
+            username="admin",
+            password="wrong",
+            auth_mode="headers",
+        )
+        client.login()
+
+        with pytest.raises(NITROAuthenticationError, match="Authentication failed"):
+            client.get_stat("lbvserver")
+
+
+class TestGetMany:
+    """Test batched concurrent GET requests"""
+
+    @staticmethod
+    def make_response(status_code, data=None):
+        response = Mock()
+        response.status_code = status_code
+        response.content = json.dumps(data).encode()
+        response.text = ""
+        return response
+
+    @patch("requests.Session.get")
+    def test_get_many_returns_results_keyed_by_request(self, mock_get):
+        """Test each request tuple maps to its response"""
+
+        def get(url, **kwargs):
+            if url.endswith("/stat/lbvserver/vs1"):
+                return self.make_response(200, {"lbvserver": [{"name": "vs1"}]})
+            if url.endswith("/config/nsversion?attrs=version"):
+                return self.make_response(200, {"nsversion": {"version": "NS14.1"}})
+            return self.make_response(404)
+
+        mock_get.side_effect = get
+
+        client = NITROClient("192.168.1.1", "admin", "secret", auth_mode="headers")
+        client.login()
+
+        stat = ("stat", "lbvserver", "vs1", None)
+        config = ("config", "nsversion", None, "attrs=version")
+        missing = ("config", "missing", None, None)
+        results = client.get_many([stat, config, missing])
+
+        assert results[stat] == {"lbvserver": [{"name": "vs1"}]}
+        assert results[config] == {"nsversion": {"version": "NS14.1"}}
+        assert isinstance(results[missing], NITROResourceNotFoundError)
+        assert mock_get.call_count == 3
+
+    @patch("requests.Session.get")
+    def test_get_many_deduplicates_requests(self, mock_get):
+        """Test identical requests are only sent once"""
+        mock_get.return_value = self.make_response(200, {"nsconfig": {}})
+
+        client = NITROClient("192.168.1.1", "admin", "secret", auth_mode="headers")
+        client.login()
+
+        request = ("config", "nsconfig", None, None)
+        results = client.get_many([request, request])
+
+        assert results == {request: {"nsconfig": {}}}
+        mock_get.assert_called_once()
+
+    def test_get_many_runs_concurrently(self):
+        """Test batched requests overlap instead of running back to back"""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def slow_get(resource_type, *args):
+            barrier.wait()
+            return {resource_type: []}
+
+        client = NITROClient("192.168.1.1", "admin", "secret")
+        with patch.object(client, "get_config", side_effect=slow_get):
+            results = client.get_many(
+                [("config", "ntpsync", None, None), ("config", "ntpstatus", None, None)]
+            )
+
+        assert list(results.values()) == [{"ntpsync": []}, {"ntpstatus": []}]
+
+    def test_get_many_empty(self):
+        """Test an empty batch sends nothing"""
+        client = NITROClient("192.168.1.1", "admin", "secret")
+
+        assert client.get_many([]) == {}
+
+    def test_get_many_not_logged_in(self):
+        """Test per-request errors are returned, not raised"""
+        client = NITROClient("192.168.1.1", "admin", "secret")
+
+        request = ("stat", "lbvserver", None, None)
+        results = client.get_many([request])
+
+        assert isinstance(results[request], NITROAPIError)
+
+
+class TestConfigAttrs:
+    """Test attribute projection for config requests"""
+
+    @staticmethod
+    def make_client(mock_get):
+        response = Mock()
+        response.status_code = 200
+        response.content = json.dumps({}).encode()
+        mock_get.return_value = response
+
+        client = NITROClient("192.168.1.1", "admin", "secret", auth_mode="headers")
+        client.login()
+        return client
+
+    @patch("requests.Session.get")
+    def test_config_request_sends_declared_attrs(self, mock_get):
+        """Test declared attributes are added to config requests"""
+        client = self.make_client(mock_get)
+        client.declare_attrs("sslcertkey", ["certkey", "daystoexpiration"])
+
+        client.get_config("sslcertkey")
+
+        url = mock_get.call_args[0][0]
+        assert url.endswith("/config/sslcertkey?attrs=certkey,daystoexpiration")
+
+    @patch("requests.Session.get")
+    def test_attrs_are_merged_with_url_options(self, mock_get):
+        """Test attrs are appended to other URL options and merged across declarations"""
+        client = self.make_client(mock_get)
+        client.declare_attrs("lbvserver", ["name", "state"])
+        client.declare_attrs("lbvserver", ["name", "backupvserver"])
+
+        client.get_config("lbvserver", url_options="args=detail:true")
+
+        url = mock_get.call_args[0][0]
+        assert url.endswith("/config/lbvserver?args=detail:true&attrs=name,state,backupvserver")
+
+    @patch("requests.Session.get")
+    def test_stat_and_undeclared_requests_unchanged(self, mock_get):
+        """Test stat requests and undeclared resource types are sent without attrs"""
+        client = self.make_client(mock_get)
+        client.declare_attrs("lbvserver", ["name"])
+
+        client.get_stat("lbvserver")
+        assert "attrs=" not in mock_get.call_args[0][0]
+
+        client.get_config("service")
+        assert "attrs=" not in mock_get.call_args[0][0]
+
+    @patch("requests.Session.get")
+    def test_explicit_attrs_option_wins(self, mock_get):
+        """Test an explicit attrs= URL option is not overridden"""
+        client = self.make_client(mock_get)
+        client.declare_attrs("lbvserver", ["name"])
+
+        client.get_config("lbvserver", url_options="attrs=name,ipv46")
+
+        assert mock_get.call_args[0][0].endswith("/config/lbvserver?attrs=name,ipv46")
+
+
+class TestPagination:
+    """Test count() and paged iteration over collections"""
+
+    @staticmethod
+    def make_client(mock_get, pages):
+        """Create a client whose GETs are answered from a URL suffix -> data mapping"""
+
+        def get(url, **kwargs):
+            response = Mock()
+            response.status_code = 200
+            data = next(data for suffix, data in pages.items() if url.endswith(suffix))
+            response.content = json.dumps(data).encode()
+            return response
+
+        mock_get.side_effect = get
+        client = NITROClient("192.168.1.1", "admin", "secret", auth_mode="headers")
+        client.login()
+        return client
+
+    @patch("requests.Session.get")
+    def test_count(self, mock_get):
+        """Test count=yes responses are parsed"""
+        client = self.make_client(mock_get, {"?count=yes": {"lbvserver": [{"__count": 4}]}})
+
+        assert client.count("lbvserver") == 4
+
+    @patch("requests.Session.get")
+    def test_count_empty_collection(self, mock_get):
+        """Test a count response without the resource key means zero objects"""
+        client = self.make_client(mock_get, {"?count=yes": {"errorcode": 0}})
+
+        assert client.count("service") == 0
+
+    @patch("requests.Session.get")
+    def test_count_with_filter(self, mock_get):
+        """Test filter conditions are sent with count=yes"""
+        client = self.make_client(
+            mock_get, {"?count=yes&filter=state:DOWN": {"lbvserver": [{"__count": 2}]}}
+        )
+
+        assert client.count("lbvserver", "stat", filter={"state": "DOWN"}) == 2
+        assert mock_get.call_args[0][0].endswith("/stat/lbvserver?count=yes&filter=state:DOWN")
+
+    @patch("requests.Session.get")
+    def test_iter_objects_pages(self, mock_get):
+        """Test objects are fetched with pagesize/pageno and yielded in order"""
+        client = self.make_client(
+            mock_get,
+            {
+                "?count=yes": {"service": [{"__count": 5}]},
+                "?pagesize=2&pageno=1": {"service": [{"name": "s1"}, {"name": "s2"}]},
+                "?pagesize=2&pageno=2": {"service": [{"name": "s3"}, {"name": "s4"}]},
+                "?pagesize=2&pageno=3": {"service": [{"name": "s5"}]},
+            },
+        )
+
+        objects = client.iter_objects("service", "stat", pagesize=2)
+
+        assert [obj["name"] for obj in objects] == ["s1", "s2", "s3", "s4", "s5"]
+        assert mock_get.call_count == 4
+
+    @patch("requests.Session.get")
+    def test_iter_objects_is_lazy(self, mock_get):
+        """Test pages are only requested when the iterator reaches them"""
+        client = self.make_client(
+            mock_get,
+            {
+                "?count=yes": {"service": [{"__count": 4}]},
+                "?pagesize=2&pageno=1": {"service": [{"name": "s1"}, {"name": "s2"}]},
+                "?pagesize=2&pageno=2": {"service": [{"name": "s3"}, {"name": "s4"}]},
+            },
+        )
+
+        objects = client.iter_objects("service", "stat", pagesize=2)
+        assert next(objects)["name"] == "s1"
+
+        assert mock_get.call_count == 2
+
+    @patch("requests.Session.get")
+    def test_iter_objects_without_count(self, mock_get):
+        """Test paging stops at a short page when the appliance returns no count"""
+        client = self.make_client(
+            mock_get,
+            {
+                "?count=yes": {"service": [{"name": "s1"}, {"name": "s2"}, {"name": "s3"}]},
+                "?pagesize=2&pageno=1": {"service": [{"name": "s1"}, {"name": "s2"}]},
+                "?pagesize=2&pageno=2": {"service": [{"name": "s3"}]},
+            },
+        )
+
+        objects = list(client.iter_objects("service", "stat", pagesize=2))
+
+        assert [obj["name"] for obj in objects] == ["s1", "s2", "s3"]
+
+    @patch("requests.Session.get")
+    def test_iter_objects_pagination_ignored(self, mock_get):
+        """Test a page larger than pagesize is taken as the complete collection"""
+        everything = {"service": [{"name": "s1"}, {"name": "s2"}, {"name": "s3"}]}
+        client = self.make_client(
+            mock_get,
+            {"?count=yes": {"service": [{"__count": 3}]}, "?pagesize=2&pageno=1": everything},
+        )
+
+        objects = list(client.iter_objects("service", "stat", pagesize=2))
+
+        assert len(objects) == 3
+        assert mock_get.call_count == 2
+
+    @patch("requests.Session.get")
+    def test_iter_objects_passes_url_options(self, mock_get):
+        """Test url options such as filters are sent with the count and every page"""
+        client = self.make_client(
+            mock_get,
+            {
+                "?count=yes&filter=name:web": {"lbvserver": [{"__count": 1}]},
+                "?pagesize=10&pageno=1&filter=name:web": {"lbvserver": [{"name": "web"}]},
+            },
+        )
+
+        objects = list(
+            client.iter_objects("lbvserver", "stat", pagesize=10, url_options="filter=name:web")
+        )
+
+        assert objects == [{"name": "web"}]
+
+    @patch("requests.Session.get")
+    def test_get_resource_singleton(self, mock_get):
+        """Test a single object is returned as it is, without a count request"""
+        client = self.make_client(mock_get, {"?pagesize=2&pageno=1": {"system": {"numcpus": 4}}})
+
+        assert client.get_resource("system", "stat", pagesize=2) == {"numcpus": 4}
+        assert mock_get.call_count == 1
+
+    @patch("requests.Session.get")
+    def test_get_resource_pages(self, mock_get):
+        """Test a collection filling the first page is sized and paged on"""
+        client = self.make_client(
+            mock_get,
+            {
+                "?pagesize=2&pageno=1": {"service": [{"name": "s1"}, {"name": "s2"}]},
+                "?count=yes": {"service": [{"__count": 3}]},
+                "?pagesize=2&pageno=2": {"service": [{"name": "s3"}]},
+            },
+        )
+
+        objects = client.get_resource("service", "stat", pagesize=2)
+
+        assert [obj["name"] for obj in objects] == ["s1", "s2", "s3"]
+        assert mock_get.call_count == 3
+
+    @patch("requests.Session.get")
+    def test_get_resource_short_first_page(self, mock_get):
+        """Test a collection fitting on the first page needs no count request"""
+        client = self.make_client(mock_get, {"?pagesize=2&pageno=1": {"service": [{"name": "s1"}]}})
+
+        assert list(client.get_resource("service", "stat", pagesize=2)) == [{"name": "s1"}]
+        assert mock_get.call_count == 1
@@ -0,0 +1,116 @@
+"""
+Tests for the overall check deadline
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from check_netscaler.cli import main
+from check_netscaler.client import (
+    Deadline,
+    NITROClient,
+    NITRODeadlineError,
+    NITROTimeoutError,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_client(deadline):
+    """Create a client that is already logged in"""
+    client = NITROClient(
+        hostname="192.168.1.1", username="nsroot", password="nsroot", deadline=deadline
+    )
+    client.session.is_logged_in = True
+    return client
+
+
+class TestDeadline:
+    """Test the time budget itself"""
+
+    def test_timeout_is_capped_to_remaining(self):
+        """Test requests get the per-request timeout or the rest of the budget"""
+        clock = FakeClock()
+        deadline = Deadline(20, clock=clock)
+
+        assert deadline.timeout("login", 15) == 15
+        clock.now += 12
+        assert deadline.timeout("stat/lbvserver", 15) == pytest.approx(8)
+
+    def test_exhausted_budget_names_phase(self):
+        """Test the error says which phase ran out of time"""
+        clock = FakeClock()
+        deadline = Deadline(10, clock=clock)
+        clock.now += 10
+
+        with pytest.raises(NITRODeadlineError, match="deadline of 10s exceeded during login") as e:
+            deadline.timeout("login", 15)
+        assert e.value.phase == "login"
+        assert isinstance(e.value, NITROTimeoutError)
+
+
+class TestClientDeadline:
+    """Test the session and client draw down the budget"""
+
+    @patch("requests.Session.get")
+    def test_get_uses_remaining_budget(self, mock_get):
+        """Test GETs are sent with the time left"""
+        clock = FakeClock()
+        client = make_client(Deadline(20, clock=clock))
+        clock.now += 15
+        mock_get.return_value = Mock(status_code=200, content=b'{"errorcode": 0}')
+
+        client.get_stat("lbvserver")
+
+        assert mock_get.call_args.kwargs["timeout"] == pytest.approx(5)
+
+    @patch("requests.Session.get")
+    def test_no_request_after_deadline(self, mock_get):
+        """Test nothing is sent once the budget is used up"""
+        clock = FakeClock()
+        client = make_client(Deadline(5, clock=clock))
+        clock.now += 6
+
+        with pytest.raises(NITRODeadlineError, match="during stat/lbvserver"):
+            client.get_stat("lbvserver")
+        mock_get.assert_not_called()
+
+    @patch("requests.Session.get", side_effect=requests.exceptions.Timeout("read timeout"))
+    def test_capped_timeout_becomes_deadline_error(self, mock_get):
+        """Test a request timing out on the capped timeout reports the deadline"""
+        clock = FakeClock()
+        client = make_client(Deadline(20, clock=clock))
+        clock.now += 18
+
+        with pytest.raises(NITRODeadlineError, match="during config/nsconfig"):
+            client.get_config("nsconfig")
+
+    @patch("requests.Session.get", side_effect=requests.exceptions.Timeout("read timeout"))
+    def test_plain_timeout_unchanged(self, mock_get):
+        """Test timeouts within the per-request limit stay plain timeouts"""
+        client = make_client(Deadline(60))
+
+        with pytest.raises(NITROTimeoutError) as e:
+            client.get_config("nsconfig")
+        assert not isinstance(e.value, NITRODeadlineError)
+
+    @patch("requests.Session.post", side_effect=requests.exceptions.Timeout("read timeout"))
+    def test_cli_reports_phase(self, mock_post, capsys):
+        """Test the plugin ends with a clean UNKNOWN naming the phase"""
+        status = main(["-H", "192.168.1.1", "-C", "state", "--deadline", "2"])
+
+        assert status == 3
+        assert capsys.readouterr().out.strip() == (
+            "UNKNOWN - Check deadline of 2s exceeded during login"
+        )
+        assert mock_post.call_args.kwargs["timeout"] <= 2
@@ -0,0 +1,225 @@
+"""
+Tests for the shared DNS cache and connections to pinned addresses
+"""
+
+import http.server
+import json
+import os
+import shutil
+import socket
+import ssl
+import stat
+import subprocess
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from check_netscaler.client import DNSCache, NITROClient
+from check_netscaler.client.dns_cache import is_address
+from check_netscaler.client.transport import create_transport
+
+
+def make_resolver(address="10.0.0.5"):
+    """Create a getaddrinfo() stand-in returning a single address"""
+    return Mock(return_value=[(socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, 443))])
+
+
+class FakeClock:
+    """Manually advanced wall clock"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestDNSCache:
+    """Test pinning, expiry and resolver failures"""
+
+    def test_resolves_and_pins(self, tmp_path):
+        """Test a resolved address is stored and shared with other processes"""
+        resolver = make_resolver()
+        cache = DNSCache(str(tmp_path), ttl=300, resolver=resolver)
+
+        assert cache.resolve("ns.example.com", 443) == "10.0.0.5"
+        # A new instance (another invocation) reads the state file
+        other = DNSCache(str(tmp_path), ttl=300, resolver=resolver)
+        assert other.resolve("ns.example.com", 443) == "10.0.0.5"
+        resolver.assert_called_once_with("ns.example.com", 443, type=socket.SOCK_STREAM)
+
+    def test_lookup_once_per_process(self, tmp_path):
+        """Test repeated lookups in one process do not read the state file again"""
+        cache = DNSCache(str(tmp_path), resolver=make_resolver())
+        cache.resolve("ns.example.com", 443)
+        for name in os.listdir(tmp_path):
+            os.remove(tmp_path / name)
+
+        assert cache.resolve("ns.example.com", 443) == "10.0.0.5"
+
+    def test_expired_entry_is_resolved_again(self, tmp_path):
+        """Test an address older than the TTL is looked up again"""
+        clock = FakeClock()
+        DNSCache(str(tmp_path), ttl=60, clock=clock, resolver=make_resolver()).resolve(
+            "ns.example.com", 443
+        )
+
+        clock.now += 61
+        resolver = make_resolver("10.0.0.6")
+        cache = DNSCache(str(tmp_path), ttl=60, clock=clock, resolver=resolver)
+
+        assert cache.resolve("ns.example.com", 443) == "10.0.0.6"
+        resolver.assert_called_once()
+
+    def test_expired_entry_used_while_resolver_fails(self, tmp_path):
+        """Test an expired address is used if the resolver fails"""
+        clock = FakeClock()
+        DNSCache(str(tmp_path), ttl=60, clock=clock, resolver=make_resolver()).resolve(
+            "ns.example.com", 443
+        )
+
+        clock.now += 3600
+        resolver = Mock(side_effect=socket.gaierror("Temporary failure in name resolution"))
+        cache = DNSCache(str(tmp_path), ttl=60, clock=clock, resolver=resolver)
+
+        assert cache.resolve("ns.example.com", 443) == "10.0.0.5"
+
+    def test_resolver_failure_without_entry(self, tmp_path):
+        """Test nothing is pinned if the resolver fails and nothing is cached"""
+        resolver = Mock(side_effect=socket.gaierror("Name or service not known"))
+        cache = DNSCache(str(tmp_path), resolver=resolver)
+
+        assert cache.resolve("ns.example.com", 443) is None
+        assert os.listdir(tmp_path) == []
+
+    def test_addresses_are_not_resolved(self, tmp_path):
+        """Test IP address literals are connected to as they are"""
+        resolver = make_resolver()
+        cache = DNSCache(str(tmp_path), resolver=resolver)
+
+        assert cache.resolve("192.168.1.10", 443) is None
+        assert cache.resolve("[2001:db8::1]", 443) is None
+        resolver.assert_not_called()
+        assert is_address("2001:db8::1")
+        assert not is_address("ns.example.com")
+
+    def test_keyed_by_host_and_port(self, tmp_path):
+        """Test entries of different hosts and ports are kept apart"""
+        cache = DNSCache(str(tmp_path), resolver=make_resolver())
+        cache.resolve("ns1.example.com", 443)
+        cache.resolve("ns2.example.com", 443)
+        cache.resolve("ns1.example.com", 8443)
+
+        assert len(os.listdir(tmp_path)) == 3
+
+    def test_state_file_private(self, tmp_path):
+        """Test the state file does not name the host and is owner-only"""
+        cache = DNSCache(str(tmp_path / "cache"), resolver=make_resolver())
+        cache.resolve("ns.example.com", 443)
+
+        (name,) = os.listdir(tmp_path / "cache")
+        assert "example" not in name
+        path = tmp_path / "cache" / name
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        assert json.loads(path.read_text())["address"] == "10.0.0.5"
+
+
+@pytest.fixture
+def pinned_tls_server(tmp_path, monkeypatch):
+    """HTTPS server for appliance.test on 127.0.0.1, trusted by both transports"""
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl is required to create a test certificate")
+    cert, key = tmp_path / "cert.pem", tmp_path / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1"]
+        + ["-subj", "/CN=appliance.test", "-addext", "subjectAltName=DNS:appliance.test"]
+        + ["-keyout", str(key), "-out", str(cert)],
+        check=True,
+        capture_output=True,
+    )
+    monkeypatch.setenv("SSL_CERT_FILE", str(cert))
+    monkeypatch.setenv("REQUESTS_CA_BUNDLE", str(cert))
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = json.dumps({"errorcode": 0, "host": self.headers["Host"]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(str(cert), str(key))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+class TestPinnedConnections:
+    """Test the transports connect to pinned addresses"""
+
+    @pytest.mark.parametrize("transport_name", ["requests", "stdlib"])
+    def test_tls_verified_against_hostname(self, tmp_path, pinned_tls_server, transport_name):
+        """Test the pinned address is used while TLS and Host keep the hostname"""
+        port = pinned_tls_server
+        transport = create_transport(transport_name, verify_ssl=True)
+        transport.dns_cache = DNSCache(str(tmp_path), resolver=make_resolver("127.0.0.1"))
+
+        response = transport.get(f"https://appliance.test:{port}/nitro/v1/config/ns", timeout=5)
+        transport.close()
+
+        assert response.json() == {"errorcode": 0, "host": f"appliance.test:{port}"}
+        assert [host for host, _ in transport.stats.resolves] == ["appliance.test"]
+        assert "nitro_resolve_ms" in transport.stats.metrics()
+
+    @pytest.mark.parametrize("transport_name", ["requests", "stdlib"])
+    def test_client_against_mock_server(self, tmp_path, mock_nitro_server, transport_name):
+        """Test a client resolves the hostname once through the DNS cache"""
+        resolver = make_resolver(mock_nitro_server.host)
+        with NITROClient(
+            hostname="appliance.test",
+            port=mock_nitro_server.port,
+            username="nsroot",
+            password="nsroot",
+            ssl=False,
+            transport=transport_name,
+            dns_cache=DNSCache(str(tmp_path), resolver=resolver),
+        ) as client:
+            assert "lbvserver" in client.get_stat("lbvserver")
+
+        resolver.assert_called_once_with(
+            "appliance.test", mock_nitro_server.port, type=socket.SOCK_STREAM
+        )
+
+    def test_without_cache_nothing_is_pinned(self):
+        """Test no lookups are recorded without a DNS cache"""
+        transport = create_transport("stdlib")
+        assert transport._pinned_address("appliance.test", 443) is None
+        assert transport.stats.resolves == []
+
+    def test_requests_pools_untouched_without_cache(self, tmp_path):
+        """Test the requests transport only swaps urllib3 pools while a cache is attached"""
+        from urllib3.poolmanager import pool_classes_by_scheme
+
+        transport = create_transport("requests")
+        poolmanager = transport.session.get_adapter("https://appliance.test").poolmanager
+        assert poolmanager.pool_classes_by_scheme is pool_classes_by_scheme
+
+        transport.dns_cache = DNSCache(str(tmp_path), resolver=make_resolver())
+        pinned = poolmanager.pool_classes_by_scheme["https"]
+        assert pinned is not pool_classes_by_scheme["https"]
+        assert pinned.__name__ == "HTTPSConnectionPool"
+
+        transport.dns_cache = None
+        assert poolmanager.pool_classes_by_scheme is pool_classes_by_scheme
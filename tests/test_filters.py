@@ -0,0 +1,54 @@
+"""
+Tests for the --limit to NITRO filter translation
+"""
+
+import pytest
+
+from check_netscaler.utils.filters import build_filter, filter_value, nitro_filter
+
+
+class TestNITROFilter:
+    """Test nitro_filter()"""
+
+    def test_anchored_literal_is_exact_match(self):
+        """Test a fully anchored literal becomes an exact filter"""
+        assert nitro_filter("^lb_web-01$") == "filter=name:lb_web-01"
+
+    def test_prefix_is_regex_match(self):
+        """Test a prefix pattern becomes a regex filter"""
+        assert nitro_filter("^tenant1_") == "filter=name:/%5Etenant1_/"
+
+    def test_literal_is_regex_match(self):
+        """Test an unanchored literal becomes a regex filter"""
+        assert nitro_filter("web") == "filter=name:/web/"
+
+    def test_dot_keeps_regex_semantics(self):
+        """Test a pattern with '.' is not turned into an exact match"""
+        assert nitro_filter("^www.example$") == "filter=name:/%5Ewww.example%24/"
+
+    def test_custom_field(self):
+        """Test the filter can apply to another attribute"""
+        assert nitro_filter("^prod-", field="certkey") == "filter=certkey:/%5Eprod-/"
+
+    @pytest.mark.parametrize(
+        "pattern", [None, "", "prod_.*", "web|ssl", "[invalid", "a,b", "name:x", "a b"]
+    )
+    def test_complex_patterns_are_not_translated(self, pattern):
+        """Test patterns that cannot be expressed safely stay client-side"""
+        assert nitro_filter(pattern) is None
+
+
+class TestBuildFilter:
+    """Test filter_value() and build_filter()"""
+
+    def test_filter_value(self):
+        """Test --limit patterns translate to exact or regex filter values"""
+        assert filter_value("^lb_web$") == "lb_web"
+        assert filter_value("^tenant1_") == "/^tenant1_/"
+        assert filter_value("web|ssl") is None
+
+    def test_conditions_are_joined(self):
+        """Test several conditions are combined in one filter option"""
+        option = build_filter({"name": "/^web_/", "state": "OUT OF SERVICE"})
+
+        assert option == "filter=name:/%5Eweb_/,state:OUT%20OF%20SERVICE"
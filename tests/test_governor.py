@@ -0,0 +1,113 @@
+"""
+Tests for the per-appliance concurrency governor
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from check_netscaler.cli import main
+from check_netscaler.client import (
+    ConcurrencyGovernor,
+    Deadline,
+    NITROClient,
+    NITRODeadlineError,
+    NITROTimeoutError,
+)
+
+HOST = "192.168.1.1:443"
+
+
+class TestConcurrencyGovernor:
+    """Test slot accounting"""
+
+    def test_slots_are_limited(self, tmp_path):
+        """Test no more than N slots can be held at once"""
+        governor = ConcurrencyGovernor(str(tmp_path), slots=2)
+        first = governor.acquire(HOST, 1)
+        second = governor.acquire(HOST, 1)
+
+        with pytest.raises(NITROTimeoutError, match="No free request slot"):
+            governor.acquire(HOST, 0.1)
+
+        governor.release(first)
+        governor.release(governor.acquire(HOST, 1))
+        governor.release(second)
+
+    def test_slots_are_per_host(self, tmp_path):
+        """Test a busy appliance does not hold up requests to others"""
+        governor = ConcurrencyGovernor(str(tmp_path), slots=1)
+        handle = governor.acquire(HOST, 1)
+
+        governor.release(governor.acquire("192.168.1.2:443", 0.1))
+        governor.release(handle)
+
+    def test_shared_between_governors(self, tmp_path):
+        """Test separate governors (as in separate processes) share the slots"""
+        handle = ConcurrencyGovernor(str(tmp_path), slots=1).acquire(HOST, 1)
+
+        with pytest.raises(NITROTimeoutError):
+            ConcurrencyGovernor(str(tmp_path), slots=1).acquire(HOST, 0.1)
+        ConcurrencyGovernor.release(handle)
+
+    def test_waits_for_free_slot(self, tmp_path):
+        """Test a queued request gets the slot once it is released and the wait is counted"""
+        governor = ConcurrencyGovernor(str(tmp_path), slots=1)
+        handle = governor.acquire(HOST, 1)
+        timer = threading.Timer(0.2, governor.release, args=(handle,))
+        timer.start()
+
+        governor.release(governor.acquire(HOST, 5))
+        timer.join()
+
+        assert 0.15 < governor.wait_time < 2
+
+
+class TestClientGovernor:
+    """Test requests are sent inside a slot"""
+
+    @patch("requests.Session.get")
+    def test_queueing_bounded_by_deadline(self, mock_get, tmp_path):
+        """Test a request that cannot get a slot before the deadline fails with its phase"""
+        governor = ConcurrencyGovernor(str(tmp_path), slots=1)
+        client = NITROClient(
+            hostname="192.168.1.1",
+            username="nsroot",
+            password="nsroot",
+            governor=governor,
+            deadline=Deadline(0.3),
+        )
+        client.session.is_logged_in = True
+        handle = governor.acquire(HOST, 1)
+
+        with pytest.raises(NITRODeadlineError, match="during stat/lbvserver"):
+            client.get_stat("lbvserver")
+        mock_get.assert_not_called()
+        governor.release(handle)
+
+    @patch("requests.Session.get")
+    def test_slot_released_after_request(self, mock_get, tmp_path):
+        """Test the slot is free again once the response arrived"""
+        governor = ConcurrencyGovernor(str(tmp_path), slots=1)
+        client = NITROClient(
+            hostname="192.168.1.1", username="nsroot", password="nsroot", governor=governor
+        )
+        client.session.is_logged_in = True
+        mock_get.return_value = Mock(status_code=200, content=b'{"errorcode": 0}')
+
+        start = time.monotonic()
+        client.get_stat("lbvserver")
+        client.get_stat("lbvserver")
+        assert time.monotonic() - start < 1
+
+    def test_wait_time_in_perfdata(self, mock_nitro_server, tmp_path, capsys):
+        """Test the time spent waiting for slots is reported as perfdata"""
+        main(
+            ["-H", mock_nitro_server.host, "--no-ssl", "-P", str(mock_nitro_server.port)]
+            + ["-u", "nsroot", "-p", "nsroot", "-C", "state", "-o", "lbvserver"]
+            + ["--max-concurrent", "2", "--cache-dir", str(tmp_path)]
+        )
+
+        assert "'nitro_slot_wait'=0.0" in capsys.readouterr().out
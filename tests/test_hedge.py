@@ -0,0 +1,147 @@
+"""
+Tests for hedged requests across several hosts
+"""
+
+import socket
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from check_netscaler.cli import main
+from check_netscaler.client import NITROAPIError, NITROClient, NITROConnectionError
+from check_netscaler.client.hedge import hedged_call
+
+
+class TestHedgedCall:
+    """Test the hedging helper"""
+
+    def test_fast_first_call_wins_alone(self):
+        """Test no hedge is sent when the first host answers in time"""
+        second = Mock(return_value="second")
+        assert hedged_call([lambda: "first", second], delay=5) == (0, "first")
+        second.assert_not_called()
+
+    def test_slow_first_call_is_hedged(self):
+        """Test the next host is asked after the delay and its answer wins"""
+        release = threading.Event()
+        discarded = []
+
+        def slow():
+            release.wait(5)
+            return "late"
+
+        start = time.monotonic()
+        assert hedged_call([slow, lambda: "second"], 0.1, discarded.append) == (1, "second")
+        assert time.monotonic() - start < 2
+
+        release.set()
+        for _ in range(50):
+            if discarded:
+                break
+            time.sleep(0.02)
+        assert discarded == ["late"]
+
+    def test_connection_error_fails_over_at_once(self):
+        """Test a connection failure starts the next host without waiting"""
+
+        def refused():
+            raise NITROConnectionError("refused")
+
+        start = time.monotonic()
+        assert hedged_call([refused, lambda: "second"], delay=10) == (1, "second")
+        assert time.monotonic() - start < 2
+
+    def test_api_error_is_final(self):
+        """Test an error answered by the appliance is not hedged"""
+        second = Mock(return_value="second")
+
+        def not_found():
+            raise NITROAPIError("not found", error_code=404)
+
+        with pytest.raises(NITROAPIError):
+            hedged_call([not_found, second], delay=10)
+        second.assert_not_called()
+
+    def test_all_failed(self):
+        """Test the last error is raised when no host answers"""
+
+        def refused(name):
+            def call():
+                raise NITROConnectionError(name)
+
+            return call
+
+        with pytest.raises(NITROConnectionError, match="second"):
+            hedged_call([refused("first"), refused("second")], delay=10)
+
+
+@pytest.fixture
+def stalled_host(mock_nitro_server):
+    """Address on the mock server's port that accepts connections but never answers"""
+    sock = socket.socket()
+    sock.bind(("127.0.0.3", mock_nitro_server.port))
+    sock.listen(8)
+    yield "127.0.0.3"
+    sock.close()
+
+
+class TestClientHedging:
+    """Test hedged requests against the mock server"""
+
+    def make_client(self, server, primary, **kwargs):
+        return NITROClient(
+            hostname=primary,
+            port=server.port,
+            username="nsroot",
+            password="nsroot",
+            ssl=False,
+            hedge_hosts=[server.host],
+            **kwargs,
+        )
+
+    def test_unreachable_primary(self, mock_nitro_server):
+        """Test a refused primary fails over to the other node"""
+        with self.make_client(mock_nitro_server, "127.0.0.2") as client:
+            data = client.get_stat("lbvserver")
+
+        assert len(data["lbvserver"]) == 3
+        assert client.answered_by == [mock_nitro_server.host]
+
+    def test_stalled_primary(self, mock_nitro_server, stalled_host):
+        """Test a hanging primary is hedged after the delay instead of timing out"""
+        start = time.monotonic()
+        with self.make_client(
+            mock_nitro_server, stalled_host, hedge_delay=0.2, timeout=10
+        ) as client:
+            data = client.get_stat("lbvserver")
+
+        assert len(data["lbvserver"]) == 3
+        assert client.answered_by == [mock_nitro_server.host]
+        assert time.monotonic() - start < 5
+
+    def test_primary_answers(self, mock_nitro_server):
+        """Test the other node is not contacted while the primary is healthy"""
+        with NITROClient(
+            hostname=mock_nitro_server.host,
+            port=mock_nitro_server.port,
+            username="nsroot",
+            password="nsroot",
+            ssl=False,
+            hedge_hosts=["127.0.0.2"],
+        ) as client:
+            client.get_stat("lbvserver")
+            assert not client.sessions[1].is_logged_in
+
+        assert client.answered_by == [mock_nitro_server.host]
+
+    def test_cli_names_answering_host(self, mock_nitro_server, capsys):
+        """Test the output says which node answered"""
+        main(
+            ["-H", "127.0.0.2", "--hedge-host", mock_nitro_server.host, "--no-ssl"]
+            + ["-P", str(mock_nitro_server.port), "-u", "nsroot", "-p", "nsroot"]
+            + ["-C", "state", "-o", "lbvserver"]
+        )
+
+        assert f"(via {mock_nitro_server.host})" in capsys.readouterr().out
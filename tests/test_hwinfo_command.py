@@ -3,8 +3,10 @@ Tests for hwinfo command
 """
 
 from argparse import Namespace
+from functools import partial
 from unittest.mock import Mock
 
+from check_netscaler.client import NITROClient
 from check_netscaler.commands.hwinfo import HWInfoCommand
 from check_netscaler.constants import STATE_OK, STATE_UNKNOWN
 
@@ -16,6 +18,7 @@ class TestHWInfoCommand:
         """Create a mock NITRO client"""
         client = Mock()
         client.get_config = Mock()
+        client.get_many.side_effect = partial(NITROClient.get_many, client)
         return client
 
     def create_args(self):
@@ -30,7 +33,7 @@ class TestHWInfoCommand:
         client = self.create_mock_client()
 
         # Mock responses for both API calls
-        def mock_get_config(objecttype):
+        def mock_get_config(objecttype, objectname=None, url_options=None):
             if objecttype == "nshardware":
                 return {
                     "nshardware": {
@@ -67,7 +70,7 @@ class TestHWInfoCommand:
         """Test when hardware is returned as a list"""
         client = self.create_mock_client()
 
-        def mock_get_config(objecttype):
+        def mock_get_config(objecttype, objectname=None, url_options=None):
             if objecttype == "nshardware":
                 return {
                     "nshardware": [
@@ -98,7 +101,7 @@ class TestHWInfoCommand:
         """Test with minimal hardware information"""
         client = self.create_mock_client()
 
-        def mock_get_config(objecttype):
+        def mock_get_config(objecttype, objectname=None, url_options=None):
             if objecttype == "nshardware":
                 return {
                     "nshardware": {
@@ -138,7 +141,7 @@ class TestHWInfoCommand:
         """Test when nsversion is not in API response"""
         client = self.create_mock_client()
 
-        def mock_get_config(objecttype):
+        def mock_get_config(objecttype, objectname=None, url_options=None):
             if objecttype == "nshardware":
                 return {
                     "nshardware": {
@@ -161,7 +164,7 @@ class TestHWInfoCommand:
         """Test when nshardware list is empty"""
         client = self.create_mock_client()
 
-        def mock_get_config(objecttype):
+        def mock_get_config(objecttype, objectname=None, url_options=None):
             if objecttype == "nshardware":
                 return {"nshardware": []}
             elif objecttype == "nsversion":
@@ -181,7 +184,7 @@ class TestHWInfoCommand:
         """Test when nsversion list is empty"""
         client = self.create_mock_client()
 
-        def mock_get_config(objecttype):
+        def mock_get_config(objecttype, objectname=None, url_options=None):
             if objecttype == "nshardware":
                 return {"nshardware": {"hwdescription": "NetScaler VPX"}}
             elif objecttype == "nsversion":
@@ -226,7 +229,7 @@ class TestHWInfoCommand:
         """Test that output uses semicolon separator"""
         client = self.create_mock_client()
 
-        def mock_get_config(objecttype):
+        def mock_get_config(objecttype, objectname=None, url_options=None):
             if objecttype == "nshardware":
                 return {
                     "nshardware": {
@@ -691,3 +691,41 @@ class TestInterfacesCommand:
 
         # Should not crash, just skip the linkstate check
         assert result.status == STATE_OK
+
+    def test_declared_attrs_cover_read_fields(self):
+        """Test attrs= requests every interface field the command reads"""
+
+        class RecordingDict(dict):
+            """Dictionary remembering which keys were looked up"""
+
+            read = set()
+
+            def get(self, key, default=None):
+                self.read.add(key)
+                return super().get(key, default)
+
+            def __getitem__(self, key):
+                self.read.add(key)
+                return super().__getitem__(key)
+
+            def __contains__(self, key):
+                self.read.add(key)
+                return super().__contains__(key)
+
+        interface = RecordingDict(
+            devicename="0/1",
+            linkstate="1",
+            intfstate="1",
+            state="ENABLED",
+            rxbytes="1",
+            txbytes="2",
+            rxerrors="0",
+            txerrors="0",
+        )
+        client = self.create_mock_client()
+        client.get_config.return_value = {"interface": [interface]}
+
+        result = InterfacesCommand(client, self.create_args()).execute()
+
+        assert result.perfdata["0/1.rxbytes"] == 1.0
+        assert RecordingDict.read <= set(InterfacesCommand.CONFIG_ATTRS["interface"])
@@ -0,0 +1,42 @@
+"""
+Tests for the JSON decoding backend selection
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from check_netscaler.client import jsonbackend
+
+
+class TestJSONBackend:
+    """Test jsonbackend.loads() and backend selection"""
+
+    def test_loads_bytes_and_text(self):
+        """Test documents are decoded from bytes and from text"""
+        assert jsonbackend.loads(b'{"lbvserver": [{"name": "vs1"}]}') == {
+            "lbvserver": [{"name": "vs1"}]
+        }
+        assert jsonbackend.loads('{"errorcode": 0}') == {"errorcode": 0}
+
+    def test_invalid_json_raises_value_error(self):
+        """Test decode errors are ValueErrors with either backend"""
+        with pytest.raises(ValueError):
+            jsonbackend.loads(b'{"lbvserver": [')
+
+    def test_uses_orjson_when_installed(self):
+        """Test orjson is selected when it can be imported"""
+        pytest.importorskip("orjson")
+        assert jsonbackend.BACKEND == "orjson"
+
+    def test_falls_back_to_stdlib(self):
+        """Test the stdlib json module is used when orjson is not available"""
+        code = (
+            "import sys\n"
+            "sys.modules['orjson'] = None\n"
+            "from check_netscaler.client import jsonbackend\n"
+            "print(jsonbackend.BACKEND, jsonbackend.loads(b'[1, 2]'))\n"
+        )
+        output = subprocess.check_output([sys.executable, "-c", code], text=True)
+        assert output.strip() == "json [1, 2]"
@@ -0,0 +1,88 @@
+"""
+Tests for incremental JSON decoding
+"""
+
+import json
+
+import pytest
+
+from check_netscaler.client.jsonstream import iter_array_items
+
+
+def chunked(data, size):
+    """Split bytes into chunks of the given size"""
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestIterArrayItems:
+    """Test iter_array_items()"""
+
+    RESPONSE = {
+        "errorcode": 0,
+        "message": "Done",
+        "severity": "NONE",
+        "lbvserver": [
+            {"name": f"vs{i}", "state": "UP", "health": 100.0, "comment": "größe, [x]"}
+            for i in range(20)
+        ],
+    }
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 5, 64, 1 << 20])
+    def test_items_across_chunk_boundaries(self, chunk_size):
+        """Test items are decoded regardless of where chunks are split"""
+        body = json.dumps(self.RESPONSE, ensure_ascii=False, indent=1).encode("utf-8")
+        fields = {}
+
+        items = list(iter_array_items(chunked(body, chunk_size), "lbvserver", fields))
+
+        assert items == self.RESPONSE["lbvserver"]
+        assert fields == {"errorcode": 0, "message": "Done", "severity": "NONE"}
+
+    def test_items_are_yielded_incrementally(self):
+        """Test the first item is available before the whole body is read"""
+        body = json.dumps(self.RESPONSE).encode("utf-8")
+        consumed = []
+
+        def chunks():
+            for chunk in chunked(body, 16):
+                consumed.append(chunk)
+                yield chunk
+
+        first = next(iter_array_items(chunks(), "lbvserver"))
+
+        assert first["name"] == "vs0"
+        assert sum(len(chunk) for chunk in consumed) < len(body) / 4
+
+    def test_single_object(self):
+        """Test a single object under the key is yielded as the only item"""
+        body = b'{"errorcode": 0, "nsconfig": {"configchanged": false}}'
+
+        assert list(iter_array_items([body], "nsconfig")) == [{"configchanged": False}]
+
+    def test_single_object_reported_in_fields(self):
+        """Test a single object under the key is also stored in fields"""
+        body = b'{"errorcode": 0, "system": {"numcpus": 4}}'
+        fields = {}
+
+        assert list(iter_array_items([body], "system", fields)) == [{"numcpus": 4}]
+        assert fields == {"errorcode": 0, "system": {"numcpus": 4}}
+
+    def test_missing_key_and_empty_array(self):
+        """Test a missing key or an empty array yields nothing"""
+        assert list(iter_array_items([b'{"errorcode": 0}'], "service")) == []
+        assert list(iter_array_items([b'{"service": []}'], "service")) == []
+        assert list(iter_array_items([b"{}"], "service")) == []
+
+    def test_numbers_split_across_chunks(self):
+        """Test a number at a chunk boundary is not cut short"""
+        items = list(iter_array_items([b'{"errorcode": 12', b'34, "x": [1', b"5]}"], "x", {}))
+
+        assert items == [15]
+
+    @pytest.mark.parametrize(
+        "body", [b'{"lbvserver": [{"name": "vs1"},', b"[1, 2]", b'{"lbvserver": [{"name" 1}]}']
+    )
+    def test_invalid_json(self, body):
+        """Test truncated or invalid bodies raise ValueError"""
+        with pytest.raises(ValueError):
+            list(iter_array_items([body], "lbvserver"))
@@ -0,0 +1,127 @@
+"""
+Tests for adaptive timeouts
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from check_netscaler.client import LatencyTracker, NITROClient, NITROTimeoutError
+
+HOST = "192.168.1.1:443"
+
+
+def seed(tracker, phase, samples):
+    for sample in samples:
+        tracker.record(HOST, phase, sample)
+
+
+class TestLatencyTracker:
+    """Test percentile and timeout derivation"""
+
+    def test_configured_timeout_without_samples(self, tmp_path):
+        """Test the configured timeout is used until enough samples exist"""
+        tracker = LatencyTracker(str(tmp_path), factor=3)
+        seed(tracker, "stat/lbvserver", [0.1] * (LatencyTracker.MIN_SAMPLES - 1))
+
+        assert tracker.timeout(HOST, "stat/lbvserver", 15) == 15
+
+    def test_p99_times_factor(self, tmp_path):
+        """Test the timeout is the p99 latency times the factor"""
+        tracker = LatencyTracker(str(tmp_path), factor=3, min_timeout=0.5)
+        seed(tracker, "stat/lbvserver", [0.1 * n for n in range(1, 11)])
+
+        assert tracker.percentile(HOST, "stat/lbvserver") == pytest.approx(1.0)
+        assert tracker.timeout(HOST, "stat/lbvserver", 15) == pytest.approx(3.0)
+
+    def test_timeout_is_clamped(self, tmp_path):
+        """Test derived timeouts stay between the minimum and the configured timeout"""
+        tracker = LatencyTracker(str(tmp_path), factor=3, min_timeout=2)
+        seed(tracker, "login", [0.05] * 10)
+        seed(tracker, "config/ntpstatus", [8.0] * 10)
+
+        assert tracker.timeout(HOST, "login", 15) == 2
+        assert tracker.timeout(HOST, "config/ntpstatus", 15) == 15
+
+    def test_per_host_and_endpoint(self, tmp_path):
+        """Test samples of one endpoint or host do not affect others"""
+        tracker = LatencyTracker(str(tmp_path), factor=3, min_timeout=0.5)
+        seed(tracker, "stat/lbvserver", [1.0] * 10)
+
+        assert tracker.timeout(HOST, "config/nsconfig", 15) == 15
+        assert tracker.timeout("192.168.1.2:443", "stat/lbvserver", 15) == 15
+
+    def test_samples_persist_across_invocations(self, tmp_path):
+        """Test saved samples are used by the next process and merged with concurrent ones"""
+        first = LatencyTracker(str(tmp_path), factor=2, min_timeout=0.1)
+        second = LatencyTracker(str(tmp_path), factor=2, min_timeout=0.1)
+        seed(first, "stat/lbvserver", [0.5] * 3)
+        seed(second, "stat/lbvserver", [1.0] * 3)
+        first.save()
+        second.save()
+
+        later = LatencyTracker(str(tmp_path), factor=2, min_timeout=0.1)
+        assert later.percentile(HOST, "stat/lbvserver") == 1.0
+        assert later.timeout(HOST, "stat/lbvserver", 15) == 2.0
+
+    def test_window_is_bounded(self, tmp_path):
+        """Test only the most recent samples are kept"""
+        tracker = LatencyTracker(str(tmp_path), factor=2, min_timeout=0.1)
+        seed(tracker, "stat/lbvserver", [5.0] * 10 + [0.2] * LatencyTracker.WINDOW)
+        tracker.save()
+
+        assert LatencyTracker(str(tmp_path), factor=2).percentile(HOST, "stat/lbvserver") == 0.2
+
+
+class TestClientAdaptiveTimeout:
+    """Test the session applies and records adaptive timeouts"""
+
+    def make_client(self, tracker):
+        client = NITROClient(
+            hostname="192.168.1.1", username="nsroot", password="nsroot", latency_tracker=tracker
+        )
+        client.session.is_logged_in = True
+        return client
+
+    @patch("requests.Session.get")
+    def test_request_uses_adaptive_timeout(self, mock_get, tmp_path):
+        """Test GETs are sent with the derived timeout and their latency is recorded"""
+        tracker = LatencyTracker(str(tmp_path), factor=4, min_timeout=0.5)
+        seed(tracker, "stat/lbvserver", [0.25] * 10)
+        mock_get.return_value = Mock(status_code=200, content=b'{"errorcode": 0}')
+
+        client = self.make_client(tracker)
+        client.get_stat("lbvserver")
+
+        assert mock_get.call_args.kwargs["timeout"] == 1.0
+        assert len(tracker._samples[HOST]["stat/lbvserver"]) == 11
+
+    @patch("requests.Session.get", side_effect=requests.exceptions.Timeout("slow"))
+    def test_timeout_recorded_as_sample(self, mock_get, tmp_path):
+        """Test a timed out request raises the next timeout"""
+        tracker = LatencyTracker(str(tmp_path), factor=4, min_timeout=0.5)
+        seed(tracker, "stat/lbvserver", [0.25] * 10)
+
+        client = self.make_client(tracker)
+        with pytest.raises(NITROTimeoutError):
+            client.get_stat("lbvserver")
+
+        assert tracker.timeout(HOST, "stat/lbvserver", 15) == 4.0
+
+    def test_samples_saved_on_exit(self, mock_nitro_server, tmp_path):
+        """Test the latencies of a check are stored when the client is closed"""
+        tracker = LatencyTracker(str(tmp_path), factor=3)
+        with NITROClient(
+            hostname=mock_nitro_server.host,
+            port=mock_nitro_server.port,
+            username="nsroot",
+            password="nsroot",
+            ssl=False,
+            latency_tracker=tracker,
+        ) as client:
+            client.get_stat("lbvserver")
+
+        host = f"{mock_nitro_server.host}:{mock_nitro_server.port}"
+        stored = LatencyTracker(str(tmp_path), factor=3)._load(host)
+        assert set(stored) == {"login", "stat/lbvserver", "logout"}
@@ -608,3 +608,40 @@ class TestMatchesCommand:
 
         # Should return OK - no objects match limit, so nothing checked
         assert result.status == STATE_OK
+
+    def test_paged_collection(self):
+        """Test objects are consumed from the paged iterator with --pagesize"""
+        client = self.create_mock_client()
+        client.get_resource.return_value = iter(
+            [
+                {"name": "vs1", "state": "UP"},
+                {"name": "vs2", "state": "DOWN"},
+            ]
+        )
+
+        args = self.create_args(
+            objecttype="lbvserver",
+            objectname="state",
+            warning="OUT OF SERVICE",
+            critical="DOWN",
+            pagesize=100,
+        )
+        result = MatchesCommand(client, args).execute()
+
+        assert result.status == STATE_CRITICAL
+        client.get_resource.assert_called_once_with("lbvserver", "stat", 100, stream=False)
+        client.get_stat.assert_not_called()
+
+    def test_paged_singleton_resource(self):
+        """Test a single object is checked as such with --pagesize"""
+        client = self.create_mock_client()
+        client.get_resource.return_value = {"numcpus": "4"}
+
+        args = self.create_args(
+            objecttype="system", objectname="numcpus", warning="8", critical="4", pagesize=100
+        )
+        result = MatchesCommand(client, args).execute()
+
+        assert result.status == STATE_CRITICAL
+        assert "system.numcpus" in result.message
+        assert "[0]" not in result.message
@@ -3,8 +3,10 @@ Tests for ntp command
 """
 
 from argparse import Namespace
+from functools import partial
 from unittest.mock import Mock
 
+from check_netscaler.client import NITROClient
 from check_netscaler.commands.ntp import NTPCommand
 from check_netscaler.constants import STATE_CRITICAL, STATE_OK, STATE_UNKNOWN, STATE_WARNING
 
@@ -16,8 +18,14 @@ class TestNTPCommand:
         """Create a mock NITRO client"""
         client = Mock()
         client.get_config = Mock()
+        client.get_many.side_effect = partial(NITROClient.get_many, client)
         return client
 
+    def set_responses(self, client, sync_data, status_data):
+        """Serve ntpsync and ntpstatus responses by resource type"""
+        responses = {"ntpsync": sync_data, "ntpstatus": status_data}
+        client.get_config.side_effect = lambda resource, *args, **kwargs: responses[resource]
+
     def create_args(self, **kwargs):
         """Create mock arguments"""
         defaults = {
@@ -47,10 +55,11 @@ class TestNTPCommand:
     def test_ntp_ok(self):
         """Test NTP status OK"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": {"response": self.create_ntp_response()}},
-        ]
+        )
 
         args = self.create_args()
         command = NTPCommand(client, args)
@@ -87,10 +96,11 @@ class TestNTPCommand:
  192.168.1.1     .GPS.       2 u   64  128  377    1.234   5.0   2.5
 +192.168.1.2     .GPS.       2 u   64  128  377    1.234   10.0   1.0
 """
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": {"response": response}},
-        ]
+        )
 
         args = self.create_args()
         command = NTPCommand(client, args)
@@ -102,10 +112,11 @@ class TestNTPCommand:
     def test_ntp_offset_warning(self):
         """Test offset exceeds warning threshold"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": {"response": self.create_ntp_response(offset=35.0)}},  # 35ms
-        ]
+        )
 
         # Warning at 30ms (0.03s)
         args = self.create_args(warning="o=0.03")
@@ -119,10 +130,11 @@ class TestNTPCommand:
     def test_ntp_offset_critical(self):
         """Test offset exceeds critical threshold"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": {"response": self.create_ntp_response(offset=55.0)}},  # 55ms
-        ]
+        )
 
         # Critical at 50ms (0.05s)
         args = self.create_args(critical="o=0.05")
@@ -135,10 +147,11 @@ class TestNTPCommand:
     def test_ntp_negative_offset_warning(self):
         """Test negative offset exceeds warning threshold"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": {"response": self.create_ntp_response(offset=-35.0)}},
-        ]
+        )
 
         args = self.create_args(warning="o=0.03")
         command = NTPCommand(client, args)
@@ -150,10 +163,11 @@ class TestNTPCommand:
     def test_ntp_jitter_warning(self):
         """Test jitter exceeds warning threshold"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": {"response": self.create_ntp_response(jitter=150.0)}},
-        ]
+        )
 
         # Warning at 100ms
         args = self.create_args(warning="j=100")
@@ -166,10 +180,11 @@ class TestNTPCommand:
     def test_ntp_jitter_critical(self):
         """Test jitter exceeds critical threshold"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": {"response": self.create_ntp_response(jitter=250.0)}},
-        ]
+        )
 
         args = self.create_args(critical="j=200")
         command = NTPCommand(client, args)
@@ -181,10 +196,11 @@ class TestNTPCommand:
     def test_ntp_stratum_warning(self):
         """Test stratum exceeds warning threshold"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": {"response": self.create_ntp_response(stratum=5)}},
-        ]
+        )
 
         # Warning if stratum > 3
         args = self.create_args(warning="s=3")
@@ -197,10 +213,11 @@ class TestNTPCommand:
     def test_ntp_stratum_critical(self):
         """Test stratum exceeds critical threshold"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": {"response": self.create_ntp_response(stratum=10)}},
-        ]
+        )
 
         args = self.create_args(critical="s=5")
         command = NTPCommand(client, args)
@@ -212,10 +229,11 @@ class TestNTPCommand:
     def test_ntp_truechimers_warning(self):
         """Test truechimers below warning threshold"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": {"response": self.create_ntp_response(truechimers=2)}},
-        ]
+        )
 
         # Warning if truechimers <= 3
         args = self.create_args(warning="t=3")
@@ -228,10 +246,11 @@ class TestNTPCommand:
     def test_ntp_truechimers_critical(self):
         """Test truechimers below critical threshold"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": {"response": self.create_ntp_response(truechimers=1)}},
-        ]
+        )
 
         args = self.create_args(critical="t=2")
         command = NTPCommand(client, args)
@@ -243,7 +262,8 @@ class TestNTPCommand:
     def test_ntp_multiple_thresholds(self):
         """Test with multiple threshold parameters"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {
                 "ntpstatus": {
@@ -252,7 +272,7 @@ class TestNTPCommand:
                     )
                 }
             },
-        ]
+        )
 
         # Multiple warnings
         args = self.create_args(warning="o=0.03,j=100,s=3,t=3")
@@ -266,10 +286,11 @@ class TestNTPCommand:
     def test_ntp_critical_overrides_warning(self):
         """Test that critical status overrides warning"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": {"response": self.create_ntp_response(offset=55.0, jitter=150.0)}},
-        ]
+        )
 
         # Offset critical, jitter warning
         args = self.create_args(warning="j=100", critical="o=0.05")
@@ -283,7 +304,8 @@ class TestNTPCommand:
     def test_ntp_perfdata_values(self):
         """Test that performance data values are correct"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {
                 "ntpstatus": {
@@ -292,7 +314,7 @@ class TestNTPCommand:
                     )
                 }
             },
-        ]
+        )
 
         args = self.create_args()
         command = NTPCommand(client, args)
@@ -307,10 +329,11 @@ class TestNTPCommand:
     def test_ntp_ntpsync_as_list(self):
         """Test when ntpsync is returned as list"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": [{"state": "ENABLED"}]},
             {"ntpstatus": {"response": self.create_ntp_response()}},
-        ]
+        )
 
         args = self.create_args()
         command = NTPCommand(client, args)
@@ -321,10 +344,11 @@ class TestNTPCommand:
     def test_ntp_ntpstatus_as_list(self):
         """Test when ntpstatus is returned as list"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": [{"response": self.create_ntp_response()}]},
-        ]
+        )
 
         args = self.create_args()
         command = NTPCommand(client, args)
@@ -347,7 +371,7 @@ class TestNTPCommand:
     def test_ntp_ntpstatus_not_found(self):
         """Test when ntpstatus is not in API response"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [{"ntpsync": {"state": "ENABLED"}}, {}]
+        self.set_responses(client, {"ntpsync": {"state": "ENABLED"}}, {})
 
         args = self.create_args()
         command = NTPCommand(client, args)
@@ -359,10 +383,11 @@ class TestNTPCommand:
     def test_ntp_empty_response(self):
         """Test with empty NTP status response"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": {"response": ""}},
-        ]
+        )
 
         args = self.create_args()
         command = NTPCommand(client, args)
@@ -378,10 +403,11 @@ class TestNTPCommand:
 ==============================================================================
 *192.168.1.1    .GPS.       2
 """
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": {"response": response}},
-        ]
+        )
 
         args = self.create_args()
         command = NTPCommand(client, args)
@@ -394,10 +420,11 @@ class TestNTPCommand:
     def test_ntp_threshold_parsing_spaces(self):
         """Test threshold parsing with spaces"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": {"response": self.create_ntp_response(offset=35.0)}},
-        ]
+        )
 
         # Spaces around values
         args = self.create_args(warning=" o = 0.03 , j = 100 ")
@@ -409,10 +436,11 @@ class TestNTPCommand:
     def test_ntp_invalid_threshold_values(self):
         """Test with invalid threshold values (non-numeric)"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": {"response": self.create_ntp_response()}},
-        ]
+        )
 
         # Invalid values should be ignored
         args = self.create_args(warning="o=invalid,j=abc")
@@ -451,10 +479,11 @@ class TestNTPCommand:
     def test_ntp_message_format(self):
         """Test message format"""
         client = self.create_mock_client()
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": {"response": self.create_ntp_response()}},
-        ]
+        )
 
         args = self.create_args()
         command = NTPCommand(client, args)
@@ -478,10 +507,11 @@ class TestNTPCommand:
 -192.168.1.3     .GPS.       3 u   64  128  377    1.234   15.0   3.0
  192.168.1.4     .GPS.       4 u   64  128  377    1.234   20.0   4.0
 """
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": {"response": response}},
-        ]
+        )
 
         args = self.create_args()
         command = NTPCommand(client, args)
@@ -494,10 +524,11 @@ class TestNTPCommand:
         """Test that offset is correctly converted from ms to seconds"""
         client = self.create_mock_client()
         # 123.456 ms should become 0.123456 seconds
-        client.get_config.side_effect = [
+        self.set_responses(
+            client,
             {"ntpsync": {"state": "ENABLED"}},
             {"ntpstatus": {"response": self.create_ntp_response(offset=123.456)}},
-        ]
+        )
 
         args = self.create_args()
         command = NTPCommand(client, args)
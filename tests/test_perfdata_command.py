@@ -499,6 +499,22 @@ class TestPerfdataCommand:
         assert "lb_test_1.totalpktssent" not in result.perfdata
         assert len(result.perfdata) == 2
 
+    def test_limit_keeps_index_labels(self):
+        """Test --limit is applied on the client so index labels stay unchanged"""
+        client = self.create_mock_client()
+        client.get_stat.return_value = {
+            "lbvserver": [
+                {"name": "lb_web", "totalrequests": "50000"},
+                {"name": "lb_ssl", "totalrequests": "100000"},
+            ]
+        }
+
+        args = self.create_args(objecttype="lbvserver", objectname="totalrequests", limit="lb_ssl")
+        result = PerfdataCommand(client, args).execute()
+
+        assert result.perfdata == {"1.totalrequests": 100000.0}
+        client.get_stat.assert_called_once_with("lbvserver", None)
+
     def test_filter_and_limit_combined(self):
         """Test using both filter and limit together"""
         client = self.create_mock_client()
@@ -638,3 +654,36 @@ class TestPerfdataCommand:
         # Should return UNKNOWN - no objects match limit
         assert result.status == STATE_UNKNOWN
         assert "no numeric values found" in result.message
+
+    def test_declares_config_attrs(self):
+        """Test only the requested fields, label and name are declared for attrs="""
+        client = self.create_mock_client()
+
+        args = self.create_args(
+            objecttype="lbvserver", objectname="totalrequests, curclntconnections", limit="^web"
+        )
+        PerfdataCommand(client, args)
+
+        client.declare_attrs.assert_called_once_with(
+            "lbvserver", ("totalrequests", "curclntconnections", "name")
+        )
+
+    def test_paged_collection(self):
+        """Test objects are consumed from the paged iterator with --pagesize"""
+        client = self.create_mock_client()
+        client.iter_objects.return_value = iter(
+            [
+                {"name": "vs1", "totalrequests": "10"},
+                {"name": "vs2", "totalrequests": "20"},
+            ]
+        )
+
+        args = self.create_args(
+            objecttype="lbvserver", objectname="totalrequests", label="name", pagesize=100
+        )
+        result = PerfdataCommand(client, args).execute()
+
+        assert result.status == STATE_OK
+        assert result.perfdata == {"vs1.totalrequests": 10.0, "vs2.totalrequests": 20.0}
+        client.iter_objects.assert_called_once_with("lbvserver", "stat", 100, stream=False)
+        client.get_stat.assert_not_called()
@@ -0,0 +1,370 @@
+"""
+Tests for the shared response cache
+"""
+
+import json
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from check_netscaler.cli import main
+from check_netscaler.client import (
+    NITROClient,
+    NITROConnectionError,
+    NITROPermissionError,
+    NITROResourceNotFoundError,
+    ResponseCache,
+)
+from check_netscaler.client.response_cache import parse_ttls
+
+KEY = ("https://192.168.1.1:443/nitro/v1", "nsroot", "stat", "lbvserver", None, None, None)
+
+
+class Fetcher:
+    """Callable returning numbered bodies and counting its calls"""
+
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls += 1
+            return f"body {self.calls}".encode()
+
+
+class TestParseTTLs:
+    """Test parse_ttls()"""
+
+    def test_endpoints(self):
+        """Test comma-separated endpoint=seconds pairs"""
+        assert parse_ttls("stat=10, config=2.5") == {"stat": 10.0, "config": 2.5}
+
+    @pytest.mark.parametrize("spec", ["stat", "stat=", "=10", "stat=ten", "stat=-1"])
+    def test_invalid(self, spec):
+        """Test malformed specifications are rejected"""
+        with pytest.raises(ValueError, match="Invalid cache TTL"):
+            parse_ttls(spec)
+
+
+class TestResponseCache:
+    """Test caching, expiry and single-flight"""
+
+    def test_fresh_entry_is_reused(self, tmp_path):
+        """Test a body is served from disk within the TTL, also to another instance"""
+        fetch = Fetcher()
+
+        assert ResponseCache(str(tmp_path)).fetch("stat", KEY, fetch) == b"body 1"
+        cache = ResponseCache(str(tmp_path))
+        assert cache.fetch("stat", KEY, fetch) == b"body 1"
+        assert fetch.calls == 1
+        assert (cache.hits, cache.misses) == (1, 0)
+
+    def test_expired_entry_is_refetched(self, tmp_path):
+        """Test a body older than the TTL is fetched again"""
+        fetch = Fetcher()
+        ResponseCache(str(tmp_path), {"stat": 10}).fetch("stat", KEY, fetch)
+
+        later = ResponseCache(str(tmp_path), {"stat": 10}, clock=lambda: time.time() + 11)
+        assert later.fetch("stat", KEY, fetch) == b"body 2"
+
+    def test_keys_are_separate(self, tmp_path):
+        """Test different requests do not share entries"""
+        cache = ResponseCache(str(tmp_path))
+        fetch = Fetcher()
+
+        cache.fetch("stat", KEY, fetch)
+        cache.fetch("stat", KEY[:-1] + (("name",),), fetch)
+
+        assert fetch.calls == 2
+
+    def test_endpoint_without_ttl_is_not_cached(self, tmp_path):
+        """Test endpoints with TTL 0 or no TTL bypass the cache"""
+        cache = ResponseCache(str(tmp_path), {"stat": 0})
+        fetch = Fetcher()
+
+        cache.fetch("stat", KEY, fetch)
+        cache.fetch("stat", KEY, fetch)
+        cache.fetch("config", KEY, fetch)
+
+        assert fetch.calls == 3
+        assert list(tmp_path.iterdir()) == []
+
+    def test_errors_are_not_cached(self, tmp_path):
+        """Test a failing fetch stores nothing"""
+        cache = ResponseCache(str(tmp_path))
+
+        def failing():
+            raise NITROResourceNotFoundError("Resource not found: lbvserver")
+
+        with pytest.raises(NITROResourceNotFoundError):
+            cache.fetch("stat", KEY, failing)
+        assert cache.fetch("stat", KEY, Fetcher()) == b"body 1"
+
+    def test_single_flight(self, tmp_path):
+        """Test concurrent callers of an expired entry wait for one fetch"""
+        fetch = Fetcher(delay=0.2)
+        results = []
+
+        def worker():
+            results.append(ResponseCache(str(tmp_path)).fetch("stat", KEY, fetch))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert fetch.calls == 1
+        assert results == [b"body 1"] * 4
+
+    def test_entries_are_private(self, tmp_path):
+        """Test cache files are readable by the owner only"""
+        ResponseCache(str(tmp_path)).fetch("stat", KEY, Fetcher())
+
+        (body,) = tmp_path.glob("response-*.body")
+        assert body.stat().st_mode & 0o777 == 0o600
+
+
+class TestClientResponseCache:
+    """Test NITROClient.get() with a response cache"""
+
+    def make_client(self, server, cache):
+        return NITROClient(
+            hostname=server.host,
+            port=server.port,
+            username="nsroot",
+            password="nsroot",
+            ssl=False,
+            response_cache=cache,
+        )
+
+    def test_second_check_is_served_from_cache(self, mock_nitro_server, tmp_path):
+        """Test a second client reads the response of the first from disk"""
+        with self.make_client(mock_nitro_server, ResponseCache(str(tmp_path))) as client:
+            first = client.get_stat("lbvserver")
+
+        cache = ResponseCache(str(tmp_path))
+        with self.make_client(mock_nitro_server, cache) as client:
+            assert client.get_stat("lbvserver") == first
+            client.get_stat("lbvserver", url_options="count=yes")
+            paths = [r.path for r in client.transfer_stats.requests]
+
+        assert cache.hits == 1
+        assert paths.count("/nitro/v1/stat/lbvserver") == 1
+
+    def test_paged_requests_are_not_cached(self, mock_nitro_server, tmp_path):
+        """Test page and count requests bypass the cache"""
+        cache = ResponseCache(str(tmp_path))
+        with self.make_client(mock_nitro_server, cache) as client:
+            names = [obj["name"] for obj in client.iter_objects("lbvserver", pagesize=2)]
+            client.count("lbvserver")
+
+        assert names == ["lb_web", "lb_ssl", "lb_down"]
+        assert cache.misses == 0
+        assert list(tmp_path.glob("*.body")) == []
+
+    def test_not_found_is_not_cached(self, mock_nitro_server, tmp_path):
+        """Test error responses are requested again"""
+        cache = ResponseCache(str(tmp_path))
+        with self.make_client(mock_nitro_server, cache) as client:
+            for _ in range(2):
+                with pytest.raises(NITROResourceNotFoundError):
+                    client.get_stat("doesnotexist")
+
+        assert cache.misses == 2
+        assert list(tmp_path.glob("*.body")) == []
+
+    def test_invalid_ttl_is_rejected(self):
+        """Test --cache-ttl is validated"""
+        with pytest.raises(SystemExit):
+            main(["-H", "192.168.1.1", "-C", "state", "--response-cache", "--cache-ttl", "x"])
+
+
+class TestConfigVersionedCache:
+    """Test config responses validated against the last configuration change"""
+
+    @staticmethod
+    def make_client(mock_get, cache, responses):
+        """Create a client whose GETs are answered from a URL part -> data mapping"""
+
+        def get(url, **kwargs):
+            response = Mock()
+            response.status_code = 200
+            data = next(data for part, data in responses.items() if part in url)
+            response.content = json.dumps(data).encode()
+            return response
+
+        mock_get.side_effect = get
+        client = NITROClient(
+            "192.168.1.1", "nsroot", "secret", auth_mode="headers", response_cache=cache
+        )
+        client.login()
+        return client
+
+    @staticmethod
+    def requested(mock_get):
+        return [call[0][0].split("/nitro/v1/")[1] for call in mock_get.call_args_list]
+
+    @patch("requests.Session.get")
+    def test_served_until_config_changes(self, mock_get, tmp_path):
+        """Test config bodies are reused until lastconfigchangedtime changes"""
+        responses = {
+            "?attrs=lastconfigchangedtime": {
+                "nsconfig": {"lastconfigchangedtime": "Wed Dec  4 10:30:15 2024"}
+            },
+            "config/servicegroup": {"servicegroup": [{"servicegroupname": "sg_web"}]},
+        }
+
+        def check():
+            cache = ResponseCache(str(tmp_path), {"config": 3600}, versioned=["config"])
+            client = self.make_client(mock_get, cache, responses)
+            client.get_config("servicegroup")
+            client.get_config("servicegroup", url_options="count=yes")
+            return cache
+
+        check()
+        mock_get.reset_mock()
+        cache = check()
+        assert self.requested(mock_get) == ["config/nsconfig?attrs=lastconfigchangedtime"]
+        assert cache.hits == 2
+
+        responses["?attrs=lastconfigchangedtime"]["nsconfig"]["lastconfigchangedtime"] = "later"
+        mock_get.reset_mock()
+        cache = check()
+        assert self.requested(mock_get) == [
+            "config/nsconfig?attrs=lastconfigchangedtime",
+            "config/servicegroup",
+            "config/servicegroup?count=yes",
+        ]
+        assert cache.misses == 2
+
+    @patch("requests.Session.get")
+    def test_not_cached_without_version(self, mock_get, tmp_path):
+        """Test config is fetched uncached if nsconfig cannot be read"""
+        cache = ResponseCache(str(tmp_path), {"config": 3600}, versioned=["config"])
+        client = self.make_client(
+            mock_get,
+            cache,
+            {
+                "?attrs=lastconfigchangedtime": {"errorcode": 1092, "message": "No permission"},
+                "config/sslcertkey": {"sslcertkey": []},
+            },
+        )
+
+        client.get_config("sslcertkey")
+        client.get_config("sslcertkey")
+
+        assert mock_get.call_count == 3
+        assert list(tmp_path.glob("*.body")) == []
+
+    @patch("requests.Session.get")
+    def test_nsconfig_itself_is_not_cached(self, mock_get, tmp_path):
+        """Test the nsconfig check always sees the current configchanged flag"""
+        cache = ResponseCache(str(tmp_path), {"config": 3600}, versioned=["config"])
+        client = self.make_client(mock_get, cache, {"nsconfig": {"nsconfig": {}}})
+
+        client.get_config("nsconfig")
+        client.get_config("nsconfig")
+
+        assert self.requested(mock_get) == ["config/nsconfig"] * 2
+
+
+class TestStaleIfError:
+    """Test serving the last stored response when the appliance is unreachable"""
+
+    @staticmethod
+    def unreachable():
+        raise NITROConnectionError("Connection failed: timed out")
+
+    def test_stale_response_is_served(self, tmp_path):
+        """Test the stored body stands in for an unreachable appliance"""
+        cache = ResponseCache(str(tmp_path), {}, stale_if_error=300)
+        cache.fetch("stat", KEY, Fetcher())
+
+        assert cache.stale_age is None
+        assert cache.fetch("stat", KEY, self.unreachable) == b"body 1"
+        assert 0 <= cache.stale_age < 5
+
+    def test_stale_window_passed(self, tmp_path):
+        """Test the error is raised once the stored body is older than the window"""
+        ResponseCache(str(tmp_path), {}, stale_if_error=300).fetch("stat", KEY, Fetcher())
+        cache = ResponseCache(
+            str(tmp_path), {}, clock=lambda: time.time() + 301, stale_if_error=300
+        )
+
+        with pytest.raises(NITROConnectionError):
+            cache.fetch("stat", KEY, self.unreachable)
+        assert cache.stale_age is None
+
+    def test_api_errors_are_not_masked(self, tmp_path):
+        """Test errors answered by the appliance are raised"""
+        cache = ResponseCache(str(tmp_path), {}, stale_if_error=300)
+        cache.fetch("stat", KEY, Fetcher())
+
+        def forbidden():
+            raise NITROPermissionError("Insufficient permissions to access lbvserver")
+
+        with pytest.raises(NITROPermissionError):
+            cache.fetch("stat", KEY, forbidden)
+
+    def test_waiters_do_not_repeat_a_failed_fetch(self, tmp_path):
+        """Test checks waiting for a fetch that failed serve stale data right away"""
+        ResponseCache(str(tmp_path), {}, stale_if_error=300).fetch("stat", KEY, Fetcher())
+        calls = []
+
+        def slow_unreachable():
+            calls.append(1)
+            time.sleep(0.2)
+            self.unreachable()
+
+        results = []
+
+        def worker():
+            cache = ResponseCache(str(tmp_path), {}, stale_if_error=300)
+            results.append(cache.fetch("stat", KEY, slow_unreachable))
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [b"body 1"] * 3
+        assert len(calls) == 1
+
+    def test_check_with_unreachable_appliance(self, mock_nitro_server, tmp_path, capsys):
+        """Test a check evaluates stale data and reports its age"""
+        argv = [
+            "-H",
+            mock_nitro_server.host,
+            "--no-ssl",
+            "-P",
+            str(mock_nitro_server.port),
+            "--cache-dir",
+            str(tmp_path),
+            "--stale-if-error",
+            "300",
+            "-C",
+            "state",
+            "-o",
+            "lbvserver",
+        ]
+        assert main(argv) == 2
+        capsys.readouterr()
+
+        with patch("requests.Session.post", side_effect=requests.ConnectionError("down")), patch(
+            "requests.Session.get", side_effect=requests.ConnectionError("down")
+        ):
+            status = main(argv)
+
+        output = capsys.readouterr().out
+        assert status == 2
+        assert "1/3 lbvserver CRITICAL (lb_down) (stale data, " in output
+        assert "s old: appliance unreachable)" in output
+        assert "'nitro_data_age'=" in output
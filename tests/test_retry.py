@@ -0,0 +1,179 @@
+"""
+Tests for the retry policy
+"""
+
+import socket
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from check_netscaler.client import (
+    Deadline,
+    NITROAPIError,
+    NITROCircuitOpenError,
+    NITROClient,
+    NITROConnectionError,
+    NITROConnectionRefusedError,
+    NITROTimeoutError,
+    RetryPolicy,
+)
+
+
+def make_policy(retries=2):
+    """Create a policy that does not sleep and always uses the full backoff"""
+    return RetryPolicy(retries, sleep=Mock(), rand=lambda: 1.0)
+
+
+def make_client(policy, deadline=None, transport="requests", port=None, logged_in=True):
+    """Create a client with the given retry policy"""
+    client = NITROClient(
+        hostname="127.0.0.1",
+        username="nsroot",
+        password="nsroot",
+        ssl=port is None,
+        port=port,
+        retry_policy=policy,
+        deadline=deadline,
+        transport=transport,
+    )
+    client.session.is_logged_in = logged_in
+    return client
+
+
+def ok_response():
+    return Mock(status_code=200, content=b'{"errorcode": 0, "lbvserver": []}')
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestRetryPolicy:
+    """Test backoff and retry decisions"""
+
+    def test_exponential_backoff_is_capped(self):
+        """Test the backoff doubles per attempt up to the maximum"""
+        policy = RetryPolicy(10, base_delay=0.5, max_delay=3.0, rand=lambda: 1.0)
+        assert [policy.delay(n) for n in range(4)] == [0.5, 1.0, 2.0, 3.0]
+
+    def test_jitter(self):
+        """Test the backoff is scaled by the random factor"""
+        policy = RetryPolicy(1, base_delay=1.0, rand=lambda: 0.25)
+        assert policy.delay(1) == 0.5
+
+    @pytest.mark.parametrize(
+        "phase,status,error,expected",
+        [
+            ("stat/lbvserver", 503, None, True),
+            ("stat/lbvserver", 502, None, True),
+            ("stat/lbvserver", 504, None, True),
+            ("stat/lbvserver", 500, None, False),
+            ("stat/lbvserver", 404, None, False),
+            ("stat/lbvserver", None, NITROConnectionError("reset"), True),
+            ("stat/lbvserver", None, NITROTimeoutError("slow"), False),
+            ("stat/lbvserver", None, NITROCircuitOpenError("open"), False),
+            ("login", 503, None, True),
+            ("login", 502, None, False),
+            ("login", None, NITROConnectionRefusedError("refused"), True),
+            ("login", None, NITROConnectionError("reset"), False),
+            ("logout", 503, None, False),
+        ],
+    )
+    def test_should_retry(self, phase, status, error, expected):
+        """Test which failures are retried for GETs, login and logout"""
+        response = Mock(status_code=status) if status else None
+        assert make_policy().should_retry(phase, response, error) is expected
+
+
+class TestClientRetries:
+    """Test retries of client requests"""
+
+    @patch("requests.Session.get")
+    def test_transient_503_is_retried(self, mock_get):
+        """Test a GET succeeds after a transient 503"""
+        policy = make_policy()
+        mock_get.side_effect = [Mock(status_code=503, text="busy"), ok_response()]
+        client = make_client(policy)
+
+        assert client.get_stat("lbvserver")["errorcode"] == 0
+        assert mock_get.call_count == 2
+        policy.sleep.assert_called_once_with(0.5)
+        assert client.transfer_stats.retries == [("stat/lbvserver", 1, "HTTP 503", 0.5)]
+        assert "retry 1 of stat/lbvserver after HTTP 503" in "\n".join(
+            client.transfer_stats.summary()
+        )
+
+    @patch("requests.Session.get")
+    def test_gives_up_after_retries(self, mock_get):
+        """Test the last error is raised once the retries are used up"""
+        mock_get.return_value = Mock(status_code=503, text="busy")
+        client = make_client(make_policy(retries=2))
+
+        with pytest.raises(NITROAPIError) as e:
+            client.get_stat("lbvserver")
+        assert e.value.error_code == 503
+        assert mock_get.call_count == 3
+
+    @patch("requests.Session.get", side_effect=requests.exceptions.ConnectionError("reset"))
+    def test_connection_reset_is_retried(self, mock_get):
+        """Test connection errors on GETs are retried"""
+        client = make_client(make_policy(retries=1))
+
+        with pytest.raises(NITROConnectionError):
+            client.get_stat("lbvserver")
+        assert mock_get.call_count == 2
+
+    @patch("requests.Session.get", side_effect=requests.exceptions.Timeout("slow"))
+    def test_timeout_is_not_retried(self, mock_get):
+        """Test timeouts fail immediately"""
+        client = make_client(make_policy())
+
+        with pytest.raises(NITROTimeoutError):
+            client.get_stat("lbvserver")
+        assert mock_get.call_count == 1
+
+    @patch("requests.Session.get")
+    def test_retries_bounded_by_deadline(self, mock_get):
+        """Test no retry is made if the backoff would exceed the deadline"""
+        mock_get.return_value = Mock(status_code=503, text="busy")
+        policy = make_policy()
+        client = make_client(policy, deadline=Deadline(0.4))
+
+        with pytest.raises(NITROAPIError):
+            client.get_stat("lbvserver")
+        assert mock_get.call_count == 1
+        policy.sleep.assert_not_called()
+
+    @patch("requests.Session.post")
+    def test_login_retried_on_503(self, mock_post):
+        """Test login is repeated when the appliance was unavailable"""
+        mock_post.side_effect = [
+            Mock(status_code=503, text="busy"),
+            Mock(status_code=201, headers={}, cookies=[]),
+        ]
+        client = make_client(make_policy(), logged_in=False)
+
+        client.login()
+        assert mock_post.call_count == 2
+
+    @patch("requests.Session.post", side_effect=requests.exceptions.ConnectionError("reset"))
+    def test_login_not_retried_on_reset(self, mock_post):
+        """Test login is not repeated when it may have reached the appliance"""
+        client = make_client(make_policy(), logged_in=False)
+
+        with pytest.raises(NITROConnectionError):
+            client.login()
+        assert mock_post.call_count == 1
+
+    @pytest.mark.parametrize("transport", ["requests", "stdlib"])
+    def test_login_retried_when_refused(self, transport):
+        """Test refused connections are detected by both transports and retried"""
+        policy = make_policy(retries=1)
+        client = make_client(policy, transport=transport, port=closed_port(), logged_in=False)
+
+        with pytest.raises(NITROConnectionRefusedError):
+            client.login()
+        assert policy.sleep.call_count == 1
@@ -3,8 +3,10 @@ Tests for servicegroup command
 """
 
 from argparse import Namespace
+from functools import partial
 from unittest.mock import Mock
 
+from check_netscaler.client import NITROClient
 from check_netscaler.commands.servicegroup import ServiceGroupCommand
 from check_netscaler.constants import STATE_CRITICAL, STATE_OK, STATE_UNKNOWN, STATE_WARNING
 
@@ -16,6 +18,7 @@ class TestServiceGroupCommand:
         """Create a mock NITRO client"""
         client = Mock()
         client.get_config = Mock()
+        client.get_many.side_effect = partial(NITROClient.get_many, client)
         return client
 
     def create_args(self, **kwargs):
@@ -34,7 +37,7 @@ class TestServiceGroupCommand:
         """Test healthy servicegroup with all members UP"""
         client = self.create_mock_client()
 
-        def mock_get_config(objecttype, objectname=None):
+        def mock_get_config(objecttype, objectname=None, url_options=None):
             if objecttype == "servicegroup":
                 return {
                     "servicegroup": {
@@ -84,7 +87,7 @@ class TestServiceGroupCommand:
         """Test servicegroup with quorum at warning level"""
         client = self.create_mock_client()
 
-        def mock_get_config(objecttype, objectname=None):
+        def mock_get_config(objecttype, objectname=None, url_options=None):
             if objecttype == "servicegroup":
                 return {
                     "servicegroup": {
@@ -145,7 +148,7 @@ class TestServiceGroupCommand:
         """Test servicegroup with quorum at critical level"""
         client = self.create_mock_client()
 
-        def mock_get_config(objecttype, objectname=None):
+        def mock_get_config(objecttype, objectname=None, url_options=None):
             if objecttype == "servicegroup":
                 return {
                     "servicegroup": {
@@ -206,7 +209,7 @@ class TestServiceGroupCommand:
         """Test servicegroup with disabled state"""
         client = self.create_mock_client()
 
-        def mock_get_config(objecttype, objectname=None):
+        def mock_get_config(objecttype, objectname=None, url_options=None):
             if objecttype == "servicegroup":
                 return {
                     "servicegroup": {
@@ -246,7 +249,7 @@ class TestServiceGroupCommand:
         """Test servicegroup with effective state DOWN"""
         client = self.create_mock_client()
 
-        def mock_get_config(objecttype, objectname=None):
+        def mock_get_config(objecttype, objectname=None, url_options=None):
             if objecttype == "servicegroup":
                 return {
                     "servicegroup": {
@@ -285,7 +288,7 @@ class TestServiceGroupCommand:
         """Test with custom quorum thresholds"""
         client = self.create_mock_client()
 
-        def mock_get_config(objecttype, objectname=None):
+        def mock_get_config(objecttype, objectname=None, url_options=None):
             if objecttype == "servicegroup":
                 return {
                     "servicegroup": {
@@ -367,7 +370,7 @@ class TestServiceGroupCommand:
         """Test when servicegroup members are not found"""
         client = self.create_mock_client()
 
-        def mock_get_config(objecttype, objectname=None):
+        def mock_get_config(objecttype, objectname=None, url_options=None):
             if objecttype == "servicegroup":
                 return {
                     "servicegroup": {
@@ -395,7 +398,7 @@ class TestServiceGroupCommand:
         """Test when single member is returned as dict instead of list"""
         client = self.create_mock_client()
 
-        def mock_get_config(objecttype, objectname=None):
+        def mock_get_config(objecttype, objectname=None, url_options=None):
             if objecttype == "servicegroup":
                 return {
                     "servicegroup": {
@@ -431,7 +434,7 @@ class TestServiceGroupCommand:
         """Test when member state is disabled"""
         client = self.create_mock_client()
 
-        def mock_get_config(objecttype, objectname=None):
+        def mock_get_config(objecttype, objectname=None, url_options=None):
             if objecttype == "servicegroup":
                 return {
                     "servicegroup": {
@@ -519,7 +522,7 @@ class TestServiceGroupCommand:
         """Test that long output contains member details"""
         client = self.create_mock_client()
 
-        def mock_get_config(objecttype, objectname=None):
+        def mock_get_config(objecttype, objectname=None, url_options=None):
             if objecttype == "servicegroup":
                 return {
                     "servicegroup": {
@@ -566,7 +569,7 @@ class TestServiceGroupCommand:
         """Test that custom separator is used in perfdata"""
         client = self.create_mock_client()
 
-        def mock_get_config(objecttype, objectname=None):
+        def mock_get_config(objecttype, objectname=None, url_options=None):
             if objecttype == "servicegroup":
                 return {
                     "servicegroup": {
@@ -603,7 +606,7 @@ class TestServiceGroupCommand:
         """Test that default thresholds are used when not specified"""
         client = self.create_mock_client()
 
-        def mock_get_config(objecttype, objectname=None):
+        def mock_get_config(objecttype, objectname=None, url_options=None):
             if objecttype == "servicegroup":
                 return {
                     "servicegroup": {
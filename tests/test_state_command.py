@@ -3,8 +3,11 @@ Tests for state command
 """
 
 from argparse import Namespace
+from functools import partial
 from unittest.mock import Mock
 
+from check_netscaler.client import NITROClient
+from check_netscaler.client.exceptions import NITROAPIError
 from check_netscaler.commands.state import StateCommand
 from check_netscaler.constants import STATE_CRITICAL, STATE_OK, STATE_UNKNOWN, STATE_WARNING
 
@@ -17,6 +20,7 @@ class TestStateCommand:
         client = Mock()
         client.get_stat = Mock()
         client.get_config = Mock()
+        client.get_many.side_effect = partial(NITROClient.get_many, client)
         return client
 
     def create_args(self, **kwargs):
@@ -182,6 +186,53 @@ class TestStateCommand:
         assert result.status == STATE_OK
         assert result.perfdata["total"] == 2  # Only prod vservers
 
+    def test_state_limit_sent_as_server_filter(self):
+        """Test a simple limit pattern is pushed to the appliance as filter="""
+        client = self.create_mock_client()
+        client.get_stat.return_value = {
+            "lbvserver": [
+                {"name": "prod_vserver1", "state": "UP"},
+                {"name": "prod_vserver2", "state": "UP"},
+            ]
+        }
+
+        args = self.create_args(limit="^prod_")
+        result = StateCommand(client, args).execute()
+
+        assert result.status == STATE_OK
+        client.get_stat.assert_called_once_with("lbvserver", None, "filter=name:/%5Eprod_/")
+
+    def test_state_limit_matches_nothing(self):
+        """Test an empty filtered response is reported like client-side filtering"""
+        client = self.create_mock_client()
+        client.get_stat.return_value = {"lbvserver": []}
+
+        result = StateCommand(client, self.create_args(limit="^prod_")).execute()
+
+        assert result.status == STATE_UNKNOWN
+        assert result.message == "No lbvserver objects after filtering"
+
+    def test_state_limit_falls_back_when_filter_rejected(self):
+        """Test the request is repeated without filter if the appliance rejects it"""
+        client = self.create_mock_client()
+        client.get_stat.side_effect = [
+            NITROAPIError("NITRO API error 1092: Invalid filter", error_code=1092),
+            {
+                "lbvserver": [
+                    {"name": "prod_vserver1", "state": "UP"},
+                    {"name": "test_vserver1", "state": "DOWN"},
+                ]
+            },
+        ]
+
+        args = self.create_args(limit="^prod_")
+        result = StateCommand(client, args).execute()
+
+        assert result.status == STATE_OK
+        assert result.perfdata["total"] == 1
+        assert client.get_stat.call_count == 2
+        client.get_stat.assert_called_with("lbvserver", None)
+
     def test_state_no_objecttype(self):
         """Test without objecttype specified"""
         client = self.create_mock_client()
@@ -474,3 +525,97 @@ class TestStateCommand:
         # Should not call get_config for non-lbvserver types
         assert not client.get_config.called
         assert result.status == STATE_OK
+
+    def test_count_only(self):
+        """Test --count-only evaluates counts and names the few unhealthy objects"""
+        client = self.create_mock_client()
+        client.count = Mock(side_effect=[1000, 998, 1, 1])
+        client.get_stat.return_value = {
+            "lbvserver": [
+                {"name": "lb_down", "state": "DOWN"},
+                {"name": "lb_oos", "state": "OUT OF SERVICE"},
+            ]
+        }
+
+        args = self.create_args(count_only=True, limit="^prod_")
+        result = StateCommand(client, args).execute()
+
+        assert result.status == STATE_CRITICAL
+        assert result.message == (
+            "1/1000 lbvserver CRITICAL (lb_down) 1/1000 lbvserver WARNING (lb_oos)"
+        )
+        assert result.perfdata["warning"] == 1
+        assert client.count.call_args_list[0][1]["filter"] == {"name": "/^prod_/"}
+        assert client.count.call_args_list[1][1]["filter"] == {
+            "name": "/^prod_/",
+            "state": "/^(ACTIVE|ENABLED|UP)$/",
+        }
+        filter_option = client.get_stat.call_args[0][2]
+        assert filter_option.startswith("filter=name:/%5Eprod_/,state:/")
+
+    def test_count_only_does_not_fetch_many_unhealthy_objects(self):
+        """Test objects are not fetched when too many are unhealthy to name"""
+        client = self.create_mock_client()
+        client.count = Mock(side_effect=[1000, 900, 0, 100])
+
+        args = self.create_args(count_only=True)
+        result = StateCommand(client, args).execute()
+
+        assert result.status == STATE_CRITICAL
+        assert result.message == "100/1000 lbvserver CRITICAL"
+        client.get_stat.assert_not_called()
+
+    def test_count_only_unknown_states(self):
+        """Test objects in no known state are counted as unknown and not named"""
+        client = self.create_mock_client()
+        client.count = Mock(side_effect=[10, 8, 1, 0])
+
+        result = StateCommand(client, self.create_args(count_only=True)).execute()
+
+        assert result.status == STATE_WARNING
+        assert result.message == "2/10 lbvserver WARNING"
+        assert result.perfdata["warning"] == 1
+        assert result.perfdata["unknown"] == 1
+        assert client.count.call_args_list[2][1]["filter"] == {
+            "state": "/^(GOING OUT OF SERVICE|OUT OF SERVICE|UNKNOWN)$/"
+        }
+        # A state filter cannot select the unknown object, so none are named
+        client.get_stat.assert_not_called()
+
+    def test_count_only_limit_with_objectname(self):
+        """Test --limit is applied to the objectname with --count-only"""
+        client = self.create_mock_client()
+        client.count = Mock(side_effect=[1, 1])
+
+        args = self.create_args(count_only=True, objectname="lb_web", limit="^prod_")
+        result = StateCommand(client, args).execute()
+
+        assert result.status == STATE_UNKNOWN
+        assert result.message == "No lbvserver objects after filtering"
+        client.count.assert_not_called()
+
+        args = self.create_args(count_only=True, objectname="prod_web", limit="^prod_")
+        result = StateCommand(client, args).execute()
+
+        assert result.status == STATE_OK
+        assert client.count.call_args_list[0][1]["filter"] == {"name": "prod_web"}
+
+    def test_count_only_all_up(self):
+        """Test --count-only with every object OK needs only the counts"""
+        client = self.create_mock_client()
+        client.count = Mock(side_effect=[3, 3, 0])
+
+        result = StateCommand(client, self.create_args(count_only=True)).execute()
+
+        assert result.status == STATE_OK
+        assert result.message == "All 3 lbvserver are UP"
+        client.get_stat.assert_not_called()
+
+    def test_count_only_rejects_options_needing_objects(self):
+        """Test --count-only with per-object options is UNKNOWN"""
+        client = self.create_mock_client()
+
+        result = StateCommand(client, self.create_args(count_only=True, filter="^test_")).execute()
+
+        assert result.status == STATE_UNKNOWN
+        assert result.message == "--count-only cannot be combined with --filter"
@@ -0,0 +1,150 @@
+"""
+Tests for the persistent NITRO session token cache
+"""
+
+import json
+import os
+import stat
+import time
+from unittest.mock import Mock, patch
+
+from check_netscaler.client import NITROClient, NITROSession, TokenCache
+
+
+def make_login_response(token="abc123"):
+    """Create a successful login response carrying a session cookie"""
+    cookie = Mock()
+    cookie.name = "NITRO_AUTH_TOKEN"
+    cookie.value = token
+
+    response = Mock()
+    response.status_code = 201
+    response.headers = {"Set-Cookie": f"NITRO_AUTH_TOKEN={token}"}
+    response.cookies = [cookie]
+    return response
+
+
+class TestTokenCache:
+    """Test token storage and expiry"""
+
+    def test_store_and_load(self, tmp_path):
+        """Test a stored token can be loaded again"""
+        cache = TokenCache(str(tmp_path))
+        cache.store("192.168.1.1", 443, "nsroot", "abc123")
+
+        assert cache.load("192.168.1.1", 443, "nsroot") == "abc123"
+
+    def test_keyed_by_host_port_and_user(self, tmp_path):
+        """Test tokens are not shared between hosts, ports or users"""
+        cache = TokenCache(str(tmp_path))
+        cache.store("192.168.1.1", 443, "nsroot", "abc123")
+
+        assert cache.load("192.168.1.2", 443, "nsroot") is None
+        assert cache.load("192.168.1.1", 8443, "nsroot") is None
+        assert cache.load("192.168.1.1", 443, "monitor") is None
+
+    def test_token_file_permissions(self, tmp_path):
+        """Test token files are only readable by the owner"""
+        cache_dir = tmp_path / "cache"
+        cache = TokenCache(str(cache_dir))
+        cache.store("192.168.1.1", 443, "nsroot", "abc123")
+
+        files = os.listdir(cache_dir)
+        assert len(files) == 1
+        mode = stat.S_IMODE(os.stat(cache_dir / files[0]).st_mode)
+        assert mode == 0o600
+        assert stat.S_IMODE(os.stat(cache_dir).st_mode) == 0o700
+
+    def test_token_expires_before_idle_timeout(self, tmp_path):
+        """Test tokens close to the idle timeout are not reused"""
+        cache = TokenCache(str(tmp_path), idle_timeout=900, margin=60)
+        cache.store("192.168.1.1", 443, "nsroot", "abc123")
+
+        with patch("check_netscaler.client.token_cache.time.time", return_value=time.time() + 841):
+            assert cache.load("192.168.1.1", 443, "nsroot") is None
+
+    def test_invalidate(self, tmp_path):
+        """Test invalidated tokens are gone"""
+        cache = TokenCache(str(tmp_path))
+        cache.store("192.168.1.1", 443, "nsroot", "abc123")
+        cache.invalidate("192.168.1.1", 443, "nsroot")
+
+        assert cache.load("192.168.1.1", 443, "nsroot") is None
+
+    def test_corrupt_file_is_ignored(self, tmp_path):
+        """Test unreadable cache files are treated as a cache miss"""
+        cache = TokenCache(str(tmp_path))
+        cache.store("192.168.1.1", 443, "nsroot", "abc123")
+        for name in os.listdir(tmp_path):
+            (tmp_path / name).write_text("not json")
+
+        assert cache.load("192.168.1.1", 443, "nsroot") is None
+
+
+class TestSessionTokenCache:
+    """Test session behavior with a token cache"""
+
+    @patch("requests.Session.post")
+    def test_login_stores_token(self, mock_post, tmp_path):
+        """Test a fresh login stores the token and pins the idle timeout"""
+        mock_post.return_value = make_login_response("abc123")
+        cache = TokenCache(str(tmp_path))
+
+        session = NITROSession("192.168.1.1", "nsroot", "secret", token_cache=cache)
+        session.login()
+
+        assert session.token_reused is False
+        assert cache.load("192.168.1.1", 443, "nsroot") == "abc123"
+        assert mock_post.call_args[1]["json"]["login"]["timeout"] == 900
+
+    @patch("requests.Session.post")
+    def test_login_reuses_cached_token(self, mock_post, tmp_path):
+        """Test a cached token skips the login request"""
+        cache = TokenCache(str(tmp_path))
+        cache.store("192.168.1.1", 443, "nsroot", "cached")
+
+        session = NITROSession("192.168.1.1", "nsroot", "secret", token_cache=cache)
+        session.login()
+
+        mock_post.assert_not_called()
+        assert session.is_logged_in is True
+        assert session.token_reused is True
+        assert session.transport.get_cookie("NITRO_AUTH_TOKEN") == "cached"
+
+    @patch("requests.Session.post")
+    def test_logout_keeps_session(self, mock_post, tmp_path):
+        """Test logout does not end the appliance session when caching"""
+        cache = TokenCache(str(tmp_path))
+        cache.store("192.168.1.1", 443, "nsroot", "cached")
+
+        session = NITROSession("192.168.1.1", "nsroot", "secret", token_cache=cache)
+        session.login()
+        session.logout()
+
+        mock_post.assert_not_called()
+        assert session.is_logged_in is False
+        assert cache.load("192.168.1.1", 443, "nsroot") == "cached"
+
+    @patch("requests.Session.post")
+    @patch("requests.Session.get")
+    def test_get_refreshes_rejected_token_once(self, mock_get, mock_post, tmp_path):
+        """Test a 401 for a reused token triggers one fresh login"""
+        cache = TokenCache(str(tmp_path))
+        cache.store("192.168.1.1", 443, "nsroot", "expired")
+        mock_post.return_value = make_login_response("fresh")
+
+        unauthorized = Mock()
+        unauthorized.status_code = 401
+        ok = Mock()
+        ok.status_code = 200
+        ok.content = json.dumps({"lbvserver": [{"name": "vs1"}]}).encode()
+        mock_get.side_effect = [unauthorized, ok]
+
+        client = NITROClient("192.168.1.1", "nsroot", "secret", token_cache=cache)
+        client.login()
+        result = client.get_stat("lbvserver")
+
+        assert result == {"lbvserver": [{"name": "vs1"}]}
+        assert mock_post.call_count == 1
+        assert mock_get.call_count == 2
+        assert cache.load("192.168.1.1", 443, "nsroot") == "fresh"
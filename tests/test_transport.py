@@ -0,0 +1,334 @@
+"""
+Tests for HTTP transports
+"""
+
+import gzip
+import http.server
+import json
+import shutil
+import socket
+import ssl
+import subprocess
+import sys
+import threading
+import zlib
+from http.client import HTTPMessage
+from unittest.mock import Mock
+
+import pytest
+
+from check_netscaler.client import (
+    NITROClient,
+    NITROConnectionError,
+    NITROResourceNotFoundError,
+    NITROTimeoutError,
+)
+from check_netscaler.client.stats import TransferStats
+from check_netscaler.client.transport import (
+    ContentDecoder,
+    HTTPClientTransport,
+    RequestsTransport,
+    StdlibStreamingResponse,
+    create_transport,
+)
+
+
+class TestCreateTransport:
+    """Test transport selection"""
+
+    def test_create_requests_transport(self):
+        """Test the requests backend can be selected"""
+        assert isinstance(create_transport("requests"), RequestsTransport)
+
+    def test_create_stdlib_transport(self):
+        """Test the http.client backend can be selected"""
+        assert isinstance(create_transport("stdlib"), HTTPClientTransport)
+
+    def test_invalid_transport(self):
+        """Test unknown transports are rejected"""
+        with pytest.raises(ValueError, match="Invalid transport"):
+            create_transport("curl")
+
+    def test_stdlib_transport_does_not_import_requests(self):
+        """Test the stdlib transport keeps requests/urllib3 out of the process"""
+        code = (
+            "import sys\n"
+            "from check_netscaler.client import NITROClient\n"
+            "NITROClient('192.168.1.1', 'nsroot', 'nsroot', transport='stdlib')\n"
+            "print('requests' in sys.modules, 'urllib3' in sys.modules)\n"
+        )
+        output = subprocess.check_output([sys.executable, "-c", code], text=True)
+        assert output.strip() == "False False"
+
+
+class TestHTTPClientTransport:
+    """Test the http.client based transport"""
+
+    def test_session_against_mock_server(self, mock_nitro_server):
+        """Test login, GET and logout work with the stdlib transport"""
+        with NITROClient(
+            hostname=mock_nitro_server.host,
+            port=mock_nitro_server.port,
+            username="nsroot",
+            password="nsroot",
+            ssl=False,
+            transport="stdlib",
+        ) as client:
+            assert client.session.session_id is not None
+            data = client.get_stat("lbvserver")
+            data_again = client.get_config("nsconfig")
+
+        assert "lbvserver" in data
+        assert "nsconfig" in data_again
+        assert mock_nitro_server.sessions == {}
+
+    def test_connection_refused(self):
+        """Test refused connections are mapped to NITROConnectionError"""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+
+        transport = HTTPClientTransport()
+        with pytest.raises(NITROConnectionError, match="Connection failed"):
+            transport.get(f"http://127.0.0.1:{port}/nitro/v1/stat/lbvserver", timeout=2)
+
+    def test_timeout(self):
+        """Test read timeouts are mapped to NITROTimeoutError"""
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        port = server.getsockname()[1]
+        accepted = []
+        thread = threading.Thread(target=lambda: accepted.append(server.accept()), daemon=True)
+        thread.start()
+
+        transport = HTTPClientTransport()
+        try:
+            with pytest.raises(NITROTimeoutError, match="timed out"):
+                transport.get(f"http://127.0.0.1:{port}/nitro/v1/stat/lbvserver", timeout=0.2)
+        finally:
+            for conn, _ in accepted:
+                conn.close()
+            server.close()
+
+    def test_cookies(self):
+        """Test cookies can be set and cleared"""
+        transport = HTTPClientTransport()
+        transport.set_cookie("NITRO_AUTH_TOKEN", "abc")
+        assert transport.get_cookie("NITRO_AUTH_TOKEN") == "abc"
+
+        transport.clear_cookies()
+        assert transport.get_cookie("NITRO_AUTH_TOKEN") is None
+
+
+class TestStreaming:
+    """Test streamed GETs and incremental decoding"""
+
+    @pytest.mark.parametrize("transport", ["requests", "stdlib"])
+    def test_stream_objects_against_mock_server(self, mock_nitro_server, transport):
+        """Test objects are decoded from a streamed body with both transports"""
+        with NITROClient(
+            hostname=mock_nitro_server.host,
+            port=mock_nitro_server.port,
+            username="nsroot",
+            password="nsroot",
+            ssl=False,
+            transport=transport,
+        ) as client:
+            client.STREAM_CHUNK_SIZE = 7
+            names = [obj["name"] for obj in client.stream_objects("lbvserver")]
+            expected = [obj["name"] for obj in client.get_stat("lbvserver")["lbvserver"]]
+
+        assert names == expected
+        assert len(names) == 3
+
+    def test_streaming_response_releases_connection(self):
+        """Test a streamed response hands its connection back once, reusable only if read"""
+        raw = Mock(status=200, headers=HTTPMessage(), will_close=False)
+        raw.read.side_effect = [b'{"a": ', b"1}", b""]
+        release = Mock()
+
+        response = StdlibStreamingResponse(raw, [], release)
+        assert response.json() == {"a": 1}
+        response.close()
+        release.assert_called_once_with(True)
+
+        raw.read.side_effect = [b"partial"]
+        release = Mock()
+        response = StdlibStreamingResponse(raw, [], release)
+        next(response.iter_content(7))
+        response.close()
+        release.assert_called_once_with(False)
+
+    def test_stdlib_stream_not_found(self, mock_nitro_server):
+        """Test HTTP errors are raised before the body is iterated"""
+        with NITROClient(
+            hostname=mock_nitro_server.host,
+            port=mock_nitro_server.port,
+            username="nsroot",
+            password="nsroot",
+            ssl=False,
+            transport="stdlib",
+        ) as client:
+            with pytest.raises(NITROResourceNotFoundError):
+                client.stream_objects("doesnotexist")
+
+
+class TestCompression:
+    """Test gzip/deflate negotiation and transfer statistics"""
+
+    BODY = json.dumps({"errorcode": 0, "lbvserver": [{"name": "lb"}] * 50}).encode()
+
+    @pytest.mark.parametrize(
+        "encoding,compressed",
+        [
+            ("gzip", gzip.compress(BODY)),
+            ("deflate", zlib.compress(BODY)),
+            ("deflate", zlib.compress(BODY)[2:-4]),  # raw deflate without zlib wrapper
+            (None, BODY),
+        ],
+    )
+    def test_decoder_chunked(self, encoding, compressed):
+        """Test bodies are decompressed correctly when fed in small chunks"""
+        decoder = ContentDecoder(encoding)
+        chunks = [decoder.decompress(compressed[i : i + 5]) for i in range(0, len(compressed), 5)]
+        assert b"".join(chunks) + decoder.flush() == self.BODY
+
+    def test_decoder_errors(self):
+        """Test unsupported encodings and corrupt bodies raise connection errors"""
+        with pytest.raises(NITROConnectionError, match="Unsupported content encoding"):
+            ContentDecoder("br")
+
+        decoder = ContentDecoder("gzip")
+        with pytest.raises(NITROConnectionError, match="Invalid gzip"):
+            decoder.decompress(b"not gzip at all")
+
+    @pytest.mark.parametrize("transport", ["requests", "stdlib"])
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_transfer_stats(self, mock_nitro_server, transport, stream):
+        """Test compressed responses are decoded and their sizes recorded"""
+        with NITROClient(
+            hostname=mock_nitro_server.host,
+            port=mock_nitro_server.port,
+            username="nsroot",
+            password="nsroot",
+            ssl=False,
+            transport=transport,
+        ) as client:
+            if stream:
+                names = [obj["name"] for obj in client.stream_objects("lbvserver")]
+            else:
+                names = [obj["name"] for obj in client.get_stat("lbvserver")["lbvserver"]]
+            record = client.transfer_stats.requests[-1]
+
+        assert len(names) == 3
+        assert record.method == "GET"
+        assert record.path == "/nitro/v1/stat/lbvserver"
+        assert record.status_code == 200
+        # The mock server gzips every GET, so the body shrinks on the wire
+        assert 0 < record.wire_bytes < record.body_bytes
+        assert record.elapsed >= 0
+        assert 0 <= record.wait <= record.elapsed
+
+    def test_stdlib_sends_accept_encoding(self):
+        """Test the stdlib transport asks for compressed bodies"""
+        assert HTTPClientTransport().headers["Accept-Encoding"] == "gzip, deflate"
+
+
+@pytest.fixture
+def tls_server(tmp_path):
+    """HTTPS server with a self-signed certificate"""
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl is required to create a test certificate")
+    cert, key = tmp_path / "cert.pem", tmp_path / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1"]
+        + ["-subj", "/CN=127.0.0.1", "-keyout", str(key), "-out", str(cert)],
+        check=True,
+        capture_output=True,
+    )
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = b'{"errorcode": 0}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(str(cert), str(key))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"https://127.0.0.1:{server.server_address[1]}/nitro/v1/config/nsconfig"
+    server.shutdown()
+    server.server_close()
+
+
+class TestTransferStatsMetrics:
+    """Test the phase totals reported by --self-metrics"""
+
+    def test_metrics(self):
+        """Test phases, waits, connections and parse time are summed up"""
+        stats = TransferStats()
+        stats.record("POST", "http://ns/nitro/v1/config/login", 201, 50, 50, 0.1, 0.09)
+        stats.record("GET", "http://ns/nitro/v1/stat/lbvserver", 200, 200, 900, 0.3, 0.2)
+        stats.record_phase("login", 0.1)
+        stats.record_phase("stat/lbvserver", 0.25)
+        stats.record_phase("stat/lbvserver", 0.05)
+        stats.record_phase("logout", 0.02)
+        stats.record_parse(0.004)
+
+        metrics = stats.metrics()
+
+        assert metrics["nitro_login_ms"] == pytest.approx(100)
+        assert metrics["nitro_get_ms"] == pytest.approx(300)
+        assert metrics["nitro_wait_ms"] == pytest.approx(290)
+        assert metrics["nitro_bytes"] == 250
+        assert metrics["nitro_requests"] == 2
+        assert metrics["parse_ms"] == pytest.approx(4)
+        assert "nitro_connect_ms" not in metrics
+
+        stats.record_connect("ns", 0.03)
+        assert stats.metrics()["nitro_connect_ms"] == pytest.approx(30)
+        assert TransferStats.combine([stats, TransferStats()]).metrics() == stats.metrics()
+
+
+class TestTLSResumption:
+    """Test TLS session resumption in the stdlib transport"""
+
+    def test_new_connection_resumes_session(self, tls_server):
+        """Test a second connection to the same host resumes the first session"""
+        transport = HTTPClientTransport(verify_ssl=False)
+        assert transport.get(tls_server, timeout=5).json() == {"errorcode": 0}
+        # Drop the pooled connection so the next request needs a new handshake
+        transport.close()
+        assert transport.get(tls_server, timeout=5).json() == {"errorcode": 0}
+        transport.close()
+
+        assert transport.stats.handshakes == [("127.0.0.1", False), ("127.0.0.1", True)]
+        assert "TLS handshake with 127.0.0.1: resumed" in transport.stats.summary()
+
+    def test_rejected_session_falls_back(self, tls_server):
+        """Test a session the server does not know leads to a full handshake"""
+        transport = HTTPClientTransport(verify_ssl=False)
+        transport.get(tls_server, timeout=5)
+        transport.close()
+
+        # A session from a different client context cannot be resumed
+        other = HTTPClientTransport(verify_ssl=False)
+        other.get(tls_server, timeout=5)
+        other.close()
+        transport._tls_sessions = dict(other._tls_sessions)
+
+        assert transport.get(tls_server, timeout=5).json() == {"errorcode": 0}
+        transport.close()
+        assert transport.stats.handshakes[-1] == ("127.0.0.1", False)